@@ -0,0 +1,76 @@
+"""Measures encoding and fitting on a sparse one-hot design matrix as the number of levels grows.
+
+Dense ``get_dummies`` is timed too while its matrix stays under ``--dense-limit-mb``.
+
+Usage:
+    python benchmarks/bench_encoding.py [--rows 200000] [--levels 100 1000 10000 50000] [--dense-limit-mb 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from backend.encoding import Encoder
+
+
+def make_frame(rows, levels, seed=0):
+    """Returns a frame with a numeric column, a text column with ``levels`` values and an output."""
+
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, levels, size=rows)
+    x = rng.normal(size=rows)
+    return pd.DataFrame({
+        "x": x,
+        "city": pd.Series([f"city_{code}" for code in codes]),
+        "y": 3 * x + rng.normal(size=levels)[codes] + rng.normal(scale=0.1, size=rows),
+    })
+
+
+def timed_fit(build, y):
+    """Returns the time to build and fit the design matrix, its peak memory and the R2 of the fit."""
+
+    from sklearn.linear_model import LinearRegression
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    X = build()
+    model = LinearRegression().fit(X, y)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, model.score(X, y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--levels", type=int, nargs="+", default=[100, 1_000, 10_000, 50_000])
+    parser.add_argument("--dense-limit-mb", type=float, default=500)
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} rows, one numeric and one text column")
+    print(f"  {'levels':>8} {'sparse':>9} {'peak MB':>9} {'R2':>7} {'dense':>9} {'dense MB':>10}")
+    for levels in args.levels:
+        data = make_frame(args.rows, levels)
+        y = data["y"].to_numpy()
+        sparse_time, sparse_peak, r2 = timed_fit(lambda: Encoder.fit(data, ["x", "city"]).transform(data)[0], y)
+
+        dense_mb = args.rows * (levels + 1) * 8 / 1_048_576
+        if dense_mb <= args.dense_limit_mb:
+            dense_time, dense_peak, _ = timed_fit(
+                lambda: pd.get_dummies(data[["x", "city"]], dtype=np.float64).to_numpy(), y)
+            dense = f"{dense_time:7.2f} s {dense_peak / 1_048_576:>10.1f}"
+        else:
+            dense = f"{'skipped':>9} {dense_mb:>9.0f}*"
+        print(f"  {levels:>8,} {sparse_time:7.2f} s {sparse_peak / 1_048_576:>9.1f} {r2:>7.4f} {dense}")
+    print("  * size of the dense matrix, not allocated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Times Excel ingestion with each installed engine, one sheet and several sheets in parallel.
+
+Usage:
+    python benchmarks/bench_excel.py [--sheets 4] [--rows 200000]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from backend.read_file import DataImport
+
+
+def write_workbook(file_path, sheets, rows):
+    """Writes a workbook with ``sheets`` sheets of ``rows`` rows each."""
+
+    rng = np.random.default_rng(0)
+    with pd.ExcelWriter(file_path) as writer:
+        for sheet in range(sheets):
+            pd.DataFrame({
+                "id": np.arange(rows) + sheet * rows,
+                "x1": rng.random(rows),
+                "x2": rng.normal(size=rows),
+                "city": rng.choice(["Madrid", "Paris", "Rome", "Oslo"], size=rows),
+                "y": rng.random(rows) * 100,
+            }).to_excel(writer, sheet_name=f"sheet_{sheet}", index=False)
+
+
+def timed(function):
+    """Returns the result of ``function()`` and the seconds it took."""
+
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    engines = ["openpyxl"]
+    if importlib.util.find_spec("python_calamine") is not None:
+        engines.append("calamine")
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "workbook.xlsx")
+        print(f"Writing {args.sheets} sheets x {args.rows:,} rows...")
+        write_workbook(file_path, args.sheets, args.rows)
+        sheets = [f"sheet_{sheet}" for sheet in range(args.sheets)]
+
+        print(f"{args.sheets} sheets x {args.rows:,} rows, {os.path.getsize(file_path) / 1_048_576:,.1f} MB, "
+              f"{os.cpu_count()} CPUs")
+        print(f"  {'engine':<10} {'one sheet':>12} {'sheets one by one':>20} {'sheets in parallel':>20}")
+        expected = None
+        for engine in engines:
+            _, single_time = timed(lambda: DataImport(file_path, sheets=sheets[0], excel_engine=engine).load())
+            sequential, sequential_time = timed(lambda: pd.concat(
+                [DataImport(file_path, sheets=sheet, excel_engine=engine).load() for sheet in sheets],
+                ignore_index=True))
+            parallel, parallel_time = timed(lambda: DataImport(file_path, sheets=sheets, excel_engine=engine).load())
+
+            pd.testing.assert_frame_equal(parallel, sequential)
+            if expected is None:
+                expected = parallel
+            else:
+                pd.testing.assert_frame_equal(parallel, expected)
+            print(f"  {engine:<10} {single_time:10.2f} s {sequential_time:18.2f} s {parallel_time:18.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Times parallel multi-file ingestion against reading the same shards one by one.
+
+Usage:
+    python benchmarks/bench_multi_file.py [--shards 8] [--rows 200000] [--compression gz]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from backend.read_file import DataImport, read_files
+
+
+def write_shards(directory, shards, rows, compression):
+    """Writes ``shards`` compressed CSV files with ``rows`` rows each."""
+
+    rng = np.random.default_rng(0)
+    for shard in range(shards):
+        data = pd.DataFrame({
+            "id": np.arange(rows) + shard * rows,
+            "x1": rng.random(rows),
+            "x2": rng.normal(size=rows),
+            "city": rng.choice(["Madrid", "Paris", "Rome", "Oslo"], size=rows),
+            "y": rng.random(rows) * 100,
+        })
+        data.to_csv(os.path.join(directory, f"part-{shard:03d}.csv.{compression}"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--compression", default="gz", choices=["gz", "bz2", "zst", "xz"])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_shards(directory, args.shards, args.rows, args.compression)
+        pattern = os.path.join(directory, f"part-*.csv.{args.compression}")
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+        start = time.perf_counter()
+        sequential = pd.concat([DataImport(path).load() for path in paths], ignore_index=True)
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = read_files(pattern, max_workers=args.workers)
+        parallel_time = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(parallel, sequential)
+
+    print(f"{args.shards} shards x {args.rows:,} rows ({args.compression}), {os.cpu_count()} CPUs")
+    print(f"  one by one : {sequential_time:8.2f} s")
+    print(f"  read_files : {parallel_time:8.2f} s  ({sequential_time / parallel_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
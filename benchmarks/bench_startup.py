@@ -0,0 +1,111 @@
+"""Measures application startup: an import-time breakdown and the time to the first frame.
+
+The imports are timed with ``python -X importtime`` in a fresh interpreter. The
+time to the first frame is measured from the start of a fresh interpreter
+until the main window has been drawn, and needs a display.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--top 15] [--max-import 1.5] [--max-first-frame 3.0]
+
+With ``--max-import`` or ``--max-first-frame``, the script exits with status 1
+if the median time is above the limit, so it can guard against regressions.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Modules that should only be imported once the feature using them is needed
+DEFERRED_MODULES = ("sklearn", "matplotlib", "joblib")
+
+FIRST_FRAME = """
+import time
+start = time.perf_counter()
+import customtkinter as ctk
+from frontend.gui import GUI
+root = ctk.CTk()
+app = GUI(root)
+root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+
+def run_python(*args):
+    """Runs a fresh interpreter with ``src`` on the path and returns the completed process."""
+
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True,
+                          env={**os.environ, "PYTHONPATH": SRC})
+
+
+def import_times(module):
+    """Returns ``{module: (self_us, cumulative_us)}`` for every module imported with ``module``."""
+
+    process = run_python("-X", "importtime", "-c", f"import {module}")
+    if process.returncode:
+        raise SystemExit(process.stderr)
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def first_frame_time():
+    """Returns the seconds to the first frame, or None if no display is available."""
+
+    process = run_python("-c", FIRST_FRAME)
+    if process.returncode:
+        return None
+    return float(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-import", type=float, default=None, help="Seconds allowed to import the GUI.")
+    parser.add_argument("--max-first-frame", type=float, default=None, help="Seconds allowed to the first frame.")
+    args = parser.parse_args()
+
+    runs = [import_times("frontend.gui") for _ in range(args.runs)]
+    totals = [times["frontend.gui"][1] / 1e6 for times in runs]
+    times = runs[totals.index(statistics.median_low(totals))]
+
+    print(f"Import of frontend.gui: median {statistics.median(totals):.3f} s over {args.runs} runs")
+    print(f"  {'module':<45} {'self':>10} {'cumulative':>12}")
+    for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"  {name:<45} {self_us / 1e3:8.1f} ms {cumulative_us / 1e3:10.1f} ms")
+
+    failed = False
+    deferred = sorted({name.split(".")[0] for name in times} & set(DEFERRED_MODULES))
+    if deferred:
+        print(f"Imported at startup but should be deferred: {', '.join(deferred)}")
+        failed = True
+
+    frames = [first_frame_time() for _ in range(args.runs)]
+    if None in frames:
+        print("Time to first frame: skipped (no display available)")
+    else:
+        first_frame = statistics.median(frames)
+        print(f"Time to first frame: median {first_frame:.3f} s over {args.runs} runs")
+        if args.max_first_frame is not None and first_frame > args.max_first_frame:
+            print(f"  above the limit of {args.max_first_frame:.3f} s")
+            failed = True
+
+    if args.max_import is not None and statistics.median(totals) > args.max_import:
+        print(f"Import time above the limit of {args.max_import:.3f} s")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
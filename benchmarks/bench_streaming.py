@@ -0,0 +1,55 @@
+"""Measures the time and peak memory of cleaning a CSV file in chunks as the file grows.
+
+Usage:
+    python benchmarks/bench_streaming.py [--columns 20] [--rows 50000 200000] [--chunksize 20000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from backend.streaming import clean_csv
+
+
+def write_csv(path, rows, columns, null_ratio=0.05, chunk_rows=100_000, seed=0):
+    """Writes a CSV file of random floats with nulls, a chunk at a time."""
+
+    rng = np.random.default_rng(seed)
+    names = [f"sensor_{i:03d}" for i in range(columns)]
+    for start in range(0, rows, chunk_rows):
+        values = rng.normal(size=(min(chunk_rows, rows - start), columns))
+        values[rng.random(values.shape) < null_ratio] = np.nan
+        pd.DataFrame(values, columns=names).to_csv(path, mode="a", header=start == 0, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--chunksize", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{args.columns} columns, {args.chunksize:,} rows per chunk, fill with median")
+    print(f"  {'rows':>10} {'file MB':>9} {'time':>9} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            source = os.path.join(directory, f"data_{rows}.csv")
+            write_csv(source, rows, args.columns)
+            tracemalloc.start()
+            start = time.perf_counter()
+            clean_csv(source, os.path.join(directory, "clean.csv"), "Fill with median", chunksize=args.chunksize)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {rows:>10,} {os.path.getsize(source) / 1_048_576:>9.1f} {elapsed:>7.2f} s {peak / 1_048_576:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import uuid
+import pandas as pd
+
+
+def default_cache_dir():
+    """Returns the directory used for cached datasets.
+
+    The ``TRENDIFY_CACHE_DIR`` environment variable overrides the default
+    location, ``~/.cache/trendify/datasets``.
+    """
+
+    return os.environ.get("TRENDIFY_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "trendify", "datasets")
+
+
+#=================================== DATASETCACHE ==================================
+
+class DatasetCache():
+    """Keeps parsed datasets on disk as Feather files so reopening a file skips parsing.
+
+    Entries are named ``<source>-<state>-<options>.feather``, where ``source`` hashes
+    the absolute path, ``state`` hashes the file size and modification time (or its
+    content) and ``options`` hashes the reader options. A changed source file gets a
+    new state hash, so its old entries are never returned and are deleted on the next
+    lookup. The total cache size is bounded with least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=2 * 1024 ** 3, content_hash=False):
+        """Initializes the cache.
+
+        Args:
+            cache_dir (str, optional): Directory for cache entries. Defaults to ``default_cache_dir()``.
+            max_bytes (int, optional): Maximum total size of the cache entries. Defaults to 2 GB.
+            content_hash (bool, optional): Identify the source by a hash of its content instead of
+                its size and modification time. Slower, but survives copies and touches. Defaults to False.
+        """
+
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+
+    #------------------------------------ KEYS ------------------------------------
+
+    @staticmethod
+    def _digest(value):
+        """Returns a short hexadecimal SHA-256 digest of a JSON-serializable value."""
+
+        text = json.dumps(value, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def _source_key(self, path):
+        """Returns the key identifying the source path."""
+
+        return self._digest(os.path.abspath(path))
+
+    def _state_key(self, path):
+        """Returns the key identifying the current version of the source file."""
+
+        if self.content_hash:
+            digest = hashlib.sha256()
+            with open(path, "rb") as handle:
+                for block in iter(lambda: handle.read(1024 * 1024), b""):
+                    digest.update(block)
+            return digest.hexdigest()[:16]
+        stat = os.stat(path)
+        return self._digest([stat.st_size, stat.st_mtime_ns])
+
+    def entry_path(self, path, options=None):
+        """Returns the cache file that holds the dataset read from ``path`` with ``options``.
+
+        Args:
+            path (str): Path to the source file.
+            options (dict, optional): Reader options that change the parsed result.
+
+        Returns:
+            str: Path of the cache entry (which may not exist yet).
+        """
+
+        name = f"{self._source_key(path)}-{self._state_key(path)}-{self._digest(options or {})}.feather"
+        return os.path.join(self.cache_dir, name)
+
+    #---------------------------------- ENTRIES -----------------------------------
+
+    def _entries(self):
+        """Returns ``(path, size, last_used)`` for every cache entry."""
+
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".feather"):
+                continue
+            entry = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(entry)
+            except FileNotFoundError:
+                continue
+            entries.append((entry, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _remove_stale(self, entry):
+        """Deletes entries for the same source file that belong to an older version of it."""
+
+        source, state = os.path.basename(entry).split("-")[:2]
+        for other, _, _ in self._entries():
+            other_source, other_state = os.path.basename(other).split("-")[:2]
+            if other_source == source and other_state != state:
+                self._remove(other)
+
+    @staticmethod
+    def _remove(entry):
+        """Deletes a cache entry, ignoring entries that were already removed."""
+
+        try:
+            os.remove(entry)
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Deletes the least recently used entries until the cache fits in ``max_bytes``."""
+
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for entry, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(entry)
+            total -= size
+
+    def clear(self):
+        """Deletes every cache entry."""
+
+        for entry, _, _ in self._entries():
+            self._remove(entry)
+
+    #------------------------------- LOAD / STORE ---------------------------------
+
+    def load(self, path, options=None):
+        """Returns the cached dataset for ``path`` and ``options``, or None on a miss.
+
+        Args:
+            path (str): Path to the source file.
+            options (dict, optional): Reader options used when the entry was stored.
+
+        Returns:
+            pandas.DataFrame: The cached data, or None if there is no valid entry.
+        """
+
+        entry = self.entry_path(path, options)
+        if not os.path.exists(entry):
+            self._remove_stale(entry)
+            return None
+        try:
+            data = pd.read_feather(entry)
+        except Exception:
+            self._remove(entry)
+            return None
+        # The modification time of an entry records when it was last used
+        os.utime(entry)
+        return data
+
+    def store(self, path, data, options=None):
+        """Writes a parsed dataset to the cache.
+
+        Datasets that Feather cannot represent (for example non-string column
+        names, a non-default index or mixed-type object columns) are simply not cached.
+
+        Args:
+            path (str): Path to the source file.
+            data (pandas.DataFrame): The parsed data.
+            options (dict, optional): Reader options that produced ``data``.
+
+        Returns:
+            bool: True if the dataset was cached.
+        """
+
+        entry = self.entry_path(path, options)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = f"{entry}.{uuid.uuid4().hex}.tmp"
+        try:
+            data.to_feather(temporary)
+            os.replace(temporary, entry)
+        except Exception:
+            self._remove(temporary)
+            return False
+        self._remove_stale(entry)
+        self.evict()
+        return True
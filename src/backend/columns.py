@@ -1,5 +1,104 @@
+import re
 import customtkinter as ctk
-from tkinter import messagebox, Toplevel, IntVar
+import numpy as np
+import pandas as pd
+from tkinter import messagebox, Toplevel, ttk
+from backend.dtypes import column_kind
+
+
+COLUMN_KINDS = ("All", "Numeric", "Text", "Other")
+
+
+#=================================== COLUMNLIST ====================================
+
+class ColumnList():
+    """The columns of a dataset with a search filter and a selection, kept apart from any widget.
+
+    Filtering and selecting work on arrays of names, so they take the same few
+    vectorized steps whatever the number of columns.
+    """
+
+    def __init__(self, names, kinds=None, multiple=True, selected=()):
+        """Initializes the list.
+
+        Args:
+            names (list): Column names, in dataset order.
+            kinds (list, optional): Kind of each column, see ``column_kind``. Defaults to "Other".
+            multiple (bool, optional): Whether several columns can be selected. Defaults to True.
+            selected (iterable, optional): Columns selected at the start. Defaults to none.
+        """
+
+        self.names = np.array([str(name) for name in names], dtype=object)
+        self.kinds = np.array(kinds if kinds is not None else ["Other"] * len(self.names), dtype=object)
+        self.multiple = multiple
+        self.selected_mask = np.isin(self.names, [str(name) for name in selected])
+        self.matching_mask = np.ones(len(self.names), dtype=bool)
+
+    def set_filter(self, text="", regex=False, kind="All"):
+        """Keeps the columns whose name matches ``text`` and whose kind is ``kind``.
+
+        Args:
+            text (str, optional): Substring searched for, ignoring case, or a regular expression. Defaults to "".
+            regex (bool, optional): Whether ``text`` is a regular expression. Defaults to False.
+            kind (str, optional): One of ``COLUMN_KINDS``. Defaults to "All".
+
+        Raises:
+            re.error: If ``regex`` is True and ``text`` is not a valid regular expression.
+        """
+
+        if not text:
+            mask = np.ones(len(self.names), dtype=bool)
+        elif regex:
+            pattern = re.compile(text, re.IGNORECASE)
+            mask = np.fromiter((pattern.search(name) is not None for name in self.names), dtype=bool, count=len(self.names))
+        else:
+            mask = pd.Series(self.names, dtype=object).str.lower().str.contains(text.lower(), regex=False).to_numpy(dtype=bool)
+        if kind != "All":
+            mask &= self.kinds == kind
+        self.matching_mask = mask
+
+    def matching(self):
+        """Returns the names of the columns that pass the filter."""
+
+        return self.names[self.matching_mask].tolist()
+
+    def selected(self):
+        """Returns the names of the selected columns, in dataset order."""
+
+        return self.names[self.selected_mask].tolist()
+
+    def toggle(self, name):
+        """Selects or unselects a column. With single selection, selecting a column unselects the others.
+
+        Args:
+            name (str): Name of the column.
+        """
+
+        position = np.flatnonzero(self.names == name)
+        if not len(position):
+            return
+        selected = not self.selected_mask[position[0]]
+        if not self.multiple:
+            self.selected_mask[:] = False
+        self.selected_mask[position[0]] = selected
+
+    def select_matching(self, selected=True):
+        """Selects or unselects every column that passes the filter.
+
+        Args:
+            selected (bool, optional): True to select them, False to unselect them. Defaults to True.
+        """
+
+        self.selected_mask[self.matching_mask] = selected
+
+    def view(self):
+        """Returns a DataFrame with a row per matching column: selection mark, name and kind."""
+
+        return pd.DataFrame({
+            "✓": np.where(self.selected_mask[self.matching_mask], "✓", ""),
+            "Column": self.names[self.matching_mask],
+            "Type": self.kinds[self.matching_mask],
+        })
 
 
 #===================================== COLUMNS =====================================
@@ -7,7 +106,8 @@ from tkinter import messagebox, Toplevel, IntVar
 class Columns():
     """Class for managing column selection for input and output in a GUI."""
 
-    def __init__(self, root, data_table, input_columns_label, output_column_label, create_model_button,make_prediction_button):
+    def __init__(self, root, data_table, input_columns_label, output_column_label, create_model_button,make_prediction_button,
+                 table_class, get_data=None):
         """
         Initialize the Columns class.
 
@@ -17,109 +117,234 @@ class Columns():
             input_columns_label (CTkLabel): Label to display selected input columns.
             output_column_label (CTkLabel): Label to display the selected output column.
             create_model_button (CTkButton): Button to trigger model creation, enabled after selection.
+            table_class (type): Virtual table drawing the column list of the picker, called as
+                ``table_class(tree, scrollbar, rowheight=...)``; ``frontend.table_view.VirtualTable`` in the app.
+            get_data (callable, optional): Returns the current DataFrame, used to filter columns by kind.
         """
 
         self.root = root
         self.data_table = data_table
         self.input_columns_label = input_columns_label
         self.output_column_label = output_column_label
-        self.column_vars = {}
         self.columns_selected = []
         self.output_column = None
+        self.column_names = list(data_table["columns"])
         self.create_model_button = create_model_button
         self.make_prediction_button = make_prediction_button
+        self.get_data = get_data
+        self.table_class = table_class
 
-    #-------------------------------------- INPUT COLUMNS ---------------------------------
+    #-------------------------------------- COLUMN PICKER ---------------------------------
 
-    def select_columns(self):
+    def sync_columns(self):
         """
-        Open a window to allow the user to select input columns from the data table.
+        Clear the selected input and output columns if the data table now shows other columns.
 
-        The selected columns are displayed on the main interface.
+        The same instance is kept across loaded files, so names picked in a previous
+        dataset would otherwise stay selected.
         """
 
-        #----------------------- Create input columns window -------------------
+        names = list(self.data_table["columns"])
+        if names != self.column_names:
+            self.column_names = names
+            self.columns_selected = []
+            self.output_column = None
+
+    def column_list(self, multiple, selected):
+        """
+        Build the list of the columns of the data table, with their kinds when the data is available.
+
+        Args:
+            multiple (bool): Whether several columns can be selected.
+            selected (iterable): Columns selected at the start.
+
+        Returns:
+            ColumnList: The columns to pick from.
+        """
 
-        self.column_window = Toplevel(self.root)
-        self.column_window.title("Select Columns")
-        self.column_window.resizable(False, False)
-        self.column_window.configure(bg="#dfe6e9")  
+        names = list(self.data_table["columns"])
+        data = self.get_data() if self.get_data is not None else None
+        kinds = None
+        if data is not None and [str(col) for col in data.columns] == [str(name) for name in names]:
+            kinds = [column_kind(data.iloc[:, position]) for position in range(data.shape[1])]
+        return ColumnList(names, kinds, multiple=multiple, selected=selected)
+
+    def open_picker(self, title, column_list, on_confirm):
+        """
+        Open a window with a searchable list of the columns.
+
+        Only the rows on screen exist as widgets, so the window opens as fast for
+        thousands of columns as for a few.
+
+        Args:
+            title (str): Title of the window.
+            column_list (ColumnList): The columns to pick from.
+            on_confirm (callable): Called when the user confirms the selection.
+
+        Returns:
+            Toplevel: The picker window.
+        """
+
+        window = Toplevel(self.root)
+        window.title(title)
+        window.geometry("460x600")
+        window.configure(bg="#dfe6e9")
 
         title_frame = ctk.CTkFrame(
-            self.column_window,
-            fg_color="#2c3e50", 
+            window,
+            fg_color="#2c3e50",
             corner_radius=0
         )
-        title_frame.pack(fill="x", pady=(10, 5), padx=0)  
+        title_frame.pack(fill="x", pady=(10, 5), padx=0)
 
         title_label = ctk.CTkLabel(
             title_frame,
-            text="Select Input Columns",
-            text_color="#ecf0f1",  
+            text=title,
+            text_color="#ecf0f1",
             font=("Helvetica", 16, "bold")
         )
         title_label.pack(pady=5)
 
-        options_frame = ctk.CTkFrame(
-            self.column_window,
-            fg_color="#f1f2f6",  
+        #----------------------- Search and filters -------------------
+
+        filter_frame = ctk.CTkFrame(window, fg_color="#dfe6e9")
+        filter_frame.pack(fill="x", padx=10, pady=(5, 0))
+
+        search_entry = ctk.CTkEntry(filter_frame, placeholder_text="Search columns")
+        search_entry.pack(side="left", fill="x", expand=True)
+
+        regex_var = ctk.IntVar(value=0)
+        regex_checkbox = ctk.CTkCheckBox(
+            filter_frame,
+            text="Regex",
+            variable=regex_var,
+            width=70,
+            text_color="#2c3e50",
+            fg_color="#3498db",
+            border_color="#7f8c8d",
+            hover_color="#2980b9"
+        )
+        regex_checkbox.pack(side="left", padx=(8, 0))
+
+        kind_var = ctk.StringVar(value="All")
+        kind_menu = ctk.CTkOptionMenu(filter_frame, values=list(COLUMN_KINDS), variable=kind_var, width=100)
+        kind_menu.pack(side="left", padx=(8, 0))
+
+        count_label = ctk.CTkLabel(window, text="", text_color="#2c3e50")
+        count_label.pack(anchor="w", padx=15)
+
+        #----------------------- Virtual column list -------------------
+
+        list_frame = ctk.CTkFrame(
+            window,
+            fg_color="#f1f2f6",
             corner_radius=10
         )
-        options_frame.pack(pady=(5, 5), padx=10, fill="both", expand=True)
+        list_frame.pack(pady=(5, 5), padx=10, fill="both", expand=True)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        tree = ttk.Treeview(list_frame, show="headings", selectmode="none")
+        tree.pack(side="left", fill="both", expand=True)
+        table = self.table_class(tree, scrollbar, rowheight=20)
+
+        def refresh(keep_position=False):
+            try:
+                column_list.set_filter(search_entry.get(), bool(regex_var.get()), kind_var.get())
+            except re.error as e:
+                count_label.configure(text=f"Invalid pattern: {e}")
+                return
+            first_row = table.first_row
+            table.set_data(column_list.view())
+            tree.column("✓", width=30, stretch=False)
+            tree.column("Type", width=80, stretch=False)
+            if keep_position:
+                table.first_row = first_row
+                table.render()
+            count_label.configure(
+                text=f"{int(column_list.matching_mask.sum()):,} of {len(column_list.names):,} columns shown, "
+                     f"{int(column_list.selected_mask.sum()):,} selected")
+
+        def toggle(event):
+            row = table.row_at(event.y)
+            if row is not None:
+                column_list.toggle(table.data["Column"].iat[row])
+                refresh(keep_position=True)
+            return "break"
+
+        def select_matching(selected):
+            column_list.select_matching(selected)
+            refresh(keep_position=True)
+
+        search_entry.bind("<KeyRelease>", lambda event: refresh())
+        regex_var.trace_add("write", lambda *args: refresh())
+        kind_var.trace_add("write", lambda *args: refresh())
+        tree.bind("<Button-1>", toggle)
+
+        #----------------------- Buttons -------------------
 
-        self.column_vars = {}
-        if self.columns_selected != []:
-            self.columns_selected = []
-        for col in self.data_table["columns"]:
-            var = IntVar()
-            if col in self.columns_selected:
-                var.set(1) 
-            self.column_vars[col] = var
-
-            checkbox = ctk.CTkCheckBox(
-                options_frame,
-                text=col,
-                variable=var,
-                text_color="#2c3e50", 
-                fg_color="#3498db",  
-                border_color="#7f8c8d",  
-                hover_color="#2980b9"  
-            )
-            checkbox.pack(anchor="w", padx=15, pady=2) 
         button_frame = ctk.CTkFrame(
-            self.column_window,
-            fg_color="#dfe6e9"  
+            window,
+            fg_color="#dfe6e9"
         )
-        button_frame.pack(pady=(5, 10))  
+        button_frame.pack(pady=(5, 10))
+
+        if column_list.multiple:
+            ctk.CTkButton(
+                button_frame,
+                text="Select Matching",
+                command=lambda: select_matching(True),
+                font=("Helvetica", 13),
+                width=160
+            ).grid(row=0, column=0, padx=3, pady=3)
+            ctk.CTkButton(
+                button_frame,
+                text="Clear Matching",
+                command=lambda: select_matching(False),
+                font=("Helvetica", 13),
+                width=160
+            ).grid(row=0, column=1, padx=3, pady=3)
 
         confirm_button = ctk.CTkButton(
             button_frame,
             text="Confirm Selection",
-            command=self.confirm_selection,
-            fg_color="#2ecc71",  
+            command=on_confirm,
+            fg_color="#2ecc71",
             hover_color="#27ae60",
             text_color="white",
             font=("Helvetica", 13),
-            width=160  
+            width=160
         )
-        confirm_button.pack(pady=3)  
+        confirm_button.grid(row=1, column=0, padx=3, pady=3)
 
         cancel_button = ctk.CTkButton(
             button_frame,
             text="Cancel",
-            command=self.column_window.destroy,
-            fg_color="#e74c3c",  
+            command=window.destroy,
+            fg_color="#e74c3c",
             hover_color="#c0392b",
             text_color="white",
             font=("Helvetica", 13),
             width=160
         )
-        cancel_button.pack(pady=3)
+        cancel_button.grid(row=1, column=1, padx=3, pady=3)
+
+        refresh()
+        search_entry.focus()
+        return window
+
+    #-------------------------------------- INPUT COLUMNS ---------------------------------
+
+    def select_columns(self):
+        """
+        Open a window to allow the user to select input columns from the data table.
 
-        self.column_window.update_idletasks()
-        width = self.column_window.winfo_reqwidth() + 20
-        height = self.column_window.winfo_reqheight() + 20
-        self.column_window.geometry(f"{width}x{height}")
+        The selected columns are displayed on the main interface.
+        """
+
+        self.sync_columns()
+        self.input_list = self.column_list(multiple=True, selected=self.columns_selected)
+        self.column_window = self.open_picker("Select Input Columns", self.input_list, self.confirm_selection)
 
     def confirm_selection(self):
         """
@@ -128,16 +353,14 @@ class Columns():
         Displays a success message if columns are selected, or a warning if none are chosen.
         """
 
-        self.columns_selected = [
-            col for col, var in self.column_vars.items() if var.get() == 1
-        ]
+        self.columns_selected = self.input_list.selected()
 
         if self.columns_selected:
             self.input_columns_label.configure(
                 text=f"Input Columns: {', '.join(self.columns_selected)}"
             )
             self.column_window.destroy()
-            
+
             messagebox.showinfo(
                 "Columns Selected",
                 f"Selected columns: {', '.join(self.columns_selected)}"
@@ -158,90 +381,10 @@ class Columns():
         The selected column is displayed on the main interface.
         """
 
-        #--------------------- Create output column window ---------------------
-
-        self.output_column_window = Toplevel(self.root)
-        self.output_column_window.title("Select Output Column")
-        self.output_column_window.resizable(False, False)
-        self.output_column_window.configure(bg="#dfe6e9")  
-
-        title_frame = ctk.CTkFrame(
-            self.output_column_window,
-            fg_color="#2c3e50",  
-            corner_radius=0
-        )
-        title_frame.pack(fill="x", pady=(10, 5), padx=0)
-
-        title_label = ctk.CTkLabel(
-            title_frame,
-            text="Select Output Column",
-            text_color="#ecf0f1",  
-            font=("Helvetica", 16, "bold")
-        )
-        title_label.pack(pady=5)
-
-        options_frame = ctk.CTkFrame(
-            self.output_column_window,
-            fg_color="#f1f2f6",  
-            corner_radius=10
-        )
-        options_frame.pack(pady=(5, 5), padx=10, fill="both", expand=True)
-
-        self.output_column_var = ctk.StringVar(value="")  
-        if self.output_column != None:
-            self.output_column != None
-        for col in self.data_table["columns"]:
-            radiobutton = ctk.CTkRadioButton(
-                    options_frame,
-                    text=col,
-                    variable=self.output_column_var,
-                    value=col, 
-                    text_color="#2c3e50",  
-                    fg_color="#3498db",  
-                    hover_color="#2980b9", 
-                    border_color="#bdc3c7", 
-                    border_width_checked=4  
-                )
-            radiobutton.pack(anchor="w", padx=15, pady=3)
-
-            if col == self.output_column:
-                self.output_column_var.set(col)
-
-        button_frame = ctk.CTkFrame(
-            self.output_column_window,
-            fg_color="#dfe6e9"  
-        )
-        button_frame.pack(pady=(5, 10))
-
-        confirm_button = ctk.CTkButton(
-            button_frame,
-            text="Confirm Selection",
-            command=self.confirm_output_column,
-            fg_color="#2ecc71",  
-            hover_color="#27ae60",
-            text_color="white",
-            font=("Helvetica", 13),
-            width=160 
-        )
-        confirm_button.pack(pady=3)
-
-        cancel_button = ctk.CTkButton(
-            button_frame,
-            text="Cancel",
-            command=self.output_column_window.destroy,
-            fg_color="#e74c3c",  
-            hover_color="#c0392b",
-            text_color="white",
-            font=("Helvetica", 13),
-            width=160
-        )
-        cancel_button.pack(pady=3)
-
-        self.output_column_window.update_idletasks()
-        width = self.output_column_window.winfo_reqwidth() + 20
-        height = self.output_column_window.winfo_reqheight() + 20
-        self.output_column_window.geometry(f"{width}x{height}")
-
+        self.sync_columns()
+        selected = [self.output_column] if self.output_column is not None else []
+        self.output_list = self.column_list(multiple=False, selected=selected)
+        self.output_column_window = self.open_picker("Select Output Column", self.output_list, self.confirm_output_column)
 
     def confirm_output_column(self):
         """
@@ -250,7 +393,7 @@ class Columns():
         Displays a success message if a column is selected, or a warning if none are chosen.
         """
 
-        selected_output_column = self.output_column_var.get()
+        selected_output_column = next(iter(self.output_list.selected()), None)
         if selected_output_column:
             messagebox.showinfo(
                 "Output Column Selected",
@@ -268,5 +411,3 @@ class Columns():
                 "No Column Selected",
                 "Please select an output column."
             )
-
-
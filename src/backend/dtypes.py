@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_object_dtype
+
+
+def is_numeric_column(series):
+    """Returns True if a column holds numbers of any width (booleans excluded).
+
+    Args:
+        series (pandas.Series): The column to check.
+
+    Returns:
+        bool: Whether the column can be used as a numeric model input.
+    """
+
+    return is_numeric_dtype(series.dtype) and not is_bool_dtype(series.dtype)
+
+
+def column_kind(series):
+    """Returns a short description of the kind of values in a column.
+
+    Args:
+        series (pandas.Series): The column to describe.
+
+    Returns:
+        str: "Numeric", "Text" (strings, objects and categoricals) or "Other" (booleans, dates, ...).
+    """
+
+    if is_numeric_column(series):
+        return "Numeric"
+    if is_object_dtype(series.dtype) or isinstance(series.dtype, (pd.CategoricalDtype, pd.StringDtype)):
+        return "Text"
+    return "Other"
+
+
+#================================== DOWNCASTING ==================================
+
+def downcast_column(series, category_ratio=0.5):
+    """Returns the column converted to the smallest dtype that keeps every value.
+
+    - Integers are downcast to the smallest signed or unsigned integer type.
+    - Floats are stored as float32 only if every value survives the round trip.
+    - Text columns without missing values whose number of distinct values is at
+      most ``category_ratio`` times the number of rows become categoricals.
+      Columns with missing values are left as they are, so preprocessing can
+      still fill them with any value.
+    - Columns where every value is missing are left as they are.
+
+    Args:
+        series (pandas.Series): The column to downcast.
+        category_ratio (float, optional): Maximum ratio of distinct values to rows
+            for a text column to become categorical. Defaults to 0.5.
+
+    Returns:
+        pandas.Series: The downcast column, or the original one if nothing is gained.
+    """
+
+    if len(series) == 0 or is_bool_dtype(series.dtype) or series.isna().all():
+        return series
+
+    kind = series.dtype.kind
+    if kind in "iu":
+        return pd.to_numeric(series, downcast="unsigned" if series.min() >= 0 else "integer")
+    if kind == "f" and series.dtype.itemsize > 4:
+        downcast = series.astype(np.float32)
+        if np.array_equal(downcast.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True):
+            return downcast
+        return series
+    if is_object_dtype(series.dtype) and not series.isnull().any():
+        if series.nunique() <= category_ratio * len(series):
+            return series.astype("category")
+    return series
+
+
+def optimize_dtypes(data, category_ratio=0.5):
+    """Downcasts every column of a DataFrame and reports the memory saved.
+
+    Args:
+        data (pandas.DataFrame): The data to optimize.
+        category_ratio (float, optional): See ``downcast_column``. Defaults to 0.5.
+
+    Returns:
+        tuple: The optimized DataFrame and a report DataFrame with one row per
+        column (``column``, ``dtype_before``, ``dtype_after``, ``bytes_before``, ``bytes_after``).
+    """
+
+    columns = {}
+    report = []
+    for col in data.columns:
+        series = data[col]
+        downcast = downcast_column(series, category_ratio)
+        columns[col] = downcast
+        report.append({
+            "column": col,
+            "dtype_before": str(series.dtype),
+            "dtype_after": str(downcast.dtype),
+            "bytes_before": int(series.memory_usage(index=False, deep=True)),
+            "bytes_after": int(downcast.memory_usage(index=False, deep=True)),
+        })
+
+    optimized = pd.DataFrame(columns, index=data.index, copy=False)
+    return optimized, pd.DataFrame(report, columns=["column", "dtype_before", "dtype_after", "bytes_before", "bytes_after"])
+
+
+def format_memory_report(report):
+    """Formats a memory report as an aligned text table with a total line.
+
+    Args:
+        report (pandas.DataFrame): Report returned by ``optimize_dtypes``.
+
+    Returns:
+        str: The formatted report.
+    """
+
+    def size(value):
+        return f"{value / 1024:,.1f} KB" if value < 1_048_576 else f"{value / 1_048_576:,.1f} MB"
+
+    width = max([len("Column")] + [len(str(col)) for col in report["column"]])
+    lines = [f"{'Column':<{width}}  {'Before':>22}  {'After':>22}"]
+    for row in report.itertuples(index=False):
+        before = f"{row.dtype_before} {size(row.bytes_before)}"
+        after = f"{row.dtype_after} {size(row.bytes_after)}"
+        lines.append(f"{str(row.column):<{width}}  {before:>22}  {after:>22}")
+
+    total_before = report["bytes_before"].sum()
+    total_after = report["bytes_after"].sum()
+    saved = 1 - total_after / total_before if total_before else 0
+    lines.append("")
+    lines.append(f"Total: {size(total_before)} -> {size(total_after)} ({saved:.0%} saved)")
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+from backend.dtypes import is_numeric_column
+from backend.preprocess import Imputer
+
+
+# How text columns are turned into model inputs
+ONE_HOT = "one-hot"
+ORDINAL = "ordinal"
+ENCODINGS = (ONE_HOT, ORDINAL)
+
+
+#==================================== LEVEL CODES ===================================
+
+def level_codes(series, levels):
+    """Returns the position of each value of a column in its vocabulary.
+
+    Values are compared as strings, so a text column filled with a number
+    matches the level that number was saved as.
+
+    Args:
+        series (Series): The column to encode.
+        levels (Index): The vocabulary of the column.
+
+    Returns:
+        ndarray: One int64 code per row; -1 for nulls and values not in the vocabulary.
+    """
+
+    codes = np.full(len(series), -1, dtype=np.int64)
+    present = series.notna().to_numpy()
+    if present.any():
+        codes[present] = levels.get_indexer(series[present].astype(str))
+    return codes
+
+
+#====================================== ENCODER =====================================
+
+class Encoder():
+    """Encodes a model's input columns into a sparse design matrix.
+
+    Numeric columns are kept as they are. Each text column is replaced by a
+    column per level (one-hot) or by the position of its level (ordinal), and
+    the vocabulary of every text column is kept so new data is encoded the
+    same way. The design matrix is a SciPy CSR matrix: one-hot columns store
+    one value per row whatever the number of levels, so columns with tens of
+    thousands of distinct values fit in memory. Like the ``Imputer``, it holds
+    only plain values and is saved with the model.
+
+    With one-hot encoding, a null or a level not seen when fitting sets every
+    column of its text column to 0. With ordinal encoding, it leaves the row
+    without a value, like a null in a numeric column.
+    """
+
+    def __init__(self, columns, categories=None, encoding=ONE_HOT):
+        """Initializes the encoder.
+
+        Args:
+            columns (list): The input columns, in the order the model expects them.
+            categories (dict, optional): Text column name -> list of its levels. Defaults to none,
+                so every column is numeric.
+            encoding (str, optional): One of ``ENCODINGS``. Defaults to ``ONE_HOT``.
+
+        Raises:
+            ValueError: If the encoding is unknown.
+        """
+
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding: {encoding}")
+        self.columns = list(columns)
+        self.categories = dict(categories or {})
+        self.encoding = encoding
+
+    @classmethod
+    def fit(cls, data, columns, encoding=ONE_HOT):
+        """Builds the encoder of ``columns``, with the sorted vocabulary of each non-numeric one.
+
+        Args:
+            data (DataFrame): The data the model is fitted on.
+            columns (list): The input columns of the model.
+            encoding (str, optional): One of ``ENCODINGS``. Defaults to ``ONE_HOT``.
+
+        Returns:
+            Encoder: The fitted encoder.
+        """
+
+        categories = {col: sorted(pd.unique(data[col].dropna().astype(str)))
+                      for col in columns if not is_numeric_column(data[col])}
+        return cls(columns, categories, encoding)
+
+    def numeric_columns(self):
+        """Returns the input columns that are used as they are."""
+
+        return [col for col in self.columns if col not in self.categories]
+
+    def feature_names(self):
+        """Returns the name of each column of the design matrix, ``column=level`` for one-hot levels."""
+
+        names = []
+        for col in self.columns:
+            if col in self.categories and self.encoding == ONE_HOT:
+                names.extend(f"{col}={level}" for level in self.categories[col])
+            else:
+                names.append(col)
+        return names
+
+    def transform(self, data, imputer=None):
+        """Returns the design matrix of the rows of ``data`` that have a value for every input.
+
+        Args:
+            data (DataFrame): Data with at least the input columns.
+            imputer (Imputer, optional): Fills the nulls of the numeric columns, and of the text
+                columns it has a value for. Defaults to filling nothing.
+
+        Returns:
+            tuple: The CSR design matrix of the complete rows, with a column per name of
+            ``feature_names``, and a boolean mask of the rows of ``data`` it holds.
+
+        Raises:
+            KeyError: If an input column is missing from ``data``.
+            ValueError: If a numeric input column is not numeric.
+        """
+
+        from scipy import sparse
+
+        fill_values = imputer.fill_values if imputer is not None else {}
+        numeric_columns = self.numeric_columns()
+        numeric = Imputer(numeric_columns, fill_values).transform(data)
+        positions = {col: position for position, col in enumerate(numeric_columns)}
+        complete = ~np.isnan(numeric).any(axis=1)
+
+        blocks = []
+        for col in self.columns:
+            if col not in self.categories:
+                blocks.append(sparse.csr_matrix(numeric[:, [positions[col]]]))
+                continue
+            values = data[col]
+            if col in fill_values and values.isnull().any():
+                values = values.astype(object).where(values.notna(), str(fill_values[col]))
+            codes = level_codes(values, pd.Index(self.categories[col]))
+            found = codes >= 0
+            if self.encoding == ONE_HOT:
+                indptr = np.concatenate([[0], np.cumsum(found)])
+                blocks.append(sparse.csr_matrix((np.ones(found.sum()), codes[found], indptr),
+                                                shape=(len(codes), len(self.categories[col]))))
+            else:
+                complete &= found
+                blocks.append(sparse.csr_matrix(codes.astype(np.float64).reshape(-1, 1)))
+
+        X = sparse.hstack(blocks, format="csr")
+        if not complete.all():
+            X = X[complete]
+        return X, complete
@@ -0,0 +1,35 @@
+#================================== READ ERRORS ==================================
+
+class ReadCancelled(Exception):
+    """Raised when a chunked read is cancelled before it has finished."""
+
+
+class DataImportError(Exception):
+    """Base class of the errors raised while reading a data file.
+
+    The message of every error is meant to be shown to the user as it is.
+    """
+
+
+class MissingFileError(DataImportError, FileNotFoundError):
+    """Raised when the file, or every file matching a pattern, does not exist."""
+
+
+class UnsupportedFormatError(DataImportError, ValueError):
+    """Raised when the file extension is unknown or cannot be read."""
+
+
+class CorruptFileError(DataImportError, ValueError):
+    """Raised when the file exists but its content cannot be parsed."""
+
+
+class SchemaError(DataImportError, ValueError):
+    """Raised when the columns, tables or arrays of a file do not match what was requested."""
+
+
+class QueryError(DataImportError, ValueError):
+    """Raised when a row filter or SQL condition is invalid or cannot be run."""
+
+
+class MissingDependencyError(DataImportError, ImportError):
+    """Raised when an optional package needed for the file format is not installed."""
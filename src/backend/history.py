@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+
+# Memory the undo history may use before its oldest steps are forgotten
+HISTORY_MAX_BYTES = 256 * 1024 ** 2
+
+
+#====================================== DELTA =====================================
+
+class Delta():
+    """What one preprocessing step changed, kept small enough to undo and redo it.
+
+    A fill keeps the positions it filled, the value put in each column and the
+    dtypes it changed; the old values were all nulls, so they need no storage.
+    A row deletion keeps the positions of the dropped rows and a copy of just
+    those rows. The size of a delta follows the size of the change, not the
+    size of the data.
+    """
+
+    def __init__(self, step, changes, dtypes=None, removed_rows=None):
+        """Initializes the delta.
+
+        Args:
+            step (tuple): The ``(option, constant)`` applied.
+            changes (ChangeSet): The cells filled or the rows dropped, with the fill values.
+            dtypes (dict, optional): Column name -> ``(old dtype, new dtype)`` for the columns the step converted.
+            removed_rows (DataFrame, optional): The dropped rows, in their original order.
+        """
+
+        self.step = step
+        self.changes = changes
+        self.dtypes = dtypes or {}
+        self.removed_rows = removed_rows
+
+        size = sum(rows.nbytes for rows in changes.filled_cells.values()) + changes.dropped_rows.nbytes
+        if removed_rows is not None:
+            size += int(removed_rows.memory_usage(index=True, deep=True).sum())
+        self._nbytes = size
+
+    def nbytes(self):
+        """Returns the approximate memory used by the delta, in bytes."""
+
+        return self._nbytes
+
+
+#===================================== HISTORY ====================================
+
+class History():
+    """Undo and redo stacks of the preprocessing steps applied to a dataset.
+
+    Undoing or redoing a fill writes only the filled cells back. Undoing or
+    redoing a row deletion rebuilds the DataFrame around the dropped rows, so it
+    returns a new DataFrame; a fill keeps working on the same one. When the
+    deltas use more than ``max_bytes``, the oldest steps can no longer be undone.
+    """
+
+    def __init__(self, fill, max_bytes=HISTORY_MAX_BYTES):
+        """Initializes an empty history.
+
+        Args:
+            fill (callable): Applies a step in place, ``fill(data, option, constant)``, and returns
+                its ``ChangeSet``; normally ``fill_nulls``.
+            max_bytes (int, optional): Memory the deltas may use. Defaults to ``HISTORY_MAX_BYTES``.
+        """
+
+        self.fill = fill
+        self.max_bytes = max_bytes
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def can_undo(self):
+        """Returns True if there is a step to undo."""
+
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        """Returns True if there is an undone step to redo."""
+
+        return bool(self.redo_stack)
+
+    def nbytes(self):
+        """Returns the approximate memory used by the history, in bytes."""
+
+        return sum(delta.nbytes() for delta in self.undo_stack + self.redo_stack)
+
+    def apply(self, data, option, constant=None):
+        """Applies a null-handling option to a DataFrame in place and records how to undo it.
+
+        Applying a step forgets the undone steps.
+
+        Args:
+            data (DataFrame): The dataset to modify.
+            option (str): The option, for example "Fill with mean".
+            constant (float, optional): Value used by "Fill with constant".
+
+        Returns:
+            ChangeSet: The cells filled or the rows dropped, as returned by ``fill``.
+
+        Raises:
+            ValueError: If the option is unknown.
+        """
+
+        removed_rows = None
+        if option == "Delete rows with nulls":
+            removed_rows = data[data.isnull().to_numpy().any(axis=1)].copy()
+        dtypes_before = data.dtypes
+        changes = self.fill(data, option, constant)
+
+        dtypes = {col: (dtypes_before[col], data[col].dtype) for col in changes.filled_cells
+                  if data[col].dtype != dtypes_before[col]}
+        self.undo_stack.append(Delta((option, constant), changes, dtypes, removed_rows))
+        self.redo_stack.clear()
+        self._trim()
+        return changes
+
+    def _trim(self):
+        """Forgets the oldest undo steps while the history is over its memory budget."""
+
+        total = self.nbytes()
+        while self.undo_stack and total > self.max_bytes:
+            total -= self.undo_stack.pop(0).nbytes()
+
+    #------------------------------- UNDO / REDO ------------------------------
+
+    def undo(self, data):
+        """Reverts the last applied step.
+
+        Args:
+            data (DataFrame): The dataset as the step left it.
+
+        Returns:
+            tuple: The dataset (the same object after a fill, a new one after a row deletion)
+            and the ``Delta`` undone. Its ``changes`` are the cells set back to null.
+
+        Raises:
+            IndexError: If there is nothing to undo.
+        """
+
+        delta = self.undo_stack.pop()
+        if delta.removed_rows is not None:
+            data = self._restore_rows(data, delta)
+        else:
+            for col, rows in delta.changes.filled_cells.items():
+                position = data.columns.get_loc(col)
+                data.iloc[rows, position] = None
+                if col in delta.dtypes:
+                    data[col] = data[col].astype(delta.dtypes[col][0])
+        self.redo_stack.append(delta)
+        return data, delta
+
+    def redo(self, data):
+        """Applies the last undone step again, from its delta instead of recomputing it.
+
+        Args:
+            data (DataFrame): The dataset as the undo left it.
+
+        Returns:
+            tuple: The dataset (the same object after a fill, a new one after a row deletion)
+            and the ``Delta`` redone.
+
+        Raises:
+            IndexError: If there is nothing to redo.
+        """
+
+        delta = self.redo_stack.pop()
+        if delta.removed_rows is not None:
+            keep = np.ones(len(data), dtype=bool)
+            keep[delta.changes.dropped_rows] = False
+            data = data[keep]
+        else:
+            for col, rows in delta.changes.filled_cells.items():
+                if col in delta.dtypes:
+                    data[col] = data[col].astype(delta.dtypes[col][1])
+                data.iloc[rows, data.columns.get_loc(col)] = delta.changes.fill_values[col]
+        self.undo_stack.append(delta)
+        return data, delta
+
+    @staticmethod
+    def _restore_rows(data, delta):
+        """Returns ``data`` with the dropped rows of ``delta`` put back at their old positions."""
+
+        dropped = delta.changes.dropped_rows
+        kept = np.ones(len(data) + len(dropped), dtype=bool)
+        kept[dropped] = False
+        positions = np.concatenate([np.flatnonzero(kept), dropped])
+        restored = pd.concat([data, delta.removed_rows])
+        return restored.iloc[np.argsort(positions, kind="stable")]
+
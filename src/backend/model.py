@@ -1,11 +1,101 @@
+import importlib
 import numpy as np
 import pickle
-import joblib
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error
 from tkinter import messagebox, filedialog
 import os
+from backend.dtypes import is_numeric_column
+from backend.encoding import ONE_HOT, Encoder
+from backend.plotting import ModelFigure
+from backend.tasks import run_inline
+
+
+# Imported when first needed (or by preload_modules) so they do not delay the window
+HEAVY_MODULES = ("sklearn.linear_model", "sklearn.metrics", "scipy.sparse", "joblib", "matplotlib.pyplot")
+
+
+def preload_modules():
+    """Imports the modules used for fitting, plotting and saving models.
+
+    Meant to run on a background thread once the window is shown, so the first
+    fit or plot does not pay for the imports.
+    """
+
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+
+
+#======================================= PLOT DATA ======================================
+
+# Above this many rows, 2D plots show a density grid and 3D plots a random sample
+PLOT_POINT_LIMIT = 50_000
+DENSITY_BINS = 200
+PLANE_GRID_SIZE = 20
+
+
+def prepare_plot_data(model, X, y, point_limit=PLOT_POINT_LIMIT, seed=0):
+    """Computes what the model plots draw, with a size that does not grow with the data.
+
+    The fitted line or plane is evaluated on a few points spanning the inputs
+    instead of predicting every row. Up to ``point_limit`` rows the data is
+    drawn as points; above it, a 2D plot gets a density grid of the rows and a
+    3D plot a random sample of ``point_limit`` of them.
+
+    Args:
+        model (LinearRegression): The fitted model.
+        X (ndarray): Input values, with one or two columns.
+        y (ndarray): Output values.
+        point_limit (int, optional): Rows drawn as points. Defaults to ``PLOT_POINT_LIMIT``.
+        seed (int, optional): Seed of the random sample. Defaults to 0.
+
+    Returns:
+        dict: ``rows`` (number of rows), ``points`` (``(X, y)`` to scatter, or None),
+        ``density`` (``(counts, x_edges, y_edges)``, or None) and ``fit`` (``(x, y)`` of
+        the line, or ``(x1, x2, y)`` grids of the plane).
+    """
+
+    rows = len(y)
+    plot_data = {"rows": rows, "points": None, "density": None}
+    if X.shape[1] == 1:
+        x = np.array([X[:, 0].min(), X[:, 0].max()])
+        plot_data["fit"] = (x, model.predict(x.reshape(-1, 1)))
+        if rows > point_limit:
+            plot_data["density"] = np.histogram2d(X[:, 0], y, bins=DENSITY_BINS)
+            return plot_data
+    else:
+        x1, x2 = np.meshgrid(np.linspace(X[:, 0].min(), X[:, 0].max(), PLANE_GRID_SIZE),
+                             np.linspace(X[:, 1].min(), X[:, 1].max(), PLANE_GRID_SIZE))
+        plane = model.predict(np.column_stack([x1.ravel(), x2.ravel()])).reshape(x1.shape)
+        plot_data["fit"] = (x1, x2, plane)
+
+    if rows > point_limit:
+        sample = np.sort(np.random.default_rng(seed).choice(rows, size=point_limit, replace=False))
+        plot_data["points"] = (X[sample], y[sample])
+    else:
+        plot_data["points"] = (X, y)
+    return plot_data
+
+
+#======================================== FORMULA =======================================
+
+def format_formula(output_column, coefficients, names, intercept):
+    """Returns the text of a fitted linear formula.
+
+    Like the coefficients, which NumPy prints with an ellipsis past 1000 values,
+    the names of a long list are cut to its first and last three.
+
+    Args:
+        output_column (str): Name of the output column.
+        coefficients (ndarray): The coefficient of each input.
+        names (list): The name of each input.
+        intercept (float): The intercept of the model.
+
+    Returns:
+        str: ``output = [coefficients] * [names] + intercept``.
+    """
+
+    if len(names) > np.get_printoptions()["threshold"]:
+        names = names[:3] + ["..."] + names[-3:]
+    return f"{output_column} = {coefficients} * {names} + {intercept:.4f}"
 
 
 #========================================= MODEL ========================================
@@ -14,7 +104,8 @@ class Model:
     """Class for creating and managing linear regression models."""
 
     def __init__(self, save_button, load_model_button, predict_button, show_model_button, preprocess_button, select_columns_button,
-                 select_output_button, null_option_menu, create_model_button, constant_entry, null_handling_label, null_handling_frame, load_button):
+                 select_output_button, null_option_menu, create_model_button, constant_entry, null_handling_label, null_handling_frame, load_button,
+                 run_task=None, plot_view=None):
         """
         Initialize the Model class with UI components.
 
@@ -32,6 +123,10 @@ class Model:
             null_handling_label (Label): Label to describe null value handling.
             null_handling_frame (Frame): Frame containing null value handling options.
             load_button (Button): Button to load data.
+            run_task (callable, optional): Runs ``run_task(work, on_done, on_error)`` for fitting and plot
+                preparation, for example on a background thread. Defaults to running them straight away.
+            plot_view (PlotView, optional): Window the plots are drawn in and updated on re-plots.
+                Defaults to a pyplot window per plot.
         """
 
         self.model_formula = {}
@@ -41,6 +136,8 @@ class Model:
         self.output_column = None
         self.data_table_df = None
         self.model = None
+        self.imputer = None
+        self.encoder = None
         self.save_button = save_button
         self.load_model_button = load_model_button
         self.predict_button=predict_button
@@ -54,10 +151,13 @@ class Model:
         self.null_handling_label=null_handling_label
         self.null_handling_frame=null_handling_frame
         self.load_button=load_button
+        self.run_task = run_task or run_inline
+        self.plot_view = plot_view
 
     #------------------------------- CREATE MODEL -----------------------------------
 
-    def create_model(self, columns_selected, output_column, data_table_df, formula_label, mse_label, r2_label):
+    def create_model(self, columns_selected, output_column, data_table_df, formula_label, mse_label, r2_label, imputer=None,
+                     encoding=ONE_HOT, fit_imputer=None):
         """
         Create a linear regression model using selected input and output columns.
 
@@ -68,9 +168,17 @@ class Model:
             formula_label (Label): Label to display the model formula.
             mse_label (Label): Label to display the mean squared error.
             r2_label (Label): Label to display the R-squared value.
-
-        Raises:
-            ValueError: If input/output columns contain non-numeric values.
+            imputer (Imputer, optional): The null handling of the inputs, saved with the model
+                and applied to new data at predict time. Defaults to none.
+            encoding (str, optional): How text input columns are encoded, see ``ENCODINGS``.
+                Defaults to one-hot.
+            fit_imputer (callable, optional): Returns the imputer; called by the fit task, for an
+                imputer that computes statistics over the data. Replaces ``imputer`` when given.
+
+        The fit runs through ``run_task``; the labels are updated once it has finished.
+        When an input column holds text, the model is fitted on the sparse design
+        matrix of an ``Encoder``, which is saved with the model. A non-numeric
+        output column is reported as a model error.
         """
         
         self.columns_selected = columns_selected
@@ -84,27 +192,41 @@ class Model:
             messagebox.showerror("Error", "Please select input and output columns.")
             return
 
-        try:
-            X = self.data_table_df[self.columns_selected].values
-            y = self.data_table_df[self.output_column].values
-            if not (np.issubdtype(X.dtype, np.number) and np.issubdtype(y.dtype, np.number)):
-                formula_label.configure(text="Formula: None")
-                mse_label.configure(text="MSE: None")
-                r2_label.configure(text="R2: None")
-                self.save_button.configure(state="disabled")
-                self.predict_button.configure(state="disabled")
-                self.show_model_button.configure(state="disabled")
+        def fit():
+            from sklearn.linear_model import LinearRegression
+            from sklearn.metrics import mean_squared_error
+
+            X = data_table_df[columns_selected]
+            y = data_table_df[output_column]
+            if not is_numeric_column(y):
                 raise ValueError("Columns must contain numeric values.")
 
-            self.model = LinearRegression()
-            self.model.fit(X, y)
-            y_pred = self.model.predict(X)
-            r2 = self.model.score(X, y)
-            mse = mean_squared_error(y, y_pred)
-            self.model_formula = {"formula": f"{self.output_column} = {self.model.coef_} * {self.columns_selected} + {self.model.intercept_:.4f}"}
+            encoder = None
+            if all(is_numeric_column(X[col]) for col in X.columns):
+                # Downcast columns are fitted in full precision
+                X = X.to_numpy(dtype=np.float64)
+            else:
+                encoder = Encoder.fit(X, columns_selected, encoding)
+                X, complete = encoder.transform(X)
+                if not complete.all():
+                    raise ValueError("Input columns must not contain null values.")
+            y = y.to_numpy(dtype=np.float64)
+
+            model = LinearRegression()
+            model.fit(X, y)
+            y_pred = model.predict(X)
+            fitted_imputer = fit_imputer() if fit_imputer is not None else imputer
+            return model, encoder, fitted_imputer, model.score(X, y), mean_squared_error(y, y_pred)
+
+        def show_fit(result):
+            self.model, self.encoder, self.imputer, r2, mse = result
+            names = self.encoder.feature_names() if self.encoder is not None else self.columns_selected
+            formula = format_formula(self.output_column, self.model.coef_, names, self.model.intercept_)
+            # The coefficients are kept as numbers too: the text of a long formula is cut
+            self.model_formula = {"formula": formula, "coefficients": self.model.coef_.tolist(),
+                                  "intercept": float(self.model.intercept_)}
             self.model_metrics = {"r2": r2, "mse": mse}
 
-            formula = f"{self.output_column} = {self.model.coef_} * {self.columns_selected} + {self.model.intercept_:.4f}"
             formula_label.configure(text=f"Formula: {formula}")
             mse_label.configure(text=f"MSE: {mse:.4f}")
             r2_label.configure(text=f"R2: {r2:.4f}")
@@ -114,8 +236,18 @@ class Model:
             self.show_model_button.configure(state="normal")
 
             messagebox.showinfo("Model Created", "Model created successfully.")
-        except Exception as e:
-            messagebox.showerror("Model Error", f"An error occurred: {e}")
+
+        def show_error(error):
+            if isinstance(error, ValueError):
+                formula_label.configure(text="Formula: None")
+                mse_label.configure(text="MSE: None")
+                r2_label.configure(text="R2: None")
+                self.save_button.configure(state="disabled")
+                self.predict_button.configure(state="disabled")
+                self.show_model_button.configure(state="disabled")
+            messagebox.showerror("Model Error", f"An error occurred: {error}")
+
+        self.run_task(fit, show_fit, show_error)
 
     #------------------------------- SHOW MODEL ----------------------------
 
@@ -131,69 +263,93 @@ class Model:
             messagebox.showerror("Error", "No model available to plot. Create a model first.")
             return
 
-        X = self.data_table_df[self.columns_selected].values
-        y = self.data_table_df[self.output_column].values
+        data_table_df = self.data_table_df
+        columns_selected = self.columns_selected
+        output_column = self.output_column
+        model = self.model
 
-        y_pred = self.model.predict(X)
-        r2 = self.model_metrics.get("r2", 0)
-        mse = self.model_metrics.get("mse", 0)
+        if len(columns_selected) > 2:
+            messagebox.showinfo("Plot Error", "Cannot plot with more than 2 features.")
+            return
+        if self.encoder is not None:
+            messagebox.showinfo("Plot Error", "Cannot plot a model with text input columns.")
+            return
 
-        try:
-            if X.shape[1] == 1:
-                self.plot_model_2d(X, y, y_pred, r2, mse)
-            elif X.shape[1] == 2:
-                self.plot_model_3d(X, y, y_pred, r2, mse)
-            else:
-                messagebox.showinfo("Plot Error", "Cannot plot with more than 2 features.")
-        except Exception as e:
-            messagebox.showerror("Plot Error", f"An error occurred while plotting: {e}")
+        def prepare():
+            X = data_table_df[columns_selected].to_numpy(dtype=np.float64)
+            y = data_table_df[output_column].to_numpy(dtype=np.float64)
+            return prepare_plot_data(model, X, y)
+
+        def plot(plot_data):
+            r2 = self.model_metrics.get("r2", 0)
+            mse = self.model_metrics.get("mse", 0)
+
+            try:
+                if len(columns_selected) == 1:
+                    self.plot_model_2d(plot_data, r2, mse)
+                else:
+                    self.plot_model_3d(plot_data, r2, mse)
+            except Exception as e:
+                messagebox.showerror("Plot Error", f"An error occurred while plotting: {e}")
 
+        # The plot data is computed by the task; the figure is drawn in the callback, on the Tk thread
+        self.run_task(prepare, plot, lambda error: messagebox.showerror("Plot Error", f"An error occurred while plotting: {error}"))
 
-    def plot_model_2d(self, X, y, y_pred, r2, mse):
+
+    def plot_model_2d(self, plot_data, r2, mse):
         """
         Plot the linear regression model in 2D.
 
+        Large datasets are drawn as a density grid of the rows instead of one point per row.
+
         Args:
-            X (ndarray): Input feature values.
-            y (ndarray): Actual target values.
-            y_pred (ndarray): Predicted target values.
+            plot_data (dict): Data returned by ``prepare_plot_data`` for one input column.
             r2 (float): R-squared value of the model.
             mse (float): Mean squared error of the model.
         """
 
-        plt.figure(figsize=(10, 6))
-        plt.scatter(X, y, color="blue", label="Actual Data")
-        plt.plot(X, y_pred, color="red", label="Predicted Line")
-        plt.xlabel(self.columns_selected[0])
-        plt.ylabel(self.output_column)
-        plt.title("Linear Regression Model (2D)")
-        plt.legend(loc='upper right')
-        plt.suptitle(f"{self.output_column} = {self.model_formula['formula']}\nRÂ² = {r2:.4f}, MSE = {mse:.4f}", fontsize=10, color="black")
-        plt.show()
-
-    def plot_model_3d(self, X, y, y_pred, r2, mse):
+        self.draw_plot(plot_data, (self.columns_selected[0], self.output_column), "Linear Regression Model (2D)", r2, mse)
+
+    def plot_model_3d(self, plot_data, r2, mse):
         """
         Plot the linear regression model in 3D.
 
+        The regression plane is drawn on a small grid, and large datasets as a random sample of their rows.
+
+        Args:
+            plot_data (dict): Data returned by ``prepare_plot_data`` for two input columns.
+            r2 (float): R-squared value of the model.
+            mse (float): Mean squared error of the model.
+        """
+
+        self.draw_plot(plot_data, (self.columns_selected[0], self.columns_selected[1], self.output_column),
+                       "Linear Regression Model (3D)", r2, mse)
+
+    def draw_plot(self, plot_data, labels, title, r2, mse):
+        """
+        Draw a model plot on the plot view, or in a pyplot window that is closed afterwards.
+
         Args:
-            X (ndarray): Input feature values with 2 dimensions.
-            y (ndarray): Actual target values.
-            y_pred (ndarray): Predicted target values.
+            plot_data (dict): Data returned by ``prepare_plot_data``.
+            labels (tuple): Axis labels, see ``ModelFigure.draw``.
+            title (str): Title of the plot.
             r2 (float): R-squared value of the model.
             mse (float): Mean squared error of the model.
         """
 
-        fig = plt.figure(figsize=(10, 6))
-        ax = fig.add_subplot(111, projection="3d")
-        ax.scatter(X[:, 0], X[:, 1], y, color="blue", label="Actual Data")
-        ax.plot_trisurf(X[:, 0], X[:, 1], y_pred, color="red", alpha=0.6)
-        ax.set_xlabel(self.columns_selected[0])
-        ax.set_ylabel(self.columns_selected[1])
-        ax.set_zlabel(self.output_column)
-        ax.set_title("Linear Regression Model (3D)")
-        plt.suptitle(f"{self.output_column} = {self.model_formula['formula']}\nRÂ² = {r2:.4f}, MSE = {mse:.4f}", fontsize=10, color="black")
-        plt.legend(loc='upper right')
-        plt.show()
+        suptitle = f"{self.output_column} = {self.model_formula['formula']}\nR² = {r2:.4f}, MSE = {mse:.4f}"
+        if self.plot_view is not None:
+            self.plot_view.plot(plot_data, labels, title, suptitle)
+            return
+
+        import matplotlib.pyplot as plt
+
+        figure = plt.figure(figsize=(10, 6))
+        try:
+            ModelFigure(figure).draw(plot_data, labels, title, suptitle)
+            plt.show()
+        finally:
+            plt.close(figure)
 
     #------------------------------------- SAVE MODEL / DESCRIPTION ----------------------------------
 
@@ -221,12 +377,15 @@ class Model:
                     "output_column": self.output_column,
                     "metrics": self.model_metrics,
                     "description": self.description_saved,
+                    "imputer": self.imputer,
+                    "encoder": self.encoder,
                 }
 
                 if file_path.endswith(".pkl"):
                     with open(file_path, "wb") as file:
                         pickle.dump(model_data, file)
                 elif file_path.endswith(".joblib"):
+                    import joblib
                     joblib.dump(model_data, file_path)
 
                 messagebox.showinfo("Model Saved", f"Model saved at {file_path}")
@@ -295,6 +454,7 @@ class Model:
             elif file_path.endswith(".joblib"):
                     #Try to load .joblib files
                     try:
+                        import joblib
                         model_data = joblib.load(file_path)
                     except Exception as e:
                         raise Exception(f"JoblibError: Error al cargar el archivo joblib: {str(e)}")
@@ -312,6 +472,9 @@ class Model:
             self.output_column = model_data.get("output_column", "")
             self.model_metrics = model_data.get("metrics", {})
             self.description_saved = model_data.get("description", None)
+            # Models saved before the imputer was stored have none
+            self.imputer = model_data.get("imputer")
+            self.encoder = model_data.get("encoder")
 
             self.predict_button.configure(state="normal")
             self.load_button.configure(state="disabled")
@@ -0,0 +1,124 @@
+import numpy as np
+
+
+#================================== MODELFIGURE ==================================
+
+class ModelFigure():
+    """Draws the model plots on a matplotlib figure and updates them in place on re-plots.
+
+    The axes and artists are kept between plots of the same kind: points and
+    lines get their new data, and only the artists that cannot be updated (the
+    density grid and the 3D points and plane) are replaced. The figure is only
+    cleared when the kind of plot changes.
+    """
+
+    def __init__(self, figure):
+        """Initializes the drawing on a figure.
+
+        Args:
+            figure (Figure): The matplotlib figure to draw on.
+        """
+
+        self.figure = figure
+        self.kind = None
+        self.axes = None
+        self.artists = {}
+
+    def _use(self, kind):
+        """Prepares the axes for a kind of plot.
+
+        Returns:
+            bool: True if the figure was cleared and the artists have to be created.
+        """
+
+        if kind == self.kind:
+            return False
+        self.figure.clear()
+        self.artists = {}
+        self.kind = kind
+        self.axes = self.figure.add_subplot(111, projection="3d" if kind == "3d" else None)
+        return True
+
+    def _replace(self, name, artist):
+        """Removes the previous artist stored under ``name`` and stores ``artist`` instead."""
+
+        previous = self.artists.get(name)
+        if previous is not None:
+            previous.remove()
+        self.artists[name] = artist
+
+    def draw(self, plot_data, labels, title, suptitle):
+        """Draws or updates a model plot.
+
+        Args:
+            plot_data (dict): Data returned by ``prepare_plot_data``.
+            labels (tuple): Axis labels: ``(x, y)`` for a 2D plot, ``(x1, x2, y)`` for a 3D plot.
+            title (str): Title of the axes.
+            suptitle (str): Title of the figure, with the formula and metrics.
+        """
+
+        if len(labels) == 2:
+            self._draw_2d(plot_data)
+        else:
+            self._draw_3d(plot_data)
+
+        ax = self.axes
+        ax.set_xlabel(labels[0])
+        ax.set_ylabel(labels[1])
+        if len(labels) == 3:
+            ax.set_zlabel(labels[2])
+        ax.set_title(title)
+        self.figure.suptitle(suptitle, fontsize=10, color="black")
+        ax.legend(loc="upper right")
+
+    def _draw_2d(self, plot_data):
+        """Draws the rows, as points or as a density grid, and the fitted line."""
+
+        from matplotlib.colors import LogNorm
+
+        density = plot_data["density"]
+        created = self._use("density" if density is not None else "points")
+        ax = self.axes
+        x, line = plot_data["fit"]
+
+        if density is not None:
+            counts, x_edges, y_edges = density
+            mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap="Blues", norm=LogNorm())
+            self._replace("data", mesh)
+            if created:
+                self.artists["colorbar"] = self.figure.colorbar(mesh, ax=ax)
+            else:
+                self.artists["colorbar"].update_normal(mesh)
+            self.artists["colorbar"].set_label(f"Rows (of {plot_data['rows']:,})")
+            limits = np.array([[x_edges[0], y_edges[0]], [x_edges[-1], y_edges[-1]]])
+        else:
+            X, y = plot_data["points"]
+            limits = np.column_stack([X[:, 0], y])
+            if created:
+                self.artists["data"] = ax.scatter(X[:, 0], y, color="blue", label="Actual Data")
+            else:
+                self.artists["data"].set_offsets(limits)
+
+        if created:
+            self.artists["fit"], = ax.plot(x, line, color="red", label="Predicted Line")
+        else:
+            self.artists["fit"].set_data(x, line)
+
+        # Collections are not taken into account by relim, so the limits are set from the data
+        ax.ignore_existing_data_limits = True
+        ax.update_datalim(limits)
+        ax.update_datalim(np.column_stack([x, line]))
+        ax.autoscale_view()
+
+    def _draw_3d(self, plot_data):
+        """Draws the rows, or a sample of them, and the fitted plane."""
+
+        self._use("3d")
+        ax = self.axes
+        X, y = plot_data["points"]
+        label = "Actual Data" if len(y) == plot_data["rows"] else f"Actual Data (sample of {len(y):,} of {plot_data['rows']:,})"
+
+        self._replace("data", ax.scatter(X[:, 0], X[:, 1], y, color="blue", label=label))
+        self._replace("fit", ax.plot_surface(*plot_data["fit"], color="red", alpha=0.6))
+        ax.relim()
+        ax.autoscale_view()
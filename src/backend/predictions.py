@@ -1,6 +1,44 @@
 from tkinter import Toplevel, StringVar, messagebox
 import customtkinter as ctk
+import numpy as np
+import pandas as pd
 from unittest.mock import Mock
+from backend.preprocess import Imputer
+
+
+#======================================= BATCH SCORING ================================
+
+def score(model_data, data):
+    """Predicts the output of every row of a dataset with a saved model.
+
+    The nulls of the inputs are filled by the model's imputer in one array
+    operation, so raw data can be scored without preprocessing it first. Text
+    inputs are encoded with the vocabulary saved by the model's encoder.
+
+    Args:
+        model_data (dict): A model as saved by ``Model.save_model``.
+        data (DataFrame): Data with at least the input columns of the model.
+
+    Returns:
+        ndarray: One prediction per row of ``data``; NaN for rows with a null the imputer does not fill.
+
+    Raises:
+        KeyError: If an input column is missing from ``data``.
+        ValueError: If an input column is not numeric.
+    """
+
+    imputer = model_data.get("imputer") or Imputer(model_data["input_columns"])
+    encoder = model_data.get("encoder")
+    if encoder is not None:
+        X, complete = encoder.transform(data, imputer)
+    else:
+        X = imputer.transform(data)
+        complete = ~np.isnan(X).any(axis=1)
+        X = X[complete]
+    predictions = np.full(len(data), np.nan)
+    if complete.any():
+        predictions[complete] = model_data["model"].predict(X)
+    return predictions
 
 
 #======================================= PREDICTIONS ==================================
@@ -8,16 +46,22 @@ from unittest.mock import Mock
 class Predictions:
     """Generates predictions based on a formula and user input."""
 
-    def __init__(self, formula, root, result_prediction_label):
+    def __init__(self, formula, root, result_prediction_label, imputer=None, encoder=None):
         """Initializes the Predictions class with a formula, root window, and result display.
 
         Args:
             formula (dict): Contains the formula used for prediction.
             root (Tk): Root Tkinter window.
             result_prediction_label (Widget): Label to display prediction results.
+            imputer (Imputer, optional): Fills the values left empty, like the model's preprocessing.
+                Defaults to requiring every value.
+            encoder (Encoder, optional): Encodes the text inputs like the model's training data.
+                Defaults to every input being a number.
         """
 
         self.formula = formula
+        self.imputer = imputer
+        self.encoder = encoder
         self.root = root
         self.result_prediction_label = result_prediction_label
 
@@ -35,15 +79,24 @@ class Predictions:
 
         formula_sep = self.formula["formula"]
         
-        coef_part = formula_sep.split('=')[1].split('*')[0].strip() 
-        coef_str = coef_part.strip('[]')  # Elimina los corchetes
-        self.coefficients = [float(x) for x in coef_str.split()]
+        if "coefficients" in self.formula:
+            self.coefficients = list(self.formula["coefficients"])
+        else:
+            coef_part = formula_sep.split('=')[1].split('*')[0].strip() 
+            coef_str = coef_part.strip('[]')  # Elimina los corchetes
+            self.coefficients = [float(x) for x in coef_str.split()]
 
-        columns_part = formula_sep.split('*')[1].split('+')[0].strip()  
-        columns_str = columns_part.strip("[]")  # Elimina los corchetes
-        self.columns = [col.strip(" '") for col in columns_str.split(',')] 
+        if self.encoder is not None:
+            self.columns = list(self.encoder.columns)
+        else:
+            columns_part = formula_sep.split('*')[1].split('+')[0].strip()  
+            columns_str = columns_part.strip("[]")  # Elimina los corchetes
+            self.columns = [col.strip(" '") for col in columns_str.split(',')] 
 
-        self.formula_intercept = float(formula_sep.split('+')[-1].strip())  
+        if "intercept" in self.formula:
+            self.formula_intercept = self.formula["intercept"]
+        else:
+            self.formula_intercept = float(formula_sep.split('+')[-1].strip())  
 
         #--------------- Create predictions window ----------------
         
@@ -151,15 +204,38 @@ class Predictions:
         self.validate_inputs(values)
         
         try:
-            float_values = [float(v) for v in values]
+            if self.encoder is not None:
+                prediction = self.encoded_prediction(values)
+            else:
+                float_values = [float(v) if v.strip() else np.nan for v in values]
+                if self.imputer is not None:
+                    float_values = self.imputer.transform(pd.DataFrame([float_values], columns=self.columns))[0]
             
-            prediction = sum(coef * valor for coef, valor in zip(self.coefficients, float_values)) + self.formula_intercept                
+                prediction = sum(coef * valor for coef, valor in zip(self.coefficients, float_values)) + self.formula_intercept                
             self.result_prediction_label.configure(text=f"Result: {prediction}")
             
             self.result_var.set(f"{prediction:.4f}")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
 
+    def encoded_prediction(self, values):
+        """Returns the prediction for entered values that include text inputs.
+
+        Args:
+            values (list): The value entered for each input column.
+
+        Raises:
+            ValueError: If a value is missing and cannot be filled, or a numeric value is invalid.
+        """
+
+        text_columns = self.encoder.categories
+        row = pd.DataFrame([{col: (v.strip() or None) if col in text_columns else (float(v) if v.strip() else np.nan)
+                             for col, v in zip(self.columns, values)}])
+        X, complete = self.encoder.transform(row, self.imputer)
+        if not complete.all():
+            raise ValueError("Enter a value seen in the training data for every ordinal column.")
+        return float((X @ np.asarray(self.coefficients))[0]) + self.formula_intercept
+
     def validate_inputs(self, values):
         """Validates user inputs before performing predictions.
 
@@ -167,9 +243,13 @@ class Predictions:
             values (list): List of user-provided input values.
 
         Raises:
-            ValueError: If any input value is missing or invalid.
+            ValueError: If any input value the imputer cannot fill is missing or invalid.
         """
 
-        if any(v.strip() == "" for v in values): 
+        optional = set(self.imputer.fill_values) if self.imputer is not None else set()
+        if self.encoder is not None:
+            # An empty text column is encoded like an unknown level
+            optional.update(self.encoder.categories)
+        if any(v.strip() == "" and col not in optional for col, v in zip(self.columns, values)): 
             messagebox.showerror("Error", "Enter all values for the variables.")
             raise ValueError("Please enter all values for the variables.")
@@ -1,4 +1,316 @@
+import numpy as np
+from pandas.api.types import is_integer_dtype
 from tkinter import messagebox
+from backend.dtypes import is_numeric_column
+from backend.history import History
+from backend.tasks import run_inline
+
+
+#==================================== CHANGESET ===================================
+
+class ChangeSet():
+    """Describes the cells and rows a preprocessing operation changed.
+
+    Positions are row positions in the DataFrame before the operation, so a
+    view of the data can patch only what changed instead of redrawing it all.
+    """
+
+    def __init__(self, filled_cells=None, dropped_rows=None, fill_values=None):
+        """Initializes the change set.
+
+        Args:
+            filled_cells (dict, optional): Column name -> sorted array of the row positions filled in it.
+            dropped_rows (ndarray, optional): Sorted array of the row positions removed.
+            fill_values (dict, optional): Column name -> value its nulls were filled with.
+        """
+
+        self.filled_cells = filled_cells or {}
+        self.fill_values = fill_values or {}
+        self.dropped_rows = dropped_rows if dropped_rows is not None else np.empty(0, dtype=np.intp)
+
+    def cell_count(self):
+        """Returns the number of filled cells."""
+
+        return sum(len(rows) for rows in self.filled_cells.values())
+
+    def is_empty(self):
+        """Returns True if nothing was filled or dropped."""
+
+        return not self.cell_count() and not len(self.dropped_rows)
+
+
+#==================================== IMPUTATION ==================================
+
+def mask_positions(columns, mask):
+    """Returns the row positions of the nulls of each column, from a null mask.
+
+    Args:
+        columns (list): The columns of the mask.
+        mask (ndarray): Boolean mask with a row per row of the data and a column per column.
+
+    Returns:
+        dict: Column name -> sorted array of the row positions of its nulls.
+    """
+
+    # Positions of the transposed mask come out grouped by column
+    positions = np.nonzero(mask.T)[1]
+    return dict(zip(columns, np.split(positions, np.cumsum(mask.sum(axis=0))[:-1])))
+
+
+def null_positions(data, columns):
+    """Returns the row positions of the nulls of each column, from a single null mask.
+
+    Args:
+        data (DataFrame): The dataset.
+        columns (list): The columns to look at.
+
+    Returns:
+        dict: Column name -> sorted array of the row positions of its nulls.
+    """
+
+    if not len(columns):
+        return {}
+    return mask_positions(columns, data[columns].isna().to_numpy())
+
+
+def column_statistics(block, mask, statistic):
+    """Computes the mean or median of every column of a 2D array in one reduction.
+
+    Args:
+        block (ndarray): The values, a column per dataset column. Nulls are set to 0 for the mean.
+        mask (ndarray): Boolean mask of the nulls of ``block``.
+        statistic (str): "mean" or "median".
+
+    Returns:
+        ndarray: The statistic of each column rounded to 4 decimals, or 0 for columns without values.
+    """
+
+    counts = len(block) - mask.sum(axis=0)
+    has_values = counts > 0
+    values = np.zeros(block.shape[1])
+    if statistic == "mean":
+        np.copyto(block, 0, where=mask)
+        values[has_values] = block.sum(axis=0)[has_values] / counts[has_values]
+    elif has_values.all():
+        values = np.nanmedian(block, axis=0)
+    elif has_values.any():
+        values[has_values] = np.nanmedian(block[:, has_values], axis=0)
+    return np.round(values, 4)
+
+
+def fill_float_block(data, columns, statistic):
+    """Fills the nulls of float columns sharing a NumPy dtype with their mean or median, in place.
+
+    The columns are read as one 2D array and its null mask is used for the
+    statistics, the fill and the positions of the filled cells, so each step
+    is a single array operation whatever the number of columns. The array is
+    a copy of the columns, written back in one assignment, so the step needs
+    memory for one copy of the block.
+
+    Args:
+        data (DataFrame): The dataset to modify.
+        columns (list): Columns of ``data`` with the same float dtype.
+        statistic (str): "mean" or "median".
+
+    Returns:
+        ChangeSet: The cells filled and the value used for each column.
+    """
+
+    block = data[columns].to_numpy()
+    if not block.flags.writeable:
+        # Under Copy-on-Write the array is a read-only view of the data
+        block = block.copy()
+    mask = np.isnan(block)
+    values = column_statistics(block, mask, statistic)
+    np.copyto(block, values.astype(block.dtype), where=mask)
+    data.loc[:, columns] = block
+    return ChangeSet(filled_cells=mask_positions(columns, mask), fill_values=dict(zip(columns, values.tolist())))
+
+
+def fill_nullable_columns(data, columns, statistic):
+    """Fills the nulls of nullable numeric columns (Int64, Float64, ...) with their mean or median, in place.
+
+    The statistics are computed like in ``fill_float_block``, on a float copy
+    of the columns. Each nullable column keeps its own values and mask, so each
+    is then filled on a copy of its array through its part of the null mask and
+    written back, which does not rely on the frame sharing its arrays. Integer
+    columns are filled with integers when the value is whole, and become
+    Float64 otherwise so the value is kept exactly.
+
+    Args:
+        data (DataFrame): The dataset to modify.
+        columns (list): Columns of ``data`` with the same nullable numeric dtype.
+        statistic (str): "mean" or "median".
+
+    Returns:
+        ChangeSet: The cells filled and the value used for each column.
+    """
+
+    block = data[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    mask = np.isnan(block)
+    values = column_statistics(block, mask, statistic)
+    integer = is_integer_dtype(data[columns[0]].dtype)
+    fill_values = {}
+    for position, col in enumerate(columns):
+        value = values[position]
+        if integer and not value.is_integer():
+            filled = data[col].array.astype("Float64")
+        else:
+            filled = data[col].array.copy()
+            if integer:
+                value = int(value)
+        filled[mask[:, position]] = value
+        data[col] = filled
+        fill_values[col] = float(value)
+    return ChangeSet(filled_cells=mask_positions(columns, mask), fill_values=fill_values)
+
+
+#==================================== NULL FILLING ================================
+
+def fill_nulls(data, option, constant=None):
+    """Applies a null-handling option to a DataFrame in place.
+
+    Means and medians are computed on ``data`` itself, so replaying an option
+    chosen on a preview sample fills the full dataset with its own statistics.
+
+    Args:
+        data (DataFrame): The dataset to modify.
+        option (str): One of "Delete rows with nulls", "Fill with mean",
+            "Fill with median" or "Fill with constant".
+        constant (float, optional): Value used by "Fill with constant".
+
+    Returns:
+        ChangeSet: The cells filled or the rows dropped.
+
+    Raises:
+        ValueError: If the option is unknown.
+    """
+
+    if option == "Delete rows with nulls":
+        dropped_rows = np.flatnonzero(data.isnull().to_numpy().any(axis=1))
+        data.dropna(inplace=True)
+        return ChangeSet(dropped_rows=dropped_rows)
+
+    if option not in ("Fill with mean", "Fill with median", "Fill with constant"):
+        raise ValueError(f"Unknown null option: '{option}'")
+
+    null_columns = data.columns[data.isna().any()]
+    if option == "Fill with constant":
+        filled_cells = null_positions(data, null_columns)
+        data.fillna(constant, inplace=True)
+        return ChangeSet(filled_cells=filled_cells, fill_values=dict.fromkeys(null_columns, constant))
+    else:
+        statistic = "mean" if option == "Fill with mean" else "median"
+        groups = {}
+        for col, dtype in data.dtypes[null_columns].items():
+            groups.setdefault(dtype, []).append(col)
+        changes = ChangeSet()
+        for dtype, columns in groups.items():
+            if not is_numeric_column(data[columns[0]]):
+                continue
+            if isinstance(dtype, np.dtype) and dtype.kind == "f":
+                group_changes = fill_float_block(data, columns, statistic)
+            else:
+                group_changes = fill_nullable_columns(data, columns, statistic)
+            changes.filled_cells.update(group_changes.filled_cells)
+            changes.fill_values.update(group_changes.fill_values)
+    return changes
+
+
+def apply_null_steps(data, steps):
+    """Replays recorded null-handling steps on a DataFrame in place.
+
+    Args:
+        data (DataFrame): The dataset to modify.
+        steps (list): ``(option, constant)`` tuples, as recorded in ``Preprocess.applied_steps``.
+
+    Returns:
+        dict: Column name -> value its nulls were filled with, see ``Preprocess.fill_values``.
+    """
+
+    fill_values = {}
+    for option, constant in steps:
+        for col, value in fill_nulls(data, option, constant).fill_values.items():
+            fill_values.setdefault(col, value)
+    return fill_values
+
+
+#===================================== IMPUTER ====================================
+
+class Imputer():
+    """The null handling of a model's inputs, fitted once and replayed on new data.
+
+    It holds only plain values (the input columns and the value each is filled
+    with), so it is saved with the model and needs nothing from the session
+    that fitted it. Columns without a fill value, for example because their
+    null rows were deleted, leave those rows without a prediction.
+    """
+
+    def __init__(self, columns, fill_values=None):
+        """Initializes the imputer.
+
+        Args:
+            columns (list): The input columns, in the order the model expects them.
+            fill_values (dict, optional): Column name -> value put in its nulls. Defaults to none.
+        """
+
+        self.columns = list(columns)
+        self.fill_values = dict(fill_values or {})
+
+    @classmethod
+    def fit(cls, data, steps, columns, fill_values=None):
+        """Builds the imputer that repeats the null-handling steps applied to ``data`` on its input columns.
+
+        The first step leaves no null in a numeric column, so it decides how
+        every input is handled. Columns it filled keep the value used then; the
+        mean or median of the others is computed from ``data``. After "Delete
+        rows with nulls", rows with nulls are left without a prediction.
+
+        Args:
+            data (DataFrame): The preprocessed data the model is fitted on.
+            steps (list): ``(option, constant)`` tuples, as recorded in ``Preprocess.applied_steps``.
+            columns (list): The input columns of the model.
+            fill_values (dict, optional): Column name -> value the steps filled it with,
+                see ``Preprocess.fill_values``. Defaults to none.
+
+        Returns:
+            Imputer: The fitted imputer.
+        """
+
+        option, constant = steps[0] if steps else (None, None)
+        if option == "Fill with constant":
+            return cls(columns, dict.fromkeys(columns, constant))
+        if option not in ("Fill with mean", "Fill with median"):
+            return cls(columns)
+
+        fill_values = fill_values or {}
+        imputed = {col: fill_values[col] for col in columns if col in fill_values}
+        missing = [col for col in columns if col not in imputed and is_numeric_column(data[col])]
+        if missing:
+            block = data[missing].to_numpy(dtype=np.float64, na_value=np.nan)
+            statistic = "mean" if option == "Fill with mean" else "median"
+            imputed.update(zip(missing, column_statistics(block, np.isnan(block), statistic).tolist()))
+        return cls(columns, imputed)
+
+    def transform(self, data):
+        """Returns the input columns of ``data`` as a float array with their nulls filled.
+
+        Args:
+            data (DataFrame): Data with at least the input columns.
+
+        Returns:
+            ndarray: A row per row of ``data`` and a column per input column. Nulls of
+            columns without a fill value are left as NaN.
+
+        Raises:
+            KeyError: If an input column is missing from ``data``.
+            ValueError: If an input column is not numeric.
+        """
+
+        X = data[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.array([self.fill_values.get(col, np.nan) for col in self.columns], dtype=np.float64)
+        np.copyto(X, values, where=np.isnan(X))
+        return X
 
 
 #==================================== PREPROCESS ==================================
@@ -6,7 +318,8 @@ from tkinter import messagebox
 class Preprocess():
     """Handles data preprocessing tasks, including null value handling and user interaction."""
     
-    def __init__(self, data_table_df, null_option_menu, display_data, constant_entry, select_columns_button, select_output_button, preprocess_button, root):
+    def __init__(self, data_table_df, null_option_menu, display_data, constant_entry, select_columns_button, select_output_button, preprocess_button, root,
+                 run_task=None, display_changes=None, replace_data=None, undo_button=None, redo_button=None):
         """Initializes the preprocessing class with dataset and UI elements.
 
         Args:
@@ -18,18 +331,36 @@ class Preprocess():
             select_output_button (Widget): Button to trigger output selection.
             preprocess_button (Widget): Button to start preprocessing.
             root (Tk): Root Tkinter window.
+            run_task (callable, optional): Runs ``run_task(work, on_done, on_error)`` for the work on the
+                dataset, for example on a background thread. Defaults to running it straight away.
+            display_changes (function, optional): Called with the dataset and the ``ChangeSet`` of an
+                applied option to patch the displayed data. Defaults to calling ``display_data``.
+            replace_data (function, optional): Called with the new DataFrame when undoing or redoing a row
+                deletion replaces the dataset. Defaults to calling ``display_data``.
+            undo_button (Widget, optional): Button that undoes the last step.
+            redo_button (Widget, optional): Button that redoes the last undone step.
         """
 
         self.data_table_df = data_table_df
         self.null_option_menu = null_option_menu
         self.display_data = display_data
+        self.display_changes = display_changes or (lambda data, changes: display_data(data))
+        self.last_changes = None
         self.constant_entry = constant_entry
         self.select_columns_button = select_columns_button
         self.select_output_button = select_output_button
         self.preprocess_button = preprocess_button
         self.root = root
+        self.applied_steps = []
+        self.fill_values = {}
+        self.history = History(fill_nulls)
+        self.replace_data = replace_data or display_data
+        self.undo_button = undo_button
+        self.redo_button = redo_button
+        self.run_task = run_task or run_inline
         self.root.bind("<Escape>", self.hide_constant_entry)
         self.root.bind("<Return>", self.enter_key_handler)
+        self.update_history_buttons()
 
     #--------------------------------- CHECKING FOR NULLS ----------------------------
 
@@ -37,26 +368,169 @@ class Preprocess():
         """Checks for null values in the dataset and updates UI with options for handling them."""
 
         if self.data_table_df is not None:
-            null_counts = self.data_table_df.isnull().sum()
-            self.null_counts_dict = null_counts[null_counts > 0].to_dict()
-            if self.null_counts_dict:
-                null_columns_info = '\n'.join([f"{col}: {count}" for col, count in self.null_counts_dict.items()])
-                messagebox.showinfo("Null Values Detected",f"Null values found:\n{null_columns_info}")
-                self.null_option_menu.configure(state="normal")
-            else:
-                messagebox.showinfo("No Null Values", "No null values detected in the dataset.")
-                self.null_option_menu.configure(state="disabled")
-                self.constant_entry.configure(state="disabled")
-                self.constant_entry.delete(0, 'end')
-                self.constant_entry.pack_forget()
-                self.select_columns_button.configure(state="normal")
-                self.select_output_button.configure(state="normal")
-            self.preprocess_button.configure(state="disabled")
+            data_table_df = self.data_table_df
+            self.run_task(lambda: data_table_df.isnull().sum(), self.show_null_counts, self.show_error)
         else:
             messagebox.showwarning("No Data Loaded", "Please load data first.")
 
+    def show_null_counts(self, null_counts):
+        """Shows the null values found in each column and enables the matching options.
+
+        Args:
+            null_counts (Series): Number of null values per column.
+        """
+
+        self.null_counts_dict = null_counts[null_counts > 0].to_dict()
+        if self.null_counts_dict:
+            null_columns_info = '\n'.join([f"{col}: {count}" for col, count in self.null_counts_dict.items()])
+            messagebox.showinfo("Null Values Detected",f"Null values found:\n{null_columns_info}")
+            self.null_option_menu.configure(state="normal")
+        else:
+            messagebox.showinfo("No Null Values", "No null values detected in the dataset.")
+            self.null_option_menu.configure(state="disabled")
+            self.constant_entry.configure(state="disabled")
+            self.constant_entry.delete(0, 'end')
+            self.constant_entry.pack_forget()
+            self.select_columns_button.configure(state="normal")
+            self.select_output_button.configure(state="normal")
+        self.preprocess_button.configure(state="disabled")
+
     #------------------------------- NULL OPTIONS -------------------------------
 
+    def apply_step(self, option, constant=None, on_done=None):
+        """Applies a null-handling option to the dataset and records it so it can be replayed.
+
+        Args:
+            option (str): The selected option for handling null values.
+            constant (float, optional): Value used by "Fill with constant".
+            on_done (callable, optional): Called without arguments once the option has been applied.
+        """
+
+        data_table_df = self.data_table_df
+
+        def finish(changes):
+            self.applied_steps.append((option, constant))
+            for col, value in changes.fill_values.items():
+                self.fill_values.setdefault(col, value)
+            self.last_changes = changes
+            self.update_history_buttons()
+            if on_done is not None:
+                on_done()
+
+        self.run_task(lambda: self.history.apply(data_table_df, option, constant), finish, self.show_error)
+
+    def finish_null_handling(self, title, message):
+        """Reports a handled option, shows the updated data and moves on to column selection.
+
+        Args:
+            title (str): Title of the confirmation message.
+            message (str): Text of the confirmation message.
+        """
+
+        messagebox.showinfo(title, message)
+        self.display_changes(self.data_table_df, self.last_changes)
+        self.null_option_menu.configure(state="disabled")
+        self.constant_entry.configure(state="disabled")
+        self.constant_entry.delete(0, 'end')
+        self.constant_entry.pack_forget()
+        self.select_columns_button.configure(state="normal")
+        self.select_output_button.configure(state="normal")
+
+    #-------------------------------- UNDO / REDO ---------------------------------
+
+    def undo(self, event=None):
+        """Reverts the last null-handling step, writing back only what it changed.
+
+        Args:
+            event (Event, optional): Trigger event (default is None).
+        """
+
+        if not self.history.can_undo():
+            return
+        data_table_df = self.data_table_df
+
+        def finish(result):
+            data, delta = result
+            self.applied_steps.pop()
+            for col in delta.changes.fill_values:
+                self.fill_values.pop(col, None)
+            self.show_history_step(data, delta)
+
+        self.run_task(lambda: self.history.undo(data_table_df), finish, self.show_error)
+
+    def redo(self, event=None):
+        """Applies the last undone null-handling step again.
+
+        Args:
+            event (Event, optional): Trigger event (default is None).
+        """
+
+        if not self.history.can_redo():
+            return
+        data_table_df = self.data_table_df
+
+        def finish(result):
+            data, delta = result
+            self.applied_steps.append(delta.step)
+            for col, value in delta.changes.fill_values.items():
+                self.fill_values.setdefault(col, value)
+            self.show_history_step(data, delta)
+
+        self.run_task(lambda: self.history.redo(data_table_df), finish, self.show_error)
+
+    def show_history_step(self, data, delta):
+        """Shows the dataset after an undo or a redo and lets the user pick an option again.
+
+        Args:
+            data (DataFrame): The dataset returned by the history.
+            delta (Delta): The step undone or redone.
+        """
+
+        if data is self.data_table_df:
+            self.display_changes(data, delta.changes)
+        else:
+            self.data_table_df = data
+            self.replace_data(data)
+        self.last_changes = delta.changes
+        self.null_option_menu.configure(state="normal")
+        self.update_history_buttons()
+
+    def update_history_buttons(self):
+        """Enables the undo and redo buttons when there is a step to undo or redo."""
+
+        if self.undo_button is not None:
+            self.undo_button.configure(state="normal" if self.history.can_undo() else "disabled")
+        if self.redo_button is not None:
+            self.redo_button.configure(state="normal" if self.history.can_redo() else "disabled")
+
+    def replace_dataset(self, data, fill_values=None):
+        """Continues the preprocessing on another DataFrame, such as the full dataset a preview was sampled from.
+
+        The applied steps are kept, since they have been replayed on ``data``, but
+        the undo history, which refers to the rows of the old DataFrame, is cleared.
+
+        Args:
+            data (DataFrame): The new dataset.
+            fill_values (dict, optional): The values the steps filled ``data`` with. Defaults to keeping
+                the current ones.
+        """
+
+        self.data_table_df = data
+        if fill_values is not None:
+            self.fill_values = dict(fill_values)
+        self.history = History(fill_nulls)
+        self.last_changes = None
+        self.update_history_buttons()
+
+    def show_error(self, error):
+        """Shows an error raised while working on the dataset.
+
+        Args:
+            error (Exception): The error raised by the task.
+        """
+
+        messagebox.showerror("Preprocessing Error", f"An error occurred: {error}")
+
     def handle_null_option(self, option):
         """Handles user-selected null value processing options.
 
@@ -68,53 +542,22 @@ class Preprocess():
         if option == "Delete rows with nulls":
             confirm = messagebox.askyesno("Caution", "Are you sure to proceed?")
             if confirm:
-                self.data_table_df.dropna(inplace=True)
-                messagebox.showinfo("Rows Deleted", "Rows with null values have been deleted.")
-                self.display_data(self.data_table_df)
-                self.null_option_menu.configure(state="disabled")
-                self.constant_entry.configure(state="disabled")
-                self.constant_entry.delete(0, 'end')
-                self.constant_entry.pack_forget()
-                self.select_columns_button.configure(state="normal")
-                self.select_output_button.configure(state="normal")
+                self.apply_step(option, on_done=lambda: self.finish_null_handling(
+                    "Rows Deleted", "Rows with null values have been deleted."))
 
         #Fill with mean
         elif option == "Fill with mean":
             confirm = messagebox.askyesno("Caution", "Are you sure to proceed?")
             if confirm:
-                for col in self.null_counts_dict.keys():
-                    if self.data_table_df[col].dtype in ['float64', 'int64']:
-                        mean_value = round(self.data_table_df[col].mean(), 4)
-                        if str(mean_value) == "nan":
-                            mean_value = 0
-                        self.data_table_df[col] = self.data_table_df[col].fillna(mean_value)
-                messagebox.showinfo("Filled with Mean", "Null values have been filled with the mean of their respective columns.")
-                self.display_data(self.data_table_df)
-                self.null_option_menu.configure(state="disabled")
-                self.constant_entry.configure(state="disabled")
-                self.constant_entry.delete(0, 'end')
-                self.constant_entry.pack_forget()
-                self.select_columns_button.configure(state="normal")
-                self.select_output_button.configure(state="normal")
+                self.apply_step(option, on_done=lambda: self.finish_null_handling(
+                    "Filled with Mean", "Null values have been filled with the mean of their respective columns."))
 
         #Fill with median
         elif option == "Fill with median":
             confirm = messagebox.askyesno("Caution", "Are you sure to proceed?")
             if confirm:
-                for col in self.null_counts_dict.keys():
-                    if self.data_table_df[col].dtype in ['float64', 'int64']:
-                        median_value = round(self.data_table_df[col].median(), 4)
-                        if str(median_value) == "nan":
-                            mean_value = 0
-                        self.data_table_df[col] = self.data_table_df[col].fillna(median_value)
-                messagebox.showinfo("Filled with Median", "Null values have been filled with the median of their respective columns.")
-                self.display_data(self.data_table_df)
-                self.null_option_menu.configure(state="disabled")
-                self.constant_entry.configure(state="disabled")
-                self.constant_entry.delete(0, 'end')
-                self.constant_entry.pack_forget()
-                self.select_columns_button.configure(state="normal")
-                self.select_output_button.configure(state="normal")
+                self.apply_step(option, on_done=lambda: self.finish_null_handling(
+                    "Filled with Median", "Null values have been filled with the median of their respective columns."))
 
         #Fill with constant
         elif option == "Fill with constant":
@@ -156,14 +599,8 @@ class Preprocess():
         if confirm:
             try:
                 constant_value = float(self.constant_entry.get())
-                self.data_table_df.fillna(constant_value, inplace=True)
-                messagebox.showinfo("Filled with Constant", "Null values have been filled with the specified constant.")
-                self.display_data(self.data_table_df)
-                self.constant_entry.configure(state="disabled")
-                self.constant_entry.delete(0, 'end')
-                self.constant_entry.pack_forget()
-                self.null_option_menu.configure(state="disabled")
-                self.select_columns_button.configure(state="normal")
-                self.select_output_button.configure(state="normal")
             except ValueError:
                 messagebox.showwarning("Invalid Input", "Please enter a valid number for the constant.")
+                return
+            self.apply_step("Fill with constant", constant_value, on_done=lambda: self.finish_null_handling(
+                "Filled with Constant", "Null values have been filled with the specified constant."))
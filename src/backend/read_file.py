@@ -1,132 +1,1084 @@
+import glob
+import json
+import multiprocessing
+import os
+import re
+import struct
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
 import pandas as pd
 import sqlite3
-from tkinter import messagebox
+from contextlib import closing, contextmanager
+from pathlib import Path
+from backend.dtypes import is_numeric_column, optimize_dtypes
+from backend.errors import (CorruptFileError, DataImportError, MissingDependencyError, MissingFileError,
+                            QueryError, ReadCancelled, SchemaError, UnsupportedFormatError)
+
+
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".zst": "zstd", ".xz": "xz", ".zip": "zip"}
+FILTER_OPERATORS = ("==", "!=", "<=", ">=", "<", ">")
+FILTER_PATTERN = re.compile(r"^\s*(.+?)\s*(==|!=|<=|>=|<|>|=)\s*(.+?)\s*$")
+
+
+def split_extension(file):
+    """Returns the data extension and compression of a file name.
+
+    Dots in the rest of the name are ignored, so ``data.v2.csv.gz`` gives
+    ``("csv", "gzip")`` and ``report.xlsx`` gives ``("xlsx", None)``.
+
+    Args:
+        file (str): Path to the file.
+
+    Returns:
+        tuple: The lower-case extension without its dot (empty if there is none)
+        and the pandas compression name (None if the file is not compressed).
+    """
+
+    stem, extension = os.path.splitext(os.path.basename(file).lower())
+    compression = COMPRESSION_EXTENSIONS.get(extension)
+    if compression:
+        stem, extension = os.path.splitext(stem)
+    return extension.lstrip("."), compression
+
+
+def expand_paths(paths):
+    """Expands glob patterns such as ``exports/part-*.csv.gz`` into a sorted list of files.
+
+    Args:
+        paths (str or list): A path, a glob pattern or a list of them.
+
+    Returns:
+        list: The matching file paths, in order and without duplicates.
+
+    Raises:
+        MissingFileError: If a pattern or path matches no file.
+    """
+
+    if isinstance(paths, str):
+        paths = [paths]
+    expanded = []
+    for path in paths:
+        matches = sorted(glob.glob(path)) if glob.has_magic(path) else [path]
+        if not matches or not all(os.path.exists(match) for match in matches):
+            raise MissingFileError(f"No file was found for '{path}'.")
+        expanded.extend(match for match in matches if match not in expanded)
+    return expanded
+
+
+def excel_engine():
+    """Returns the fastest installed engine for reading Excel files.
+
+    The Rust-based python-calamine reader is used when it is installed; otherwise
+    pandas picks its default engine (openpyxl for .xlsx, xlrd for .xls).
+
+    Returns:
+        str: ``"calamine"``, or None for the pandas default.
+    """
+
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+    return "calamine"
+
+
+def check_schema(columns_by_file):
+    """Checks that every file has the same columns, in the same order and with compatible dtypes.
+
+    Numeric dtypes of different widths are compatible, and so is any dtype with an
+    all-null column (which pandas reads as float64).
+
+    Args:
+        columns_by_file (list): ``(path, {column: Series})`` pairs, one per file.
+
+    Raises:
+        SchemaError: If a file does not match the schema of the first one.
+    """
+
+    first_path, first_columns = columns_by_file[0]
+    for path, columns in columns_by_file[1:]:
+        if list(columns) != list(first_columns):
+            raise SchemaError(
+                f"The columns of '{os.path.basename(path)}' ({', '.join(map(str, columns))}) do not match "
+                f"those of '{os.path.basename(first_path)}' ({', '.join(map(str, first_columns))}).")
+        for col, series in columns.items():
+            first_series = first_columns[col]
+            if series.dtype == first_series.dtype or series.isnull().all() or first_series.isnull().all():
+                continue
+            if is_numeric_column(series) and is_numeric_column(first_series):
+                continue
+            raise SchemaError(
+                f"Column '{col}' is {series.dtype} in '{os.path.basename(path)}' but "
+                f"{first_series.dtype} in '{os.path.basename(first_path)}'.")
+
+
+def quote_identifier(name):
+    """Quotes a table or column name for use in an SQLite statement."""
+
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sqlite_affinity(declared_type):
+    """Returns the affinity ("integer", "real", "text" or "numeric") of a declared SQLite column type.
+
+    BLOB columns are treated as text, since both are kept as Python objects.
+    """
+
+    declared_type = (declared_type or "").upper()
+    if "INT" in declared_type:
+        return "integer"
+    if any(name in declared_type for name in ("CHAR", "CLOB", "TEXT", "BLOB")):
+        return "text"
+    if any(name in declared_type for name in ("REAL", "FLOA", "DOUB")):
+        return "real"
+    return "numeric"
+
+
+def values_to_array(values, affinity):
+    """Converts one column of fetched SQLite values into a typed NumPy array.
+
+    Whole numbers become int64 (float64 if the batch contains NULLs or
+    fractions), real columns float64 with NaN for NULLs, and text columns
+    object arrays. Values that are not numeric fall back to an object array.
+
+    Args:
+        values (tuple): The column values of one fetched batch.
+        affinity (str): Affinity returned by ``sqlite_affinity``.
+
+    Returns:
+        numpy.ndarray: The column values.
+    """
+
+    if affinity == "text":
+        return np.array(values, dtype=object)
+    if affinity != "real":
+        array = np.array(values)
+        if array.dtype.kind in "if":
+            return array
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array(values, dtype=object)
+
+
+def memmap_npz_member(file, info):
+    """Memory-maps an array stored uncompressed inside an ``.npz`` archive.
+
+    ``numpy.load`` ignores ``mmap_mode`` for ``.npz`` files, but members written
+    by ``numpy.savez`` are stored as plain ``.npy`` bytes, so they can be mapped
+    straight from the archive once the offset of their data is known.
+
+    Args:
+        file (str): Path to the ``.npz`` archive.
+        info (zipfile.ZipInfo): The archive member to map.
+
+    Returns:
+        numpy.memmap: A copy-on-write view of the member, or None if it is
+        compressed or holds Python objects.
+    """
+
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    with open(file, "rb") as handle:
+        # The local file header is 30 bytes followed by the member name and an extra field
+        handle.seek(info.header_offset)
+        local_header = handle.read(30)
+        name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+        handle.seek(info.header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(handle)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(handle)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(handle)
+        offset = handle.tell()
+
+    if dtype.hasobject:
+        return None
+    return np.memmap(file, dtype=dtype, mode="c", shape=shape,
+                     order="F" if fortran_order else "C", offset=offset)
+
+
+def parse_filters(text):
+    """Parses a simple row filter such as ``price > 100 and city == 'Madrid'``.
+
+    Conditions are joined with ``and``. Values are read as numbers when possible,
+    otherwise as text (surrounding quotes are removed).
+
+    Args:
+        text (str): The filter typed by the user.
+
+    Returns:
+        list: ``(column, operator, value)`` tuples, or None if the text is empty.
+
+    Raises:
+        QueryError: If a condition cannot be parsed.
+    """
+
+    if not text or not text.strip():
+        return None
+
+    filters = []
+    for condition in re.split(r"\s+and\s+", text.strip(), flags=re.IGNORECASE):
+        match = FILTER_PATTERN.match(condition)
+        if not match:
+            raise QueryError(f"Invalid filter condition: '{condition}'")
+        column, operator, value = match.groups()
+        if operator == "=":
+            operator = "=="
+        try:
+            value = float(value)
+            if value.is_integer():
+                value = int(value)
+        except ValueError:
+            value = value.strip("'\"")
+        filters.append((column, operator, value))
+    return filters
 
 
 #=================================== DATAIMPORT ==================================
 
 class DataImport():
-    """Handles the import of various file types (CSV, Excel, SQLite) and converts them into a pandas DataFrame."""
+    """Handles the import of various file types and converts them into a pandas DataFrame.
+
+    CSV (optionally compressed), Excel, SQLite, Parquet, Feather/Arrow and NumPy
+    files are read by ``load``. Glob patterns and lists of shards are expanded and
+    read in parallel by ``read_files``, which uses one ``DataImport`` per file.
 
-    def __init__(self, file):
+    The reader has no user interface: it returns data or raises a ``DataImportError``
+    subclass (or ``ReadCancelled``), so it can run in worker threads, worker
+    processes and batch jobs. The GUI decides how errors are shown.
+    """
+
+    def __init__(self, file, chunksize=100_000, progress_callback=None, cancel_event=None, columns=None, filters=None,
+                 table=None, where=None, limit=None, arraysize=10_000, cache=None,
+                 optimize_memory=False, sample_rows=None, seed=None, sheets=None, excel_engine=None):
         """Initializes the DataImport class with the specified file path.
 
         Args:
             file (str): Path to the file to be imported.
+            chunksize (int, optional): Number of rows parsed per chunk when reading CSV files.
+            progress_callback (callable, optional): Called as ``progress_callback(rows_read, bytes_read, total_bytes)``
+                after every chunk. It runs on the reading thread.
+            cancel_event (threading.Event, optional): When set, the current read stops with ``ReadCancelled``.
+            columns (list, optional): Columns to load from columnar files, SQLite tables and Excel sheets.
+                Loads every column when None.
+            filters (list, optional): ``(column, operator, value)`` row filters applied by columnar and
+                SQLite readers while scanning the file (see ``parse_filters``).
+            table (str, optional): SQLite table or view to read. Defaults to the first table in the database.
+            where (str, optional): Extra SQL condition evaluated by SQLite.
+            limit (int, optional): Maximum number of rows read from SQLite, or from each Excel sheet.
+            arraysize (int, optional): Number of rows fetched from SQLite per batch.
+            cache (DatasetCache, optional): Cache of parsed CSV and Excel files.
+            optimize_memory (bool, optional): Downcast the loaded columns to the smallest safe dtypes.
+            sample_rows (int, optional): Load a uniform random sample of at most this many rows instead
+                of the whole file (see ``load``). Loads every row when None.
+            seed (int, optional): Seed of the random sample, for reproducible previews.
+            sheets (str, int or list, optional): Excel sheet name or index to read, or a list of them to
+                read in parallel and concatenate. Defaults to the first sheet.
+            excel_engine (str, optional): pandas engine for Excel files. Defaults to ``excel_engine()``.
         """
 
         self._file = file
         self._data = None
+        self._chunksize = chunksize
+        self._progress_callback = progress_callback
+        self._cancel_event = cancel_event
+        self._columns = columns
+        self._filters = filters
+        self._table = table
+        self._where = where
+        self._limit = limit
+        self._arraysize = arraysize
+        self._cache = cache
+        self._optimize_memory = optimize_memory
+        self._sample_rows = sample_rows
+        self._seed = seed
+        self._sheets = sheets
+        self._excel_engine = excel_engine
+        self.memory_report = None
 
-    #--------------------------- READ BY EXTENSION TYPE -------------------------
+    #------------------------------- CHUNKED READING -----------------------------
+
+    def _check_cancelled(self):
+        """Raises ReadCancelled if the cancel event has been set."""
+
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise ReadCancelled("The file read was cancelled.")
+
+    def _report_progress(self, rows_read, bytes_read, total_bytes):
+        """Forwards read progress to the progress callback, if any."""
+
+        if self._progress_callback is not None:
+            self._progress_callback(rows_read, bytes_read, total_bytes)
 
-    def read_csv(self):
-        """Reads a CSV file and loads its content into a pandas DataFrame.
+    @staticmethod
+    def _assemble_columns(columns, parts):
+        """Builds a DataFrame from per-column lists of chunk Series.
+
+        Each column is concatenated on its own and its chunk parts are released
+        straight away, so at peak only one column is held twice.
+
+        Args:
+            columns (list): Column names in their original order.
+            parts (dict): Maps each column name to the list of its chunk Series.
+
+        Returns:
+            pandas.DataFrame: The assembled data.
+        """
+
+        data = {}
+        for col in columns:
+            data[col] = pd.concat(parts.pop(col), ignore_index=True)
+        return pd.DataFrame(data, columns=columns, copy=False)
+
+    def _csv_chunks(self):
+        """Yields the chunks of the (optionally compressed) CSV file.
+
+        Progress is reported after every chunk and the cancel event is checked
+        before each one is handed out.
+
+        Raises:
+            ReadCancelled: If the cancel event is set while reading.
+        """
+
+        total_bytes = os.path.getsize(self._file)
+        compression = split_extension(self._file)[1]
+        rows_read = 0
+
+        # Bytes are counted on the file itself, so progress also works for compressed files
+        with open(self._file, "rb") as handle:
+            with pd.read_csv(handle, chunksize=self._chunksize, compression=compression) as reader:
+                for chunk in reader:
+                    self._check_cancelled()
+                    yield chunk
+                    rows_read += len(chunk)
+                    self._report_progress(rows_read, handle.tell(), total_bytes)
+
+    def iter_csv_chunks(self):
+        """Yields the chunks of a CSV file one at a time, for processing files larger than memory.
+
+        Only one chunk of ``chunksize`` rows is held at a time. Progress is
+        reported and the cancel event checked as in ``load_csv``.
 
         Raises:
+            UnsupportedFormatError: If the file is not a CSV file.
+            MissingFileError: If the file is not found at the specified path.
+            CorruptFileError: If the file cannot be parsed.
+            ReadCancelled: If the cancel event is set while reading.
+        """
+
+        if split_extension(self._file)[0] != "csv":
+            raise UnsupportedFormatError("Only CSV files can be processed in chunks.")
+        with self._translate_errors():
+            yield from self._csv_chunks()
+
+    def load_csv(self):
+        """Reads a CSV file, optionally compressed, chunk by chunk and returns it as a pandas DataFrame.
+
+        Progress is reported after every chunk and the cancel event is checked
+        between chunks, so this method is safe to run on a worker thread.
+
+        Returns:
+            pandas.DataFrame: Data read from the file.
+
+        Raises:
+            ReadCancelled: If the cancel event is set while reading.
             ParserError: If the file is corrupt.
             FileNotFoundError: If the file is not found at the specified path.
         """
 
-        try:
-            self._data = pd.read_csv(self._file)
-        except pd.errors.ParserError:
-            messagebox.showerror("Error", "The CSV file is corrupt.")
-        except FileNotFoundError:
-            messagebox.showerror("Error", "The file was not found.")
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+        columns = None
+        parts = {}
+        for chunk in self._csv_chunks():
+            if columns is None:
+                columns = list(chunk.columns)
+                parts = {col: [] for col in columns}
+            # Copy each column out of the chunk so the chunk's own blocks can be freed
+            for col in columns:
+                parts[col].append(chunk[col].copy())
+
+        if columns is None:
+            return pd.DataFrame()
+        return self._assemble_columns(columns, parts)
+
+    def sample_csv(self):
+        """Reads a uniform random sample of ``sample_rows`` rows from a CSV file in one pass.
 
-    def read_excel(self):
-        """Reads an Excel file and loads its content into a pandas DataFrame.
+        Every row gets a random key and the rows with the smallest keys are kept
+        (bottom-k reservoir sampling), so memory stays bounded by the sample plus
+        one chunk however large the file is. The sample keeps the file order.
+
+        Returns:
+            pandas.DataFrame: The sampled rows, or every row if the file is smaller than the sample.
 
         Raises:
-            ValueError: If there is an error in the data.
+            ReadCancelled: If the cancel event is set while reading.
+            ParserError: If the file is corrupt.
             FileNotFoundError: If the file is not found at the specified path.
         """
 
-        try:
-            self._data = pd.read_excel(self._file)
-        except ValueError:
-            messagebox.showerror("Error", "The Excel file is corrupt.")
-        except FileNotFoundError:
-            messagebox.showerror("Error", "The file was not found.")
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+        rng = np.random.default_rng(self._seed)
+        sample = None
+        keys = positions = None
+        rows_read = 0
+        for chunk in self._csv_chunks():
+            chunk_keys = rng.random(len(chunk))
+            chunk_positions = np.arange(rows_read, rows_read + len(chunk))
+            rows_read += len(chunk)
+            if sample is None:
+                sample, keys, positions = chunk, chunk_keys, chunk_positions
+            else:
+                sample = pd.concat([sample, chunk], ignore_index=True)
+                keys = np.concatenate([keys, chunk_keys])
+                positions = np.concatenate([positions, chunk_positions])
+            if len(sample) > self._sample_rows:
+                keep = np.argpartition(keys, self._sample_rows)[:self._sample_rows]
+                sample = sample.iloc[keep].reset_index(drop=True)
+                keys, positions = keys[keep], positions[keep]
+
+        if sample is None:
+            return pd.DataFrame()
+        return sample.iloc[np.argsort(positions)].reset_index(drop=True)
+
+    def _load_csv_or_sample(self):
+        """Returns the sampled rows when sampling is enabled, otherwise the (cached) whole file."""
+
+        if self._sample_rows:
+            return self.sample_csv()
+        return self.load_with_cache(self.load_csv)
+
+    #------------------------------ MEMORY OPTIMIZATION ---------------------------
+
+    def optimize_memory(self, data):
+        """Downcasts the loaded data when memory optimization is enabled.
+
+        The per-column before/after report is kept in ``self.memory_report``.
+
+        Args:
+            data (pandas.DataFrame): The loaded data.
+
+        Returns:
+            pandas.DataFrame: The optimized data, or ``data`` unchanged if optimization is disabled.
+        """
+
+        if not self._optimize_memory or data is None:
+            return data
+        data, self.memory_report = optimize_dtypes(data)
+        return data
+
+    #----------------------------------- CACHE -----------------------------------
+
+    def _cache_options(self):
+        """Returns the reader options that change the parsed result, used as part of the cache key."""
+
+        return {
+            "columns": self._columns,
+            "filters": self._filters,
+            "table": self._table,
+            "where": self._where,
+            "limit": self._limit,
+            "sample_rows": self._sample_rows,
+            "sheets": self._sheets,
+        }
+
+    def load_with_cache(self, loader):
+        """Returns the cached dataset for this file, or runs ``loader`` and caches its result.
+
+        Args:
+            loader (callable): Loading method to run on a cache miss, such as ``self.load_csv``.
+
+        Returns:
+            pandas.DataFrame: Data read from the cache or from the file.
+        """
+
+        if self._cache is None:
+            return loader()
+
+        options = self._cache_options()
+        data = self._cache.load(self._file, options)
+        if data is None:
+            data = loader()
+            self._cache.store(self._file, data, options)
+        else:
+            self._report_progress(len(data), 0, 0)
+        return data
+
+    #--------------------------- READ BY EXTENSION TYPE -------------------------
+
+    def _selected_sheets(self):
+        """Returns the list of Excel sheets to read."""
+
+        if self._sheets is None:
+            return [0]
+        if isinstance(self._sheets, (list, tuple)):
+            return list(self._sheets)
+        return [self._sheets]
+
+    def load_excel(self):
+        """Reads one or more sheets of an Excel file and returns them as a pandas DataFrame.
+
+        Only the selected ``columns`` are kept and at most ``limit`` rows are
+        parsed from each sheet. When sampling is enabled the first ``sample_rows``
+        rows are used, since a sheet has to be parsed in order anyway. Several
+        sheets are parsed in parallel worker processes and concatenated in the
+        order given; they must share the same columns.
 
-    def read_sql(self):
-        """Reads data from an SQLite database and loads its first table into a pandas DataFrame.
+        Returns:
+            pandas.DataFrame: Data read from the sheets.
 
         Raises:
-            Exception: If no tables are found in the database.
+            SchemaError: If a sheet does not exist or the sheets do not share the same schema.
+            ReadCancelled: If the cancel event is set while reading several sheets.
+            ValueError: If the file is corrupt.
+        """
+
+        sheets = self._selected_sheets()
+        sheet_names = [sheet for sheet in sheets if isinstance(sheet, str)]
+        if sheet_names:
+            available_sheets = self.list_sheets()
+            missing_sheets = [sheet for sheet in sheet_names if sheet not in available_sheets]
+            if missing_sheets:
+                raise SchemaError(f"Sheets not found in the workbook: {', '.join(missing_sheets)}")
+
+        if len(sheets) == 1:
+            row_limits = [rows for rows in (self._limit, self._sample_rows) if rows]
+            return pd.read_excel(self._file, sheet_name=sheets[0], usecols=self._columns,
+                                 nrows=min(row_limits) if row_limits else None,
+                                 engine=self._excel_engine or excel_engine())
+
+        options = {"columns": self._columns, "limit": self._limit, "sample_rows": self._sample_rows,
+                   "excel_engine": self._excel_engine}
+        rows_read = 0
+
+        def report(index, columns):
+            nonlocal rows_read
+            rows_read += len(next(iter(columns.values()), ()))
+            self._report_progress(rows_read, 0, 0)
+
+        results = run_in_processes(
+            _read_shard, [(self._file, {**options, "sheets": sheet}) for sheet in sheets],
+            max_workers=min(len(sheets), os.cpu_count() or 1), cancel_event=self._cancel_event, on_done=report)
+        return concatenate_shards([(f"{os.path.basename(self._file)} [{sheet}]", columns)
+                                   for sheet, columns in zip(sheets, results)])
+
+    def list_sheets(self):
+        """Returns the sheet names of an Excel file without parsing its cells.
+
+        Returns:
+            list: Sheet names, in workbook order.
+        """
+
+        with self._translate_errors():
+            with pd.ExcelFile(self._file, engine=self._excel_engine or excel_engine()) as workbook:
+                return workbook.sheet_names
+
+    def _connect(self):
+        """Opens the SQLite database read-only, without creating it when the path does not exist.
+
+        The ``where`` condition is typed by the user and pasted into the query, so
+        the connection must not be able to modify the file or take a write lock.
+        """
+
+        if not os.path.exists(self._file):
+            raise MissingFileError(f"The file was not found: {self._file}")
+        return sqlite3.connect(f"{Path(self._file).resolve().as_uri()}?mode=ro", uri=True)
+
+    def list_tables(self):
+        """Returns the names of the tables and views in the SQLite database.
+
+        Returns:
+            list: Table and view names, in the order they were created.
+        """
+
+        with self._translate_errors(), closing(self._connect()) as db_connection:
+            rows = db_connection.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY rowid;").fetchall()
+        return [row[0] for row in rows]
+
+    def _sql_column_types(self, db_connection, table_name):
+        """Returns a dict mapping each column of a table or view to its declared type."""
+
+        rows = db_connection.execute(f"PRAGMA table_info({quote_identifier(table_name)});").fetchall()
+        return {row[1]: row[2] for row in rows}
+
+    def _build_sql_query(self, table_name, columns):
+        """Builds the SELECT statement and its parameters for the configured projection, filters and limit."""
+
+        query = f"SELECT {', '.join(quote_identifier(col) for col in columns)} FROM {quote_identifier(table_name)}"
+        conditions = []
+        parameters = []
+        for column, operator, value in self._filters or []:
+            if operator not in FILTER_OPERATORS:
+                raise QueryError(f"Unsupported filter operator: '{operator}'")
+            conditions.append(f"{quote_identifier(column)} {operator} ?")
+            parameters.append(value)
+        if self._where:
+            conditions.append(f"({self._where})")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if self._limit is not None:
+            query += " LIMIT ?"
+            parameters.append(int(self._limit))
+        if self._sample_rows:
+            # SQLite keeps only the current top rows while sorting, so memory stays bounded
+            query = f"SELECT * FROM ({query}) ORDER BY RANDOM() LIMIT ?"
+            parameters.append(int(self._sample_rows))
+        return query, parameters
+
+    def load_sql(self):
+        """Reads a table or view from an SQLite database into a pandas DataFrame.
+
+        Column selection, filters, the row limit and sampling are evaluated by SQLite. Rows
+        are fetched ``arraysize`` at a time and each batch is converted straight
+        into typed NumPy arrays, so no intermediate list of all rows is built.
+
+        Returns:
+            pandas.DataFrame: Data read from the database.
+
+        Raises:
+            SchemaError: If the database has no tables, or the table or a selected column does not exist.
+            QueryError: If a filter operator is not supported.
+            ReadCancelled: If the cancel event is set while reading.
             DatabaseError: If the database file is corrupt.
-            FileNotFoundError: If the database file is not found at the specified path.
+            MissingFileError: If the database file is not found at the specified path.
         """
 
-        try:
-            db_connection = sqlite3.connect(self._file)
+        with closing(self._connect()) as db_connection:
+            table_name = self._table
+            if table_name is None:
+                tables = self.list_tables()
+                if len(tables) == 0:
+                    raise SchemaError("No tables found in the database.")
+                table_name = tables[0]
+
+            column_types = self._sql_column_types(db_connection, table_name)
+            if not column_types:
+                raise SchemaError(f"Table '{table_name}' was not found in the database.")
+            columns = self._columns or list(column_types)
+            unknown_columns = [col for col in columns if col not in column_types]
+            if unknown_columns:
+                raise SchemaError(f"Unknown columns: {', '.join(unknown_columns)}")
+            affinities = [sqlite_affinity(column_types[col]) for col in columns]
+
+            query, parameters = self._build_sql_query(table_name, columns)
             cursor = db_connection.cursor()
+            cursor.arraysize = self._arraysize
+            cursor.execute(query, parameters)
+
+            parts = {col: [] for col in columns}
+            rows_read = 0
+            while True:
+                self._check_cancelled()
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for col, affinity, values in zip(columns, affinities, zip(*rows)):
+                    parts[col].append(values_to_array(values, affinity))
+                rows_read += len(rows)
+                self._report_progress(rows_read, 0, 0)
+
+        data = {}
+        for col in columns:
+            column_parts = parts.pop(col)
+            data[col] = np.concatenate(column_parts) if column_parts else np.array([], dtype=object)
+        return pd.DataFrame(data, columns=columns, copy=False)
+
+    def _sidecar_columns(self, count):
+        """Returns the column names for a NumPy matrix.
+
+        Names are read from a ``<file>.columns.json`` sidecar holding a JSON list.
+        Without a sidecar the columns are named ``column_1``, ``column_2``, ...
+
+        Args:
+            count (int): Number of columns in the matrix.
+
+        Raises:
+            SchemaError: If the sidecar does not list exactly ``count`` names.
+        """
+
+        sidecar = f"{self._file}.columns.json"
+        if not os.path.exists(sidecar):
+            return [f"column_{i}" for i in range(1, count + 1)]
+        with open(sidecar, encoding="utf-8") as handle:
+            names = [str(name) for name in json.load(handle)]
+        if len(names) != count:
+            raise SchemaError(f"The sidecar lists {len(names)} columns but the matrix has {count}.")
+        return names
+
+    def load_numpy(self):
+        """Opens a ``.npy`` or ``.npz`` file as a memory-mapped DataFrame.
+
+        A ``.npy`` file holds a 2-D matrix whose column names come from its
+        sidecar. A ``.npz`` file holds either one 1-D array per column (named
+        after the array) or a single 2-D matrix with a sidecar. Arrays are mapped
+        in copy-on-write mode and wrapped without copying, so loading does not
+        read the data and later in-place edits never touch the file.
+
+        Returns:
+            pandas.DataFrame: A DataFrame backed by the mapped arrays.
+
+        Raises:
+            SchemaError: If the arrays do not form a table.
+            FileNotFoundError: If the file is not found at the specified path.
+        """
+
+        if self._file.lower().endswith(".npy"):
+            return self._matrix_to_frame(np.load(self._file, mmap_mode="c"))
+
+        arrays = {}
+        with zipfile.ZipFile(self._file) as archive:
+            members = [info for info in archive.infolist() if info.filename.endswith(".npy")]
+        with np.load(self._file, allow_pickle=False) as npz:
+            for info in members:
+                name = info.filename[:-len(".npy")]
+                array = memmap_npz_member(self._file, info)
+                arrays[name] = array if array is not None else npz[name]
+
+        if len(arrays) == 1 and next(iter(arrays.values())).ndim == 2:
+            return self._matrix_to_frame(next(iter(arrays.values())))
+        if any(array.ndim != 1 for array in arrays.values()):
+            raise SchemaError("An .npz file must hold one 2-D matrix or one 1-D array per column.")
+        if len({len(array) for array in arrays.values()}) > 1:
+            raise SchemaError("All the arrays in the .npz file must have the same length.")
+        return pd.DataFrame(arrays, copy=False)
+
+    def _matrix_to_frame(self, matrix):
+        """Wraps a 2-D matrix in a DataFrame that shares its memory."""
+
+        if matrix.ndim != 2:
+            raise SchemaError("A .npy file must hold a 2-D matrix.")
+        return pd.DataFrame(matrix, columns=self._sidecar_columns(matrix.shape[1]), copy=False)
 
-            cursor.execute("SELECT name FROM sqlite_master WHERE type= 'table';")
-            tables = cursor.fetchall()
+    def load_columnar(self, file_format):
+        """Reads a Parquet or Arrow IPC (Feather) file through a pyarrow dataset.
 
-            if len(tables) == 0:
-                raise Exception("\nNo tables found in the database\n")
+        Only the requested columns are decoded, and the row filters are pushed
+        down into the scan so row groups that cannot match are skipped. When
+        sampling is enabled the matching rows are counted from the metadata and
+        only the randomly chosen ones are decoded.
+
+        Args:
+            file_format (str): ``"parquet"`` or ``"ipc"`` (Feather v2 and Arrow files).
+
+        Returns:
+            pandas.DataFrame: Data read from the file.
+
+        Raises:
+            MissingDependencyError: If pyarrow is not installed.
+            CorruptFileError: If the file is not a valid Parquet or Arrow file.
+            QueryError: If a filter does not match the schema of the file.
+            MissingFileError: If the file is not found at the specified path.
+        """
 
-            table_name = tables[0][0]
-            messagebox.showinfo("Info", f"Table '{table_name}' found in the database.")
+        pa, ds = self._import_pyarrow()
+        import pyarrow.parquet as pq
 
-            self._data = pd.read_sql(f"SELECT * FROM {table_name}", db_connection)
-        except sqlite3.DatabaseError:
-            messagebox.showerror("Error", "The database file is corrupt.")
-        except FileNotFoundError:
-            messagebox.showerror("Error", "The file was not found.")
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
-        finally:
-            if db_connection:
-                db_connection.close()
+        if not os.path.exists(self._file):
+            raise MissingFileError(f"The file was not found: {self._file}")
+
+        try:
+            dataset = ds.dataset(self._file, format=file_format)
+        except pa.ArrowInvalid as e:
+            raise CorruptFileError(f"The file is corrupt: {e}") from e
+
+        try:
+            row_filter = pq.filters_to_expression(self._filters) if self._filters else None
+            if self._sample_rows:
+                row_count = dataset.count_rows(filter=row_filter)
+                if row_count > self._sample_rows:
+                    rng = np.random.default_rng(self._seed)
+                    indices = np.sort(rng.choice(row_count, self._sample_rows, replace=False))
+                    return dataset.take(indices, columns=self._columns, filter=row_filter).to_pandas()
+            table = dataset.to_table(columns=self._columns, filter=row_filter)
+        except (pa.ArrowInvalid, TypeError, ValueError) as e:
+            if self._filters or self._columns:
+                raise QueryError(f"The columns or the filter do not match the file: {e}") from e
+            raise CorruptFileError(f"The file is corrupt: {e}") from e
+        return table.to_pandas()
+
+    @staticmethod
+    def _import_pyarrow():
+        """Returns the ``pyarrow`` and ``pyarrow.dataset`` modules.
+
+        Raises:
+            MissingDependencyError: If pyarrow is not installed.
+        """
+
+        try:
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+        except ImportError as e:
+            raise MissingDependencyError("pyarrow is required to read Parquet, Feather and Arrow files.") from e
+        return pa, ds
+
+    def list_columns(self):
+        """Returns the column names stored in a columnar file, SQLite table or Excel sheet without reading its data.
+
+        Returns:
+            list: Column names from the file schema.
+        """
+
+        with self._translate_errors():
+            if self.is_sqlite():
+                with closing(self._connect()) as db_connection:
+                    table_name = self._table or (self.list_tables() or [None])[0]
+                    return list(self._sql_column_types(db_connection, table_name)) if table_name else []
+            if self.is_excel():
+                header = pd.read_excel(self._file, sheet_name=self._selected_sheets()[0], nrows=0,
+                                       engine=self._excel_engine or excel_engine())
+                return list(header.columns)
+
+            _, ds = self._import_pyarrow()
+            return ds.dataset(self._file, format=self.columnar_format()).schema.names
+
+    def is_excel(self):
+        """Returns True if the file extension is one of the Excel extensions."""
+
+        return split_extension(self._file) in (("xlsx", None), ("xls", None))
+
+    def is_sqlite(self):
+        """Returns True if the file extension is one of the SQLite database extensions."""
+
+        return split_extension(self._file) in (("db", None), ("sqlite", None))
+
+    def columnar_format(self):
+        """Returns the pyarrow dataset format for the file, or None if it is not columnar."""
+
+        extension, compression = split_extension(self._file)
+        if compression:
+            return None
+        if extension in ("parquet", "pq"):
+            return "parquet"
+        if extension in ("feather", "arrow", "ipc"):
+            return "ipc"
+        return None
 
     #------------------------- DISTINGUISH EXTENSION TYPE -------------------------
 
-    def file_type(self):
-        """Determines the file type based on its extension and calls the appropriate reading method.
+    @contextmanager
+    def _translate_errors(self):
+        """Re-raises the errors of pandas, sqlite3, zipfile and the Excel engines as ``DataImportError``."""
+
+        try:
+            yield
+        except (DataImportError, ReadCancelled):
+            raise
+        except FileNotFoundError as e:
+            raise MissingFileError(f"The file was not found: {self._file}") from e
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+            raise CorruptFileError(f"The CSV file is corrupt: {e}") from e
+        except sqlite3.OperationalError as e:
+            raise QueryError(f"The query could not be run: {e}") from e
+        except sqlite3.DatabaseError as e:
+            raise CorruptFileError(f"The database file is corrupt: {e}") from e
+        except zipfile.BadZipFile as e:
+            raise CorruptFileError(f"The file is corrupt: {e}") from e
+        except ImportError as e:
+            raise MissingDependencyError(f"A package needed to read this file is not installed: {e}") from e
+        except ValueError as e:
+            if str(e).startswith("Usecols do not match columns"):
+                raise SchemaError(f"The selected columns are not in the file: {e}") from e
+            raise CorruptFileError(f"The file could not be read: {e}") from e
+
+    def load(self):
+        """Reads the file with the loader for its extension and returns its content.
+
+        Errors are raised, never shown, so this method can run in worker threads
+        and processes. Errors of the underlying libraries are re-raised as
+        ``DataImportError`` subclasses whose messages can be shown to the user.
+
+        With ``sample_rows`` set, CSV files, SQLite tables and columnar files
+        return a uniform random sample, and Excel files return their first rows.
+        NumPy files are memory-mapped and always returned whole, since mapping
+        them costs nothing.
+
+        Returns:
+            pandas.DataFrame: Data read from the file.
 
-        Supported formats:
-            - CSV
-            - Excel (XLSX, XLS)
-            - SQLite (DB)
+        Raises:
+            UnsupportedFormatError: If the file format is not supported.
+            MissingFileError: If the file is not found at the specified path.
+            CorruptFileError: If the file cannot be parsed.
+            SchemaError: If the requested table or columns do not exist.
+            QueryError: If a filter or SQL condition is invalid.
+            MissingDependencyError: If a package needed for the format is not installed.
+            ReadCancelled: If the cancel event is set while reading.
         """
 
-        partes = self._file.split('.')
-        if len(partes) < 2:
-            messagebox.showwarning("Warning", "The file format could not be determined.")
-        else:
-            extension = partes[1].lower()
+        extension, compression = split_extension(self._file)
+        if not extension:
+            raise UnsupportedFormatError("The file format could not be determined.")
+        if compression and extension != "csv":
+            raise UnsupportedFormatError("Only CSV files can be read compressed.")
+
+        with self._translate_errors():
             if extension == "csv":
-                self.read_csv()
-            elif extension == "xlsx" or extension == "xls":
-                self.read_excel()
-            elif extension == "db" or extension == "sqlite":
-                self.read_sql()
-            else:
-                messagebox.showwarning("Warning", "Unsupported file format.")
+                return self._load_csv_or_sample()
+            if extension in ("xlsx", "xls"):
+                return self.load_with_cache(self.load_excel)
+            if extension in ("db", "sqlite"):
+                return self.load_sql()
+            if self.columnar_format():
+                return self.load_columnar(self.columnar_format())
+            if extension in ("npy", "npz"):
+                return self.load_numpy()
+        raise UnsupportedFormatError(f"Unsupported file format: .{extension}")
 
     #--------------------------------- READ FILE -------------------------------
 
     def read_file(self):
-        """Reads the file and returns its content as a pandas DataFrame.
+        """Reads the file, applies memory optimization and returns its content as a pandas DataFrame.
 
         Returns:
             pandas.DataFrame: Data read from the file.
+
+        Raises:
+            DataImportError: If the file cannot be read (see ``load``).
         """
 
-        self.file_type()
-        if self._data is not None:
-            print(self._data)
-            return self._data
+        self._data = self.optimize_memory(self.load())
+        return self._data
+
+
+#================================ MULTI-FILE READING ===============================
+
+def _read_shard(path, options):
+    """Reads one file in a worker process and returns its columns as separate Series.
+
+    Returning a dict of Series means every column is pickled, and unpickled in the
+    parent, as its own array, so the parent can concatenate and free them one by one.
+    """
+
+    data = DataImport(path, **options).load()
+    return {col: data[col] for col in data.columns}
+
+
+def run_in_processes(function, jobs, max_workers=None, cancel_event=None, on_done=None):
+    """Runs ``function(*job)`` for every job in a pool of worker processes.
+
+    With a single worker the jobs run one by one in this process instead, since
+    a pool would only add the cost of starting a process and pickling results.
+
+    Args:
+        function (callable): A module-level function, so it can be sent to the workers.
+        jobs (list): Argument tuples, one per call.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        cancel_event (threading.Event, optional): When set, pending jobs are cancelled and
+            ``ReadCancelled`` is raised.
+        on_done (callable, optional): Called in this process as ``on_done(index, result)``
+            each time a job finishes.
+
+    Returns:
+        list: The results, in the order of ``jobs``.
+
+    Raises:
+        ReadCancelled: If the cancel event is set before every job has finished. It is raised
+            without waiting for the jobs already running, which finish in the background.
+    """
+
+    results = [None] * len(jobs)
+    if (max_workers or os.cpu_count() or 1) == 1:
+        for index, job in enumerate(jobs):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ReadCancelled("The file read was cancelled.")
+            results[index] = function(*job)
+            if on_done is not None:
+                on_done(index, results[index])
+        return results
+
+    # Forking a process that runs other threads (the Tk loop, the task executor) can deadlock
+    pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    pending = {pool.submit(function, *job): index for index, job in enumerate(jobs)}
+    try:
+        while pending:
+            done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if cancel_event is not None and cancel_event.is_set():
+                raise ReadCancelled("The file read was cancelled.")
+            for future in done:
+                index = pending.pop(future)
+                results[index] = future.result()
+                if on_done is not None:
+                    on_done(index, results[index])
+    except BaseException:
+        # Return at once instead of waiting for the jobs already running
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return results
+
+
+def concatenate_shards(columns_by_file):
+    """Checks that shards share one schema and concatenates them column by column.
+
+    Args:
+        columns_by_file (list): ``(name, {column: Series})`` pairs in the order to concatenate.
+            The column dicts are emptied as the columns are assembled.
+
+    Returns:
+        pandas.DataFrame: The rows of every shard.
+
+    Raises:
+        SchemaError: If the shards do not share the same schema.
+    """
+
+    check_schema(columns_by_file)
+    columns = list(columns_by_file[0][1])
+    parts = {col: [file_columns.pop(col) for _, file_columns in columns_by_file] for col in columns}
+    return DataImport._assemble_columns(columns, parts)
+
+
+def read_files(paths, max_workers=None, progress_callback=None, cancel_event=None, **options):
+    """Reads several files in parallel worker processes and concatenates them.
+
+    Compressed CSV shards are decompressed and parsed in the workers. The shards
+    must share the same schema (see ``check_schema``).
+
+    Args:
+        paths (str or list): Files or glob patterns to read.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        progress_callback (callable, optional): Called as ``progress_callback(rows_read, bytes_read, total_bytes)``
+            each time a file has been read.
+        cancel_event (threading.Event, optional): When set, pending files are cancelled and
+            ``ReadCancelled`` is raised.
+        **options: Keyword arguments for DataImport, such as ``columns`` or ``cache``.
+            ``optimize_memory`` is applied once to the concatenated data rather than to each
+            file; call ``optimize_dtypes`` instead to also get the memory report.
+
+    Returns:
+        pandas.DataFrame: The rows of every file, in the order the files were given.
+
+    Raises:
+        SchemaError: If the files do not share the same schema.
+        DataImportError: If a file cannot be read.
+        ReadCancelled: If the cancel event is set while reading.
+    """
+
+    optimize_memory = options.pop("optimize_memory", False)
+    paths = expand_paths(paths)
+    sizes = [os.path.getsize(path) for path in paths]
+    total_bytes = sum(sizes)
+    rows_read = 0
+    bytes_read = 0
+
+    def report(index, columns):
+        nonlocal rows_read, bytes_read
+        rows_read += len(next(iter(columns.values()), ()))
+        bytes_read += sizes[index]
+        if progress_callback is not None:
+            progress_callback(rows_read, bytes_read, total_bytes)
+
+    results = run_in_processes(_read_shard, [(path, options) for path in paths], max_workers=max_workers,
+                               cancel_event=cancel_event, on_done=report)
+    data = concatenate_shards(list(zip(paths, results)))
+    if optimize_memory:
+        data = optimize_dtypes(data)[0]
+    return data
 
 
 if __name__ == "__main__":
     file = input("Introduce the file's route: ").replace("\\\\", "\\")
-    DataImport(file).read_file()
+    print(DataImport(file).read_file())
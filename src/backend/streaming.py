@@ -0,0 +1,332 @@
+import os
+import numpy as np
+import pandas as pd
+from backend.dtypes import is_numeric_column
+from backend.errors import SchemaError
+from backend.read_file import DataImport
+
+
+NULL_OPTIONS = ("Delete rows with nulls", "Fill with mean", "Fill with median", "Fill with constant")
+
+# Centroids kept per column by the quantile sketch; the rank error is about 1 / compression
+DIGEST_COMPRESSION = 200
+
+
+#================================ QUANTILE SKETCH =================================
+
+def chunk_centroids(block, compression):
+    """Summarizes each column of a chunk as ``compression`` centroids of about equal weight.
+
+    Args:
+        block (ndarray): The chunk, a column per dataset column, with NaN for nulls.
+        compression (int): Number of centroids per column.
+
+    Returns:
+        tuple: ``(means, weights)`` arrays with a row per column. Empty centroids have
+        weight 0 and mean ``inf``, so they sort last.
+    """
+
+    ordered = np.sort(block, axis=0)
+    valid = np.count_nonzero(~np.isnan(block), axis=0)
+    cumulative = np.vstack([np.zeros((1, block.shape[1])), np.cumsum(ordered, axis=0)])
+    # Rank bounds of the centroids: rows [bounds[j], bounds[j + 1]) of each sorted column
+    bounds = (np.arange(compression + 1)[:, None] * valid // compression).astype(np.intp)
+    sums = np.diff(np.take_along_axis(cumulative, bounds, axis=0), axis=0)
+    weights = np.diff(bounds, axis=0).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(weights > 0, sums / weights, np.inf)
+    return means.T, weights.T
+
+
+def merge_centroids(means, weights, compression):
+    """Reduces weighted centroids to at most ``compression`` per column, all columns at once.
+
+    Centroids are sorted and grouped by their cumulative weight into
+    ``compression`` groups of equal weight, each replaced by its weighted mean.
+    This is the merging step of a t-digest with a uniform scale.
+
+    Args:
+        means (ndarray): Centroid means, a row per column. Empty centroids are ``inf``.
+        weights (ndarray): Centroid weights, same shape as ``means``.
+        compression (int): Number of centroids kept per column.
+
+    Returns:
+        tuple: The merged ``(means, weights)``, of shape ``(columns, compression)``.
+    """
+
+    order = np.argsort(means, axis=1)
+    means = np.take_along_axis(means, order, axis=1)
+    weights = np.take_along_axis(weights, order, axis=1)
+    cumulative = np.cumsum(weights, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        groups = np.floor((cumulative - weights / 2) / cumulative[:, -1:] * compression)
+        weighted = np.where(weights > 0, means * weights, 0)
+    groups = np.clip(np.nan_to_num(groups), 0, compression - 1).astype(np.intp)
+    ids = (groups + np.arange(len(means))[:, None] * compression).ravel()
+    size = len(means) * compression
+    merged_weights = np.bincount(ids, weights.ravel(), minlength=size).reshape(-1, compression)
+    sums = np.bincount(ids, weighted.ravel(), minlength=size).reshape(-1, compression)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        merged_means = np.where(merged_weights > 0, sums / merged_weights, np.inf)
+    return merged_means, merged_weights
+
+
+def centroid_quantile(means, weights, q):
+    """Returns the approximate ``q`` quantile of one column from its centroids, or NaN if it has none.
+
+    Args:
+        means (ndarray): Centroid means of the column.
+        weights (ndarray): Centroid weights of the column.
+        q (float): Quantile between 0 and 1.
+    """
+
+    present = weights > 0
+    means, weights = means[present], weights[present]
+    if not len(means):
+        return np.nan
+    order = np.argsort(means)
+    means, weights = means[order], weights[order]
+    # Each centroid stands for the rank at its middle
+    middles = np.cumsum(weights) - weights / 2
+    return float(np.interp(q * weights.sum(), middles, means))
+
+
+#============================== STREAMINGSTATISTICS ===============================
+
+class StreamingStatistics():
+    """Null counts, means, variances and approximate quantiles of a table read one chunk at a time.
+
+    Memory does not grow with the number of rows: each column keeps a count, a
+    running mean and sum of squared deviations (Welford's method, merged a whole
+    chunk at a time) and a fixed number of quantile centroids. Every update is
+    a few array operations over all the columns of the chunk.
+    """
+
+    def __init__(self, compression=DIGEST_COMPRESSION):
+        """Initializes empty statistics.
+
+        Args:
+            compression (int, optional): Quantile centroids kept per column. Defaults to ``DIGEST_COMPRESSION``.
+        """
+
+        self.compression = compression
+        self.columns = None
+        self.rows = 0
+        self._null_counts = None
+        self._numeric = None
+        self._count = None
+        self._mean = None
+        self._m2 = None
+        self._centroid_means = None
+        self._centroid_weights = None
+
+    def update(self, chunk):
+        """Adds the rows of a chunk to the statistics.
+
+        A column stays numeric as long as it is numeric in every chunk.
+
+        Args:
+            chunk (DataFrame): The next rows of the table.
+
+        Raises:
+            SchemaError: If the chunk does not have the columns of the previous ones.
+        """
+
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            width = len(self.columns)
+            self._null_counts = np.zeros(width, dtype=np.int64)
+            self._numeric = np.ones(width, dtype=bool)
+            self._count = np.zeros(width)
+            self._mean = np.zeros(width)
+            self._m2 = np.zeros(width)
+            self._centroid_means = np.full((width, self.compression), np.inf)
+            self._centroid_weights = np.zeros((width, self.compression))
+        elif list(chunk.columns) != self.columns:
+            raise SchemaError("The chunk does not have the same columns as the previous ones.")
+
+        self.rows += len(chunk)
+        self._null_counts += chunk.isna().sum().to_numpy()
+        self._numeric &= np.array([is_numeric_column(chunk[col]) for col in self.columns], dtype=bool)
+        positions = np.flatnonzero(self._numeric)
+        if not len(positions) or not len(chunk):
+            return
+
+        block = chunk.iloc[:, positions].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._update_moments(positions, block)
+        means, weights = chunk_centroids(block, self.compression)
+        self._centroid_means[positions], self._centroid_weights[positions] = merge_centroids(
+            np.hstack([self._centroid_means[positions], means]),
+            np.hstack([self._centroid_weights[positions], weights]),
+            self.compression)
+
+    def _update_moments(self, positions, block):
+        """Merges the count, mean and squared deviations of a chunk into the running ones (Chan et al.)."""
+
+        count = np.count_nonzero(~np.isnan(block), axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(block, axis=0) / count
+            m2 = np.nansum((block - mean) ** 2, axis=0)
+            total = self._count[positions] + count
+            delta = mean - self._mean[positions]
+            merged_mean = self._mean[positions] + delta * count / total
+            merged_m2 = self._m2[positions] + m2 + delta ** 2 * self._count[positions] * count / total
+        has_values = count > 0
+        self._mean[positions] = np.where(has_values, merged_mean, self._mean[positions])
+        self._m2[positions] = np.where(has_values, merged_m2, self._m2[positions])
+        self._count[positions] = total
+
+    #-------------------------------- RESULTS ---------------------------------
+
+    def null_counts(self):
+        """Returns the number of nulls of every column, like ``DataFrame.isnull().sum()``."""
+
+        return pd.Series(self._null_counts, index=self.columns, dtype=np.int64)
+
+    def numeric_columns(self):
+        """Returns the columns that were numeric in every chunk."""
+
+        return [col for col, numeric in zip(self.columns, self._numeric) if numeric]
+
+    def mean(self):
+        """Returns the mean of every numeric column, or NaN for columns without values."""
+
+        with np.errstate(invalid="ignore"):
+            mean = np.where(self._count > 0, self._mean, np.nan)
+        return pd.Series(mean[self._numeric], index=self.numeric_columns())
+
+    def var(self):
+        """Returns the sample variance of every numeric column, or NaN for columns with fewer than 2 values."""
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = np.where(self._count > 1, self._m2 / (self._count - 1), np.nan)
+        return pd.Series(variance[self._numeric], index=self.numeric_columns())
+
+    def quantile(self, q=0.5):
+        """Returns the approximate ``q`` quantile of every numeric column, or NaN for columns without values.
+
+        Args:
+            q (float, optional): Quantile between 0 and 1. Defaults to 0.5, the median.
+        """
+
+        positions = np.flatnonzero(self._numeric)
+        values = [centroid_quantile(self._centroid_means[position], self._centroid_weights[position], q)
+                  for position in positions]
+        return pd.Series(values, index=self.numeric_columns(), dtype=np.float64)
+
+    def fill_values(self, option):
+        """Returns the value ``fill_nulls`` would put in the nulls of each column for a mean or median fill.
+
+        Args:
+            option (str): "Fill with mean" or "Fill with median".
+
+        Returns:
+            dict: Numeric column with nulls -> its statistic rounded to 4 decimals, or 0 for columns without values.
+        """
+
+        values = self.mean() if option == "Fill with mean" else self.quantile(0.5)
+        values = values.fillna(0).round(4)
+        null_counts = self.null_counts()
+        return {col: value for col, value in values.items() if null_counts[col]}
+
+
+#================================= STREAMED CLEANING ==============================
+
+def compute_statistics(chunks, compression=DIGEST_COMPRESSION):
+    """Computes the statistics of a table from its chunks in one pass.
+
+    Args:
+        chunks (iterable): DataFrames with the same columns, for example ``DataImport.iter_csv_chunks()``.
+        compression (int, optional): Quantile centroids kept per column. Defaults to ``DIGEST_COMPRESSION``.
+
+    Returns:
+        StreamingStatistics: The statistics of every chunk.
+    """
+
+    statistics = StreamingStatistics(compression)
+    for chunk in chunks:
+        statistics.update(chunk)
+    return statistics
+
+
+def write_filled_csv(chunks, destination, option, fill_values=None):
+    """Writes chunks to a CSV file with their nulls handled, one chunk at a time.
+
+    The file is written next to ``destination`` and moved over it once complete,
+    so a failed or cancelled run leaves no partial output (and the destination
+    may be the file the chunks are read from).
+
+    Args:
+        chunks (iterable): DataFrames with the same columns.
+        destination (str): Path of the CSV file to write.
+        option (str): One of ``NULL_OPTIONS``.
+        fill_values (dict or scalar, optional): Value put in the nulls: a column name -> value
+            dict, or one value for every column. Ignored when deleting rows.
+
+    Returns:
+        int: The number of rows written.
+    """
+
+    partial_path = destination + ".part"
+    rows_written = 0
+    try:
+        with open(partial_path, "w", newline="", encoding="utf-8") as handle:
+            for index, chunk in enumerate(chunks):
+                if option == "Delete rows with nulls":
+                    chunk = chunk.dropna()
+                elif fill_values is not None:
+                    chunk = chunk.fillna(fill_values)
+                chunk.to_csv(handle, header=index == 0, index=False)
+                rows_written += len(chunk)
+        os.replace(partial_path, destination)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return rows_written
+
+
+def clean_csv(source, destination, option, constant=None, chunksize=100_000, compression=DIGEST_COMPRESSION,
+              progress_callback=None, cancel_event=None):
+    """Applies a null-handling option to a CSV file larger than memory, writing the result to another CSV file.
+
+    Means and medians need a first pass over the file to compute the
+    statistics; a second pass writes the filled rows. Memory is bounded by one
+    chunk plus the statistics, whatever the size of the file. Medians are
+    approximate, with a rank error of about ``1 / compression``.
+
+    Args:
+        source (str): Path of the CSV file to clean, optionally compressed.
+        destination (str): Path of the CSV file to write. It may be ``source``.
+        option (str): One of ``NULL_OPTIONS``.
+        constant (float, optional): Value used by "Fill with constant".
+        chunksize (int, optional): Rows read per chunk. Defaults to 100,000.
+        compression (int, optional): Quantile centroids kept per column. Defaults to ``DIGEST_COMPRESSION``.
+        progress_callback (callable, optional): Called as ``progress_callback(rows_read, bytes_read, total_bytes)``
+            after every chunk of each pass.
+        cancel_event (threading.Event, optional): When set, the run stops with ``ReadCancelled``.
+
+    Returns:
+        tuple: The number of rows written, and for mean and median fills the value put in the
+        nulls of each filled column (an empty dict otherwise).
+
+    Raises:
+        ValueError: If the option is unknown.
+        DataImportError: If the file cannot be read (see ``DataImport.iter_csv_chunks``).
+        ReadCancelled: If the cancel event is set.
+    """
+
+    if option not in NULL_OPTIONS:
+        raise ValueError(f"Unknown null option: '{option}'")
+
+    def chunks():
+        return DataImport(source, chunksize=chunksize, progress_callback=progress_callback,
+                          cancel_event=cancel_event).iter_csv_chunks()
+
+    fill_values = {}
+    if option in ("Fill with mean", "Fill with median"):
+        fill_values = compute_statistics(chunks(), compression).fill_values(option)
+        rows_written = write_filled_csv(chunks(), destination, option, fill_values)
+    else:
+        rows_written = write_filled_csv(chunks(), destination, option, constant)
+    return rows_written, fill_values
@@ -0,0 +1,153 @@
+import operator
+import numpy as np
+from backend.errors import QueryError
+
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def filter_mask(data, filters):
+    """Returns a boolean mask of the rows that meet every filter.
+
+    Args:
+        data (DataFrame): The data to filter.
+        filters (list): ``(column, operator, value)`` tuples, as returned by ``parse_filters``.
+
+    Returns:
+        ndarray: One boolean per row. Rows with a null in a filtered column are dropped.
+
+    Raises:
+        QueryError: If a column is unknown or cannot be compared with its value.
+    """
+
+    mask = np.ones(len(data), dtype=bool)
+    for column, op, value in filters or []:
+        if column not in data.columns:
+            raise QueryError(f"Unknown column in filter: '{column}'")
+        try:
+            result = OPERATORS[op](data[column], value)
+        except TypeError as e:
+            raise QueryError(f"Cannot compare column '{column}' with {value!r}: {e}") from e
+        mask &= result.fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+#=================================== TABLEQUERY ==================================
+
+class TableQuery():
+    """Sorts and filters a DataFrame for display without copying or reordering it.
+
+    The result is an array of row positions: the table shows the rows of the
+    DataFrame in that order. The ascending sort permutation of a column is
+    computed once and reused, reversed, for the descending order and across
+    filter changes; a filter is a boolean mask applied to the permutation.
+    """
+
+    def __init__(self, data):
+        """Initializes the query with no sort and no filter.
+
+        Args:
+            data (DataFrame): The data to sort and filter.
+        """
+
+        self.data = data
+        self.sort_column = None
+        self.ascending = True
+        self.filters = None
+        self._orders = {}
+        self._mask = None
+        self._rows = None
+
+    def order(self, column, ascending=True):
+        """Returns the row positions of the data sorted by a column, with nulls last.
+
+        Object columns mixing types that cannot be compared, such as text and
+        numbers, are sorted by the text of their values.
+
+        Args:
+            column (str): The column to sort by.
+            ascending (bool, optional): Sort direction. Defaults to True.
+
+        Returns:
+            ndarray: The sort permutation.
+        """
+
+        if column not in self._orders:
+            series = self.data[column].reset_index(drop=True)
+            try:
+                permutation = series.sort_values(kind="stable", na_position="last").index.to_numpy()
+            except TypeError:
+                permutation = series.sort_values(kind="stable", na_position="last",
+                                                 key=lambda values: values.where(values.isna(), values.astype(str))).index.to_numpy()
+            self._orders[column] = (permutation, int(series.notna().sum()))
+        permutation, valid = self._orders[column]
+        if ascending:
+            return permutation
+        return np.concatenate([permutation[:valid][::-1], permutation[valid:]])
+
+    def sort(self, column, ascending=None):
+        """Sorts the rows by a column.
+
+        Args:
+            column (str): The column to sort by.
+            ascending (bool, optional): Sort direction. By default, sorting again by the same
+                column reverses the direction, and a new column is sorted ascending.
+        """
+
+        if ascending is None:
+            ascending = not self.ascending if column == self.sort_column else True
+        self.sort_column = column
+        self.ascending = ascending
+        self._rows = None
+
+    def clear_sort(self):
+        """Shows the rows in their original order again."""
+
+        self.sort_column = None
+        self.ascending = True
+        self._rows = None
+
+    def set_filter(self, filters):
+        """Keeps only the rows that meet every filter.
+
+        Args:
+            filters (list): ``(column, operator, value)`` tuples, or None to show every row.
+
+        Raises:
+            QueryError: If a filter cannot be applied; the previous filter is kept.
+        """
+
+        self._mask = filter_mask(self.data, filters) if filters else None
+        self.filters = filters or None
+        self._rows = None
+
+    def rows(self):
+        """Returns the positions of the rows to show, in order, or None to show every row as it is."""
+
+        if self._rows is None and (self.sort_column is not None or self._mask is not None):
+            if self.sort_column is not None:
+                permutation = self.order(self.sort_column, self.ascending)
+                self._rows = permutation if self._mask is None else permutation[self._mask[permutation]]
+            else:
+                self._rows = np.flatnonzero(self._mask)
+        return self._rows
+
+    def row_count(self):
+        """Returns the number of rows shown."""
+
+        rows = self.rows()
+        return len(self.data) if rows is None else len(rows)
+
+    def filtered_data(self):
+        """Returns a copy of the rows that meet the filter, in their original order, or the data if there is no filter."""
+
+        if self._mask is None:
+            return self.data
+        return self.data[self._mask]
@@ -0,0 +1,189 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from backend.errors import ReadCancelled
+
+
+class ResourceBusy(RuntimeError):
+    """Raised when a task is submitted for a resource that already has a task running."""
+
+
+def run_inline(work, on_done=None, on_error=None):
+    """Runs ``work()`` straight away and passes its result to ``on_done``.
+
+    This is the default task runner of the backend classes, used when no
+    executor is given (for example in tests and scripts).
+
+    Args:
+        work (callable): The work to run, called without arguments.
+        on_done (callable, optional): Called with the result of ``work``.
+        on_error (callable, optional): Called with the exception raised by ``work``.
+            Without it, the exception propagates.
+    """
+
+    try:
+        result = work()
+    except Exception as e:
+        if on_error is None:
+            raise
+        on_error(e)
+        return
+    if on_done is not None:
+        on_done(result)
+
+
+#=================================== TASK ====================================
+
+class Task():
+    """A unit of background work bound to a resource, with its callbacks."""
+
+    def __init__(self, resource, on_done=None, on_progress=None, on_error=None, on_cancelled=None):
+        """Initializes the task.
+
+        Args:
+            resource (str): Name of the resource the task works on, such as ``"data"``.
+            on_done (callable, optional): Called with the result of the task.
+            on_progress (callable, optional): Called with the arguments passed to the progress callback.
+            on_error (callable, optional): Called with the exception raised by the task.
+            on_cancelled (callable, optional): Called without arguments if the task was cancelled.
+        """
+
+        self.resource = resource
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def cancel(self):
+        """Asks the task to stop. A task that has not started yet never runs."""
+
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def is_cancelled(self):
+        """Returns True if the task has been asked to stop."""
+
+        return self.cancel_event.is_set()
+
+
+#================================ TASKEXECUTOR ================================
+
+class TaskExecutor():
+    """Runs backend work on worker threads and reports back on the thread that polls it.
+
+    Work functions are called as ``function(progress_callback, cancel_event)`` on a
+    worker thread and must not touch any widget. Progress, results and errors are
+    queued, and ``poll`` dispatches them to the task callbacks on the calling
+    thread, normally the Tk event loop. Only one task may run per resource, so
+    for example a fit cannot start while the data it uses is still loading.
+    """
+
+    def __init__(self, max_workers=2):
+        """Initializes the executor.
+
+        Args:
+            max_workers (int, optional): Number of worker threads. Defaults to 2.
+        """
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task")
+        self._events = queue.Queue()
+        self._running = {}
+
+    def submit(self, resource, function, on_done=None, on_progress=None, on_error=None, on_cancelled=None):
+        """Starts ``function`` on a worker thread.
+
+        Args:
+            resource (str): Name of the resource the task works on.
+            function (callable): Called as ``function(progress_callback, cancel_event)`` on the worker
+                thread. It may raise ``ReadCancelled`` once the cancel event is set.
+            on_done (callable, optional): Called with the result of ``function``.
+            on_progress (callable, optional): Called with the arguments passed to ``progress_callback``.
+            on_error (callable, optional): Called with the exception raised by ``function``.
+            on_cancelled (callable, optional): Called without arguments if the task was cancelled.
+
+        Returns:
+            Task: The submitted task.
+
+        Raises:
+            ResourceBusy: If a task is already running for ``resource``.
+        """
+
+        if self.is_busy(resource):
+            raise ResourceBusy(f"A task is already running for '{resource}'.")
+
+        task = Task(resource, on_done, on_progress, on_error, on_cancelled)
+        events = self._events
+
+        def progress_callback(*progress):
+            events.put((task, "progress", progress))
+
+        def run():
+            try:
+                result = function(progress_callback, task.cancel_event)
+            except ReadCancelled:
+                events.put((task, "cancelled", None))
+            except Exception as e:
+                events.put((task, "error", e))
+            else:
+                events.put((task, "cancelled" if task.is_cancelled() else "done", result))
+
+        self._running[resource] = task
+        task.future = self._pool.submit(run)
+        return task
+
+    def is_busy(self, resource):
+        """Returns True if a task is running for ``resource``."""
+
+        return resource in self._running
+
+    def cancel(self, resource):
+        """Asks the task running for ``resource``, if any, to stop.
+
+        The task keeps its resource until its cancellation has been dispatched by ``poll``.
+        """
+
+        task = self._running.get(resource)
+        if task is not None:
+            task.cancel()
+            # A task cancelled before it started never posts an event
+            if task.future.cancelled():
+                self._events.put((task, "cancelled", None))
+
+    def poll(self):
+        """Dispatches the queued progress, results and errors to the task callbacks.
+
+        Returns:
+            bool: True while tasks are still running.
+        """
+
+        while True:
+            try:
+                task, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                return bool(self._running)
+
+            if kind == "progress":
+                if task.on_progress is not None and not task.is_cancelled():
+                    task.on_progress(*payload)
+                continue
+
+            if self._running.get(task.resource) is task:
+                del self._running[task.resource]
+            if kind == "done" and task.on_done is not None:
+                task.on_done(payload)
+            elif kind == "error":
+                if task.on_error is None:
+                    raise payload
+                task.on_error(payload)
+            elif kind == "cancelled" and task.on_cancelled is not None:
+                task.on_cancelled()
+
+    def shutdown(self):
+        """Cancels every task and stops the worker threads without waiting for them."""
+
+        for task in list(self._running.values()):
+            task.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
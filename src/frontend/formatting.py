@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_PRECISION = 4
+
+
+#================================= CELL FORMATTING ================================
+
+def format_values(values, precision=DEFAULT_PRECISION):
+    """Turns a slice of a column into display strings in one vectorized pass.
+
+    Floats are shown with ``precision`` decimals, so every row of a column
+    lines up; missing values are shown as empty cells.
+
+    Args:
+        values (ExtensionArray | ndarray): The values to format.
+        precision (int, optional): Decimals shown for float columns. Defaults to 4.
+
+    Returns:
+        ndarray: The display strings, one per value.
+    """
+
+    series = pd.Series(values, copy=False)
+    missing = series.isna().to_numpy()
+    if pd.api.types.is_float_dtype(series.dtype):
+        strings = np.char.mod(f"%.{precision}f", series.to_numpy(dtype=np.float64, na_value=np.nan)).astype(object)
+    else:
+        strings = series.astype(str).to_numpy(dtype=object)
+    strings[missing] = ""
+    return strings
+
+
+#================================= CELLFORMATTER ==================================
+
+class CellFormatter():
+    """Formats table cells by blocks of rows and caches the strings until the column changes.
+
+    A column is identified by the array object it is read from, and by the
+    array of row positions when the table shows the rows in another order:
+    the table replaces them whenever the column or the order changes, which
+    drops the cached strings. Values changed in place keep the same array,
+    so their column must be dropped with ``invalidate``. Only the blocks that
+    have been on screen are ever formatted.
+    """
+
+    def __init__(self, precisions=None, block_size=1024, max_blocks=64):
+        """Initializes the formatter.
+
+        Args:
+            precisions (dict, optional): Column name -> decimals shown for that float column.
+                Other float columns use ``DEFAULT_PRECISION``.
+            block_size (int, optional): Rows formatted together. Defaults to 1024.
+            max_blocks (int, optional): Blocks kept per column; the oldest are dropped first. Defaults to 64.
+        """
+
+        self.precisions = dict(precisions or {})
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._cache = {}
+
+    def set_precision(self, column, precision):
+        """Sets the decimals shown for a float column and drops its cached strings.
+
+        Args:
+            column (str): Name of the column.
+            precision (int): Number of decimals.
+        """
+
+        self.precisions[column] = precision
+        self._cache.pop(column, None)
+
+    def invalidate(self, column):
+        """Drops the cached strings of a column whose values were changed in place.
+
+        Args:
+            column (str): Name of the column.
+        """
+
+        self._cache.pop(column, None)
+
+    def clear(self):
+        """Drops every cached string."""
+
+        self._cache.clear()
+
+    def format(self, column, array, start, stop, rows=None):
+        """Returns the display strings of rows ``start`` to ``stop`` of a column.
+
+        Args:
+            column (str): Name of the column.
+            array (ExtensionArray): The values of the column.
+            start (int): First row.
+            stop (int): Row after the last one.
+            rows (ndarray, optional): Positions in ``array`` of the rows shown, when they are
+                sorted or filtered. ``start`` and ``stop`` then index ``rows``.
+
+        Returns:
+            list: The display strings.
+        """
+
+        cached_array, cached_rows, blocks = self._cache.get(column, (None, None, None))
+        if cached_array is not array or cached_rows is not rows:
+            blocks = {}
+            self._cache[column] = (array, rows, blocks)
+
+        precision = self.precisions.get(column, DEFAULT_PRECISION)
+        strings = []
+        if stop <= start:
+            return strings
+        for block in range(start // self.block_size, (stop - 1) // self.block_size + 1):
+            block_start = block * self.block_size
+            if block not in blocks:
+                if len(blocks) >= self.max_blocks:
+                    del blocks[next(iter(blocks))]
+                if rows is None:
+                    values = array[block_start:block_start + self.block_size]
+                else:
+                    values = array.take(rows[block_start:block_start + self.block_size])
+                blocks[block] = format_values(values, precision)
+            strings.extend(blocks[block][max(start - block_start, 0):stop - block_start])
+        return strings
@@ -1,11 +1,41 @@
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-from backend.read_file import DataImport
-from backend.preprocess import Preprocess
-from backend.model import Model
+import math
+import os
+from functools import partial
+from tkinter import filedialog, messagebox, simpledialog, ttk
+from backend.errors import (CorruptFileError, DataImportError, MissingDependencyError, MissingFileError,
+                            QueryError, SchemaError, UnsupportedFormatError)
+from backend.read_file import DataImport, parse_filters, read_files, split_extension
+from backend.cache import DatasetCache
+from backend.dtypes import format_memory_report, is_numeric_column, optimize_dtypes
+from backend.encoding import ONE_HOT, ORDINAL
+from backend.preprocess import Imputer, Preprocess, apply_null_steps
+from backend.model import Model, preload_modules
 from backend.columns import Columns
 from backend.predictions import Predictions
+from backend.streaming import clean_csv
+from backend.table_query import TableQuery
+from backend.tasks import ResourceBusy, TaskExecutor
+from frontend.instrumentation import LatencyMonitor
+from frontend.plot_view import PlotView
+from frontend.table_view import VirtualTable
+
+
+# Files larger than this are opened as a random sample until the model is fitted
+PREVIEW_THRESHOLD_BYTES = 256 * 1024 ** 2
+PREVIEW_ROWS = 100_000
+
+
+# Dialog titles for the errors raised while reading a file
+LOAD_ERROR_TITLES = (
+    (MissingFileError, "File Not Found"),
+    (UnsupportedFormatError, "Unsupported Format"),
+    (CorruptFileError, "Corrupt File"),
+    (SchemaError, "Invalid Selection"),
+    (QueryError, "Invalid Filter"),
+    (MissingDependencyError, "Missing Package"),
+)
 
 
 # ==================================== GUI ==================================
@@ -17,11 +47,16 @@ class GUI:
     widgets, event handling, and interactions between components.
     """
 
-    def __init__(self, root):
+    def __init__(self, root, preview_threshold=PREVIEW_THRESHOLD_BYTES, preview_rows=PREVIEW_ROWS, profile_report=None):
         """Initializes the GUI class and sets up the main application window.
 
         Args:
             root (tk.Tk): The root window of the application.
+            preview_threshold (int, optional): Size in bytes above which a selection is opened as a
+                random sample. The full data is only read when the model is fitted on it.
+            preview_rows (int, optional): Number of rows sampled for a preview.
+            profile_report (str, optional): If given, the event loop lag and the sidebar commands
+                are monitored, and a latency report is written to this path when the window closes.
         """
 
         self.root = root
@@ -32,6 +67,18 @@ class GUI:
         self.output_column = None
         self.data_table_df = None
         self.description_saved = ""
+        self.tasks = TaskExecutor()
+        self.polling_tasks = False
+        self.plot_view = PlotView(self.root)
+        self.dataset_cache = DatasetCache()
+        self.preview_threshold = preview_threshold
+        self.preview_rows = preview_rows
+        self.full_load = None
+        self.full_fill_values = None
+        self.full_null_rows = None
+        self.preprocess = None
+        self.encoding = ONE_HOT
+        self.table_query = None
 
         # Configure the window
         self.root.geometry("1200x800")
@@ -46,6 +93,14 @@ class GUI:
         self.root.grid_rowconfigure(1, weight=6)
 
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.profile_report = profile_report
+        self.monitor = None
+        if profile_report:
+            self.monitor = LatencyMonitor(self.root)
+            self.monitor.instrument_commands(self.sidebar)
+            self.monitor.start()
 
     # ------------------------------- LABEL ----------------------------
 
@@ -92,19 +147,64 @@ class GUI:
         self.progress_bar = ctk.CTkProgressBar(self.loading_frame, width=300)
         self.progress_bar.pack(pady=20)
 
-    def show_loading_screen(self):
-        """Displays the loading screen and starts the progress bar animation."""
+        self.progress_label = self.create_label(
+            self.loading_frame, "", font=("Roboto", 14), text_color="grey")
+        self.progress_label.pack(pady=5)
+
+        self.cancel_load_button = ctk.CTkButton(
+            self.loading_frame,
+            text="Cancel",
+            command=self.cancel_load,
+            corner_radius=8,
+            fg_color="#e74c3c",
+            hover_color="#c0392b",
+            text_color="white"
+        )
+        self.cancel_load_button.pack(pady=10)
+        self.cancel_load_button.pack_forget()
+
+    def show_loading_screen(self, determinate=False):
+        """Displays the loading screen.
+
+        Args:
+            determinate (bool, optional): If True, the progress bar is driven by
+                ``update_loading_progress`` and a cancel button is shown. Otherwise
+                the bar runs an indeterminate animation. Defaults to False.
+        """
 
         self.loading_frame.grid(
             row=1, column=1, sticky="nsew", padx=10, pady=10)
         self.progress_bar.set(0)
-        self.progress_bar.start()
+        self.progress_label.configure(text="")
+        if determinate:
+            self.progress_bar.configure(mode="determinate")
+            self.cancel_load_button.pack(pady=10)
+        else:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+
+    def update_loading_progress(self, rows_read, bytes_read, total_bytes):
+        """Updates the progress bar and label with the rows and bytes read so far.
+
+        Args:
+            rows_read (int): Number of rows parsed so far.
+            bytes_read (int): Number of bytes consumed from the file so far.
+            total_bytes (int): Size of the file in bytes.
+        """
+
+        if total_bytes:
+            self.progress_bar.set(min(bytes_read / total_bytes, 1))
+            self.progress_label.configure(
+                text=f"{rows_read:,} rows read ({bytes_read / 1_048_576:,.1f} / {total_bytes / 1_048_576:,.1f} MB)")
+        else:
+            self.progress_label.configure(text=f"{rows_read:,} rows read")
 
     def hide_loading_screen(self):
         """Hides the loading screen and stops the progress bar animation."""
 
         self.loading_frame.grid_forget()
         self.progress_bar.stop()
+        self.cancel_load_button.pack_forget()
 
     def show_welcome_message(self):
         """Displays a welcome message in a dialog box."""
@@ -146,6 +246,17 @@ class GUI:
         )
         self.subtitle_label.pack(side="left", padx=10)
 
+        self.optimize_memory_var = ctk.BooleanVar(value=False)
+        self.optimize_memory_switch = ctk.CTkSwitch(
+            self.title_bar,
+            text="Optimize memory",
+            variable=self.optimize_memory_var,
+            font=("Roboto", 14),
+            text_color="#ecf0f1",
+            progress_color="#2ecc71"
+        )
+        self.optimize_memory_switch.pack(side="right", padx=20)
+
     def create_sidebar(self):
         """Creates a sidebar with action buttons and null-handling options."""
 
@@ -193,6 +304,17 @@ class GUI:
             fg_color="#718093", hover_color="#b2bec3")
         self.load_model_button.pack(side="left", expand=True, padx=5)
 
+        #Clean a CSV file too large to load
+        self.clean_file_button = ctk.CTkButton(
+            self.sidebar,
+            text="Clean Large CSV",
+            command=self.clean_large_file,
+            **button_style
+        )
+        self.clean_file_button.configure(
+            fg_color="#718093", hover_color="#b2bec3")
+        self.clean_file_button.pack(pady=5, fill="x", padx=10)
+
         #Load
         self.load_button = ctk.CTkButton(
             self.sidebar,
@@ -262,6 +384,30 @@ class GUI:
         self.constant_entry.configure(state="disabled")
         self.constant_entry.pack_forget()
 
+        #Undo / redo the null handling steps
+        self.history_frame = ctk.CTkFrame(self.null_handling_frame, fg_color="#f5f5f5")
+        self.history_frame.pack(pady=5, fill="x")
+        self.undo_button = ctk.CTkButton(
+            self.history_frame,
+            text="Undo",
+            command=self.undo_step,
+            width=80,
+            **button_style
+        )
+        self.undo_button.pack(side="left", expand=True, fill="x", padx=(0, 2))
+        self.undo_button.configure(state="disabled")
+        self.redo_button = ctk.CTkButton(
+            self.history_frame,
+            text="Redo",
+            command=self.redo_step,
+            width=80,
+            **button_style
+        )
+        self.redo_button.pack(side="left", expand=True, fill="x", padx=(2, 0))
+        self.redo_button.configure(state="disabled")
+        self.root.bind("<Control-z>", self.undo_step)
+        self.root.bind("<Control-y>", self.redo_step)
+
         #Select input columns
         self.select_columns_button = ctk.CTkButton(
             self.sidebar,
@@ -333,7 +479,8 @@ class GUI:
 
         self.model = Model(self.save_button, self.load_model_button, self.predict_button, self.show_model_button,
                            self.preprocess_button, self.select_columns_button, self.select_output_button, self.null_option_menu,
-                           self.create_model_button, self.constant_entry, self.null_handling_label, self.null_handling_frame, self.load_button)
+                           self.create_model_button, self.constant_entry, self.null_handling_label, self.null_handling_frame, self.load_button,
+                           run_task=self.run_data_task, plot_view=self.plot_view)
 
     def create_main_section(self):
         """Creates the main content section of the application."""
@@ -345,12 +492,45 @@ class GUI:
         self.main_section.grid(
             row=1, column=1, sticky="nsew", padx=10, pady=10)
 
-        self.main_section.grid_rowconfigure(0, weight=1)
+        self.main_section.grid_rowconfigure(1, weight=1)
         self.main_section.grid_columnconfigure(0, weight=1)
 
+        self.query_frame = ctk.CTkFrame(
+            self.main_section, corner_radius=15, fg_color="white")
+        self.query_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 0))
+
         self.table_frame = ctk.CTkFrame(
             self.main_section, corner_radius=15, fg_color="white")
-        self.table_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        self.table_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+
+        #--------------------- Sort / Filter bar ------------------
+
+        self.filter_entry = ctk.CTkEntry(
+            self.query_frame,
+            placeholder_text="Filter rows, e.g. price > 100 and city == 'Madrid'",
+            font=("Roboto", 12),
+            corner_radius=8
+        )
+        self.filter_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        self.filter_entry.bind("<Return>", lambda event: self.apply_table_filter())
+
+        self.filter_button = ctk.CTkButton(
+            self.query_frame, text="Filter", command=self.apply_table_filter, width=70, corner_radius=8)
+        self.filter_button.pack(side="left", padx=5)
+
+        self.clear_filter_button = ctk.CTkButton(
+            self.query_frame, text="Clear", command=self.clear_table_query, width=70, corner_radius=8,
+            fg_color="#95a5a6", hover_color="#7f8c8d")
+        self.clear_filter_button.pack(side="left", padx=5)
+
+        self.use_filtered_rows = ctk.IntVar(value=0)
+        self.use_filtered_checkbox = ctk.CTkCheckBox(
+            self.query_frame, text="Use filtered rows for the model", variable=self.use_filtered_rows,
+            text_color="#2c3e50")
+        self.use_filtered_checkbox.pack(side="left", padx=5)
+
+        self.query_label = ctk.CTkLabel(self.query_frame, text="", text_color="#2c3e50")
+        self.query_label.pack(side="left", padx=5)
 
         #----------------- Data table / Scrollbars ----------------
 
@@ -365,13 +545,14 @@ class GUI:
         self.data_table = ttk.Treeview(
             self.table_frame,
             show="headings",
-            xscrollcommand=self.x_scrollbar.set,
-            yscrollcommand=self.y_scrollbar.set
+            xscrollcommand=self.x_scrollbar.set
         )
         self.data_table.pack(fill="both", expand=True)
 
         self.x_scrollbar.config(command=self.data_table.xview)
-        self.y_scrollbar.config(command=self.data_table.yview)
+
+        # Only the visible rows are rendered; the table drives the vertical scrollbar
+        self.table_view = VirtualTable(self.data_table, self.y_scrollbar, rowheight=25, on_heading=self.sort_table)
 
         #Data table style
         style = ttk.Style()
@@ -551,113 +732,673 @@ class GUI:
     def load_file(self):
         """Loads a data file selected by the user and displays it in the table."""
 
-        file_path = filedialog.askopenfilename(
+        file_paths = filedialog.askopenfilenames(
             title="Select File",
-            filetypes=[("CSV Files", "*.csv"), ("Excel Files",
-                                                "*.xlsx *.xls"), ("SQLite Files", "*.db *.sqlite")]
+            filetypes=[("CSV Files", "*.csv *.csv.gz *.csv.bz2 *.csv.zst *.csv.xz *.csv.zip"), ("Excel Files",
+                                                "*.xlsx *.xls"), ("SQLite Files", "*.db *.sqlite"),
+                       ("Columnar Files", "*.parquet *.pq *.feather *.arrow"), ("NumPy Files", "*.npy *.npz"),
+                       ("All Files", "*.*")]
         )
-        if file_path:
-            self._file = file_path
+        sample_rows = self.preview_sample_rows(file_paths) if file_paths else None
+        if len(file_paths) > 1:
+            self._file = f"{len(file_paths)} files ({', '.join(os.path.basename(path) for path in file_paths)})"
+            self.load_files_in_background(list(file_paths), sample_rows)
+            return
+        if file_paths:
+            self._file = file_paths[0]
             try:
+                options = {}
                 data_importer = DataImport(self._file)
-                data_importer.file_type()
-                data = data_importer._data
-                if not data.empty:
-                    
-                    #------------------ If data is not empty ------------------
-
-                    self.show_loading_screen()
-                    self.data_table["show"] = "headings"
-                    self.data_table_df = data
-                    self.display_data(data)
-
-                    self.mse_label.configure(text="MSE: None")
-                    self.r2_label.configure(text="R2: None")
-                    self.formula_label.configure(text="Formula: None")
-                    self.input_columns_label.configure(
-                        text="Input Columns: None")
-                    self.output_column_label.configure(
-                        text="Output Column: None")
-                    self.result_prediction_label.configure(
-                        text="Result prediction: None")
-                    self.load_description_label.configure(
-                        text="Description: None")
-
-                    self.preprocess_button.configure(state="normal")
-                    self.null_option_menu.configure(state="disabled")
-                    self.constant_entry.configure(state="disabled")
-                    self.constant_entry.pack_forget()
-                    self.select_columns_button.configure(state="disabled")
-                    self.select_output_button.configure(state="disabled")
-                    self.create_model_button.configure(state="disabled")
-                    self.show_model_button.configure(state="disabled")
-                    self.predict_button.configure(state="disabled")
-                    self.save_button.configure(state="disabled")
-
-                    self.columns_selected = []
-                    self.output_column = None
-                    self.file_path_label.configure(
-                        text=f"File loaded: {self._file}")
-                else:
-
-                    #------------------ If data is empty -----------------------
-
-                    self.data_table.delete(*self.data_table.get_children())
-                    self.data_table["show"] = "tree"
-
-                    self.mse_label.configure(text="MSE: None")
-                    self.r2_label.configure(text="R2: None")
-                    self.formula_label.configure(text="Formula: None")
-                    self.file_path_label.configure(
-                        text="File Path: No file loaded")
-                    self.input_columns_label.configure(
-                        text="Input Columns: None")
-                    self.output_column_label.configure(
-                        text="Output Column: None")
-                    self.result_prediction_label.configure(
-                        text="Result prediction: None")
-                    self.load_description_label.configure(
-                        text="Description: None")
-
-                    self.preprocess_button.configure(state="disabled")
-                    self.null_option_menu.configure(state="disabled")
-                    self.constant_entry.configure(state="disabled")
-                    self.select_columns_button.configure(state="disabled")
-                    self.select_output_button.configure(state="disabled")
-                    self.create_model_button.configure(state="disabled")
-                    self.show_model_button.configure(state="disabled")
-                    self.predict_button.configure(state="disabled")
-                    self.save_button.configure(state="disabled")
-
-                    messagebox.showerror(
-                        "Error", "No data to display. Please check the file.")
+                if data_importer.is_sqlite():
+                    options = self.ask_sql_options(data_importer)
+                elif data_importer.is_excel():
+                    options = self.ask_excel_options(data_importer)
+                elif data_importer.columnar_format():
+                    options = self.ask_load_options(data_importer.list_columns())
+            except Exception as e:
+                self.show_load_error(e)
+                return
+            if options is not None:
+                self.load_file_in_background(sample_rows, **options)
+
+    def preview_sample_rows(self, file_paths):
+        """Returns the number of rows to sample for a preview of the selected files.
+
+        NumPy files are never sampled: they are memory-mapped, so opening them is free.
+
+        Args:
+            file_paths (list): Paths of the selected files.
+
+        Returns:
+            int: ``preview_rows`` if the files are larger than ``preview_threshold``, otherwise None.
+        """
+
+        if any(split_extension(path)[0] in ("npy", "npz") for path in file_paths):
+            return None
+        if sum(os.path.getsize(path) for path in file_paths) <= self.preview_threshold:
+            return None
+        return self.preview_rows
+
+    def ask_load_options(self, available_columns, ask_limit=False, ask_filter=True):
+        """Asks which columns to load and which rows to keep before reading a file.
+
+        Args:
+            available_columns (list): Column names stored in the file.
+            ask_limit (bool, optional): Whether to also ask for a maximum number of rows. Defaults to False.
+            ask_filter (bool, optional): Whether to ask for a row filter. Defaults to True.
+
+        Returns:
+            dict: ``columns``, ``filters`` and (optionally) ``limit`` keyword arguments for
+            DataImport, or None if the user cancelled.
+        """
+
+        preview = ", ".join(available_columns[:20])
+        if len(available_columns) > 20:
+            preview += ", ..."
+        columns_text = simpledialog.askstring(
+            "Columns to Load",
+            f"Available columns:\n{preview}\n\n"
+            "Enter the columns to load separated by commas (leave blank to load all):",
+            parent=self.root)
+        if columns_text is None:
+            return None
+        columns = [col.strip() for col in columns_text.split(",") if col.strip()] or None
+        unknown_columns = [col for col in columns or [] if col not in available_columns]
+        if unknown_columns:
+            messagebox.showerror("Error", f"Unknown columns: {', '.join(unknown_columns)}")
+            return None
+
+        options = {"columns": columns}
+        if ask_filter:
+            filter_text = simpledialog.askstring(
+                "Row Filter",
+                "Optional row filter, e.g. price > 100 and city == 'Madrid' (leave blank to load all rows):",
+                parent=self.root)
+            if filter_text is None:
+                return None
+            try:
+                options["filters"] = parse_filters(filter_text)
+            except QueryError as e:
+                messagebox.showerror("Invalid Filter", str(e))
+                return None
+
+        if ask_limit:
+            limit = simpledialog.askinteger(
+                "Row Limit", "Maximum number of rows to load (leave blank to load all):",
+                parent=self.root, minvalue=1)
+            options["limit"] = limit
+        return options
+
+    def ask_excel_options(self, data_importer):
+        """Asks which sheets of an Excel workbook to read, then which columns and how many rows.
+
+        Args:
+            data_importer (DataImport): Importer for the selected workbook.
+
+        Returns:
+            dict: Keyword arguments for DataImport, or None if the user cancelled.
+        """
+
+        sheets = data_importer.list_sheets()
+        selected_sheets = sheets[:1]
+        if len(sheets) > 1:
+            sheets_text = simpledialog.askstring(
+                "Select Sheets",
+                f"Sheets found:\n{', '.join(sheets)}\n\n"
+                "Enter the sheets to load separated by commas. Several sheets must have the same columns:",
+                initialvalue=sheets[0], parent=self.root)
+            if sheets_text is None:
+                return None
+            selected_sheets = [sheet.strip() for sheet in sheets_text.split(",") if sheet.strip()]
+            unknown_sheets = [sheet for sheet in selected_sheets if sheet not in sheets]
+            if not selected_sheets or unknown_sheets:
+                messagebox.showerror("Error", f"Unknown sheets: {', '.join(unknown_sheets) or 'none selected'}")
+                return None
+
+        available_columns = DataImport(self._file, sheets=selected_sheets[0]).list_columns()
+        options = self.ask_load_options(available_columns, ask_limit=True, ask_filter=False)
+        if options is None:
+            return None
+        options["sheets"] = selected_sheets if len(selected_sheets) > 1 else selected_sheets[0]
+        return options
+
+    def ask_sql_options(self, data_importer):
+        """Asks which table or view to read from an SQLite database, then its load options.
+
+        Args:
+            data_importer (DataImport): Importer for the selected database.
+
+        Returns:
+            dict: Keyword arguments for DataImport, or None if the user cancelled.
+        """
+
+        tables = data_importer.list_tables()
+        if not tables:
+            messagebox.showerror("Error", "No tables found in the database.")
+            return None
+
+        table = tables[0]
+        if len(tables) > 1:
+            table = simpledialog.askstring(
+                "Select Table",
+                f"Tables and views found:\n{', '.join(tables)}\n\nEnter the one to load:",
+                initialvalue=tables[0], parent=self.root)
+            if table is None:
+                return None
+            if table not in tables:
+                messagebox.showerror("Error", f"Table '{table}' was not found in the database.")
+                return None
+
+        available_columns = DataImport(self._file, table=table).list_columns()
+        options = self.ask_load_options(available_columns, ask_limit=True)
+        if options is None:
+            return None
+        options["table"] = table
+        return options
+
+    def load_in_background(self, load, on_done=None):
+        """Runs a loading function as a cancellable background task on the data.
+
+        Args:
+            load (callable): Called as ``load(progress_callback, cancel_event)`` on a worker
+                thread; returns the loaded DataFrame and its memory report (or None).
+            on_done (callable, optional): Called on the Tk thread with the loaded DataFrame and
+                its memory report. Defaults to ``finish_loading``.
+        """
+
+        on_done = on_done or self.finish_loading
+
+        def finish(result):
+            self.load_button.configure(state="normal")
+            try:
+                on_done(*result)
             except Exception as e:
                 messagebox.showerror("Error", f"Error while loading file: {e}")
-        self.root.after(600, self.hide_loading_screen)
+
+        def fail(error):
+            self.load_button.configure(state="normal")
+            self.show_load_error(error)
+
+        if self.start_task("data", load, on_done=finish, on_error=fail, cancellable=True,
+                           on_cancelled=lambda: self.load_button.configure(state="normal")):
+            self.load_button.configure(state="disabled")
+
+    def file_loader(self, file_path, **options):
+        """Returns a function that reads one file for ``load_in_background``.
+
+        Args:
+            file_path (str): Path of the file to read.
+            **options: Keyword arguments for DataImport, such as ``columns`` or ``sample_rows``.
+
+        Returns:
+            callable: ``load(progress_callback, cancel_event)`` returning the data and its memory report.
+        """
+
+        optimize_memory = self.optimize_memory_var.get()
+        dataset_cache = self.dataset_cache
+
+        def load(progress_callback, cancel_event):
+            data_importer = DataImport(file_path, progress_callback=progress_callback, cancel_event=cancel_event,
+                                       cache=dataset_cache, optimize_memory=optimize_memory, **options)
+            data = data_importer.load()
+            return data_importer.optimize_memory(data), data_importer.memory_report
+
+        return load
+
+    def files_loader(self, file_paths, **options):
+        """Returns a function that reads several files in a process pool for ``load_in_background``.
+
+        Args:
+            file_paths (list): Paths of the files to read. They must share the same columns.
+            **options: Keyword arguments for DataImport, such as ``sample_rows`` (per file).
+
+        Returns:
+            callable: ``load(progress_callback, cancel_event)`` returning the data and its memory report.
+        """
+
+        optimize_memory = self.optimize_memory_var.get()
+        dataset_cache = self.dataset_cache
+
+        def load(progress_callback, cancel_event):
+            data = read_files(file_paths, progress_callback=progress_callback, cancel_event=cancel_event,
+                              cache=dataset_cache, **options)
+            if optimize_memory:
+                return optimize_dtypes(data)
+            return data, None
+
+        return load
+
+    def load_file_in_background(self, sample_rows=None, **options):
+        """Reads the selected file on a worker thread.
+
+        Args:
+            sample_rows (int, optional): Read a random sample of this many rows as a preview.
+            **options: Keyword arguments for DataImport, such as ``columns`` or ``table``.
+        """
+
+        full_load = self.file_loader(self._file, **options) if sample_rows else None
+        self.load_in_background(self.file_loader(self._file, sample_rows=sample_rows, **options),
+                                on_done=partial(self.finish_loading, full_load=full_load))
+
+    def load_files_in_background(self, file_paths, sample_rows=None):
+        """Reads several files in a process pool and concatenates them on a worker thread.
+
+        Args:
+            file_paths (list): Paths of the files to read. They must share the same columns.
+            sample_rows (int, optional): Read a random sample of about this many rows as a preview,
+                split evenly between the files.
+        """
+
+        full_load = None
+        options = {}
+        if sample_rows:
+            full_load = self.files_loader(file_paths)
+            options["sample_rows"] = math.ceil(sample_rows / len(file_paths))
+        self.load_in_background(self.files_loader(file_paths, **options),
+                                on_done=partial(self.finish_loading, full_load=full_load))
+
+    def clean_large_file(self):
+        """Handles the nulls of a CSV file without loading it, writing the result to a new CSV file.
+
+        The file is streamed in chunks, twice for means and medians (statistics,
+        then output), so files larger than memory can be cleaned. Medians are
+        approximate.
+        """
+
+        source = filedialog.askopenfilename(
+            title="Select CSV File to Clean",
+            filetypes=[("CSV Files", "*.csv *.csv.gz *.csv.bz2 *.csv.zst *.csv.xz *.csv.zip")])
+        if not source:
+            return
+        answer = simpledialog.askstring(
+            "Handle Null Values",
+            "How should the null values be handled?\n\n"
+            "Enter mean, median, delete, or a number to fill them with:",
+            initialvalue="median", parent=self.root)
+        if answer is None:
+            return
+        options = {"mean": "Fill with mean", "median": "Fill with median", "delete": "Delete rows with nulls"}
+        option, constant = options.get(answer.strip().lower()), None
+        if option is None:
+            try:
+                option, constant = "Fill with constant", float(answer)
+            except ValueError:
+                messagebox.showwarning("Invalid Input", "Please enter mean, median, delete or a number.")
+                return
+        destination = filedialog.asksaveasfilename(
+            title="Save Cleaned File", defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
+        if not destination:
+            return
+
+        def clean(progress_callback, cancel_event):
+            return clean_csv(source, destination, option, constant,
+                             progress_callback=progress_callback, cancel_event=cancel_event)
+
+        def finish(result):
+            rows_written, fill_values = result
+            message = f"{rows_written:,} rows written to {destination}."
+            if fill_values:
+                message += f"\n\n{len(fill_values):,} columns had null values filled."
+            messagebox.showinfo("File Cleaned", message)
+
+        self.start_task("data", clean, on_done=finish, on_error=self.show_load_error, cancellable=True)
+
+    def show_load_error(self, error):
+        """Shows an error raised while reading a file.
+
+        Reader errors carry a message written for the user and are shown with a
+        title for their type; any other error is reported as unexpected.
+
+        Args:
+            error (Exception): The error raised by the reader.
+        """
+
+        for error_type, title in LOAD_ERROR_TITLES:
+            if isinstance(error, error_type):
+                messagebox.showerror(title, str(error))
+                return
+        if isinstance(error, DataImportError):
+            messagebox.showerror("Error", str(error))
+        else:
+            messagebox.showerror("Error", f"An unexpected error occurred while loading the file: {error}")
+
+    def cancel_load(self):
+        """Asks the loading task to stop after the chunk or file it is currently reading."""
+
+        if self.tasks.is_busy("data"):
+            self.tasks.cancel("data")
+            self.progress_label.configure(text="Cancelling...")
+
+    def finish_loading(self, data, memory_report, full_load=None):
+        """Shows freshly loaded data and its memory report.
+
+        Args:
+            data (DataFrame): The data read from the selected file.
+            memory_report (DataFrame): Report returned by ``optimize_dtypes``, or None.
+            full_load (callable, optional): Loader for the full dataset when ``data`` is only a
+                preview sample. It runs when the user fits the model on the full data.
+        """
+
+        self.full_load = full_load if not data.empty else None
+        self.show_loaded_data(data)
+        self.show_memory_report(memory_report)
+
+    def show_loaded_data(self, data):
+        """Displays freshly loaded data and resets the model workflow.
+
+        Args:
+            data (DataFrame): The data read from the selected file.
+        """
+
+        if not data.empty:
+
+            #------------------ If data is not empty ------------------
+
+            self.data_table["show"] = "headings"
+            self.data_table_df = data
+            self.display_data(data)
+
+            self.mse_label.configure(text="MSE: None")
+            self.r2_label.configure(text="R2: None")
+            self.formula_label.configure(text="Formula: None")
+            self.input_columns_label.configure(
+                text="Input Columns: None")
+            self.output_column_label.configure(
+                text="Output Column: None")
+            self.result_prediction_label.configure(
+                text="Result prediction: None")
+            self.load_description_label.configure(
+                text="Description: None")
+
+            self.preprocess_button.configure(state="normal")
+            self.null_option_menu.configure(state="disabled")
+            self.undo_button.configure(state="disabled")
+            self.redo_button.configure(state="disabled")
+            self.constant_entry.configure(state="disabled")
+            self.constant_entry.pack_forget()
+            self.select_columns_button.configure(state="disabled")
+            self.select_output_button.configure(state="disabled")
+            self.create_model_button.configure(state="disabled")
+            self.show_model_button.configure(state="disabled")
+            self.predict_button.configure(state="disabled")
+            self.save_button.configure(state="disabled")
+
+            self.columns_selected = []
+            self.output_column = None
+            self.preprocess = None
+            file_text = f"File loaded: {self._file}"
+            if self.full_load is not None:
+                file_text += f" (preview of {len(data):,} sampled rows)"
+            self.file_path_label.configure(text=file_text)
+        else:
+
+            #------------------ If data is empty -----------------------
+
+            self.table_view.clear()
+            self.data_table["show"] = "tree"
+
+            self.mse_label.configure(text="MSE: None")
+            self.r2_label.configure(text="R2: None")
+            self.formula_label.configure(text="Formula: None")
+            self.file_path_label.configure(
+                text="File Path: No file loaded")
+            self.input_columns_label.configure(
+                text="Input Columns: None")
+            self.output_column_label.configure(
+                text="Output Column: None")
+            self.result_prediction_label.configure(
+                text="Result prediction: None")
+            self.load_description_label.configure(
+                text="Description: None")
+
+            self.preprocess_button.configure(state="disabled")
+            self.null_option_menu.configure(state="disabled")
+            self.undo_button.configure(state="disabled")
+            self.redo_button.configure(state="disabled")
+            self.constant_entry.configure(state="disabled")
+            self.select_columns_button.configure(state="disabled")
+            self.select_output_button.configure(state="disabled")
+            self.create_model_button.configure(state="disabled")
+            self.show_model_button.configure(state="disabled")
+            self.predict_button.configure(state="disabled")
+            self.save_button.configure(state="disabled")
+
+            messagebox.showerror(
+                "Error", "No data to display. Please check the file.")
+
+    def show_memory_report(self, memory_report):
+        """Shows the per-column memory used before and after dtype optimization.
+
+        Args:
+            memory_report (DataFrame): Report returned by ``optimize_dtypes``, or None if
+                memory optimization was disabled.
+        """
+
+        if memory_report is None or memory_report.empty:
+            return
+
+        report_window = tk.Toplevel(self.root)
+        report_window.title("Memory Report")
+        report_window.configure(bg="#dfe6e9")
+
+        title_frame = ctk.CTkFrame(report_window, fg_color="#2c3e50", corner_radius=0)
+        title_frame.pack(fill="x", pady=(10, 5), padx=0)
+        title_label = self.create_label(
+            title_frame, "Memory Before / After Optimization", font=("Helvetica", 16, "bold"), text_color="#ecf0f1")
+        title_label.pack(pady=5)
+
+        report_text = ctk.CTkTextbox(report_window, font=("Courier", 12), width=640, height=400, wrap="none")
+        report_text.pack(pady=(5, 5), padx=10, fill="both", expand=True)
+        report_text.insert("1.0", format_memory_report(memory_report))
+        report_text.configure(state="disabled")
+
+        close_button = ctk.CTkButton(
+            report_window,
+            text="Close",
+            command=report_window.destroy,
+            fg_color="#e74c3c",
+            hover_color="#c0392b",
+            text_color="white",
+            font=("Helvetica", 13),
+            width=160
+        )
+        close_button.pack(pady=(5, 10))
+
+    #-------------------------------- TASKS --------------------------------
+
+    def start_task(self, resource, function, on_done=None, on_error=None, on_cancelled=None, cancellable=False):
+        """Runs backend work on the task executor while the loading screen is shown.
+
+        Args:
+            resource (str): Resource the work uses. Only one task may run per resource.
+            function (callable): Called as ``function(progress_callback, cancel_event)`` on a worker thread.
+            on_done (callable, optional): Called on the Tk thread with the result.
+            on_error (callable, optional): Called on the Tk thread with the exception raised.
+                Defaults to an error message.
+            on_cancelled (callable, optional): Called on the Tk thread if the task was cancelled.
+            cancellable (bool, optional): Show real progress and a cancel button. Defaults to False.
+
+        Returns:
+            bool: True if the task was started, False if the resource was busy.
+        """
+
+        def finished(callback):
+            def run(*args):
+                if not self.tasks.is_busy(resource):
+                    self.hide_loading_screen()
+                if callback is not None:
+                    callback(*args)
+            return run
+
+        try:
+            self.tasks.submit(
+                resource, function,
+                on_done=finished(on_done),
+                on_error=finished(on_error or (lambda error: messagebox.showerror("Error", f"An error occurred: {error}"))),
+                on_cancelled=finished(on_cancelled),
+                on_progress=self.update_loading_progress if cancellable else None)
+        except ResourceBusy:
+            messagebox.showinfo("Please Wait", "Another operation is still running. Try again when it has finished.")
+            return False
+
+        self.show_loading_screen(determinate=cancellable)
+        if not self.polling_tasks:
+            self.polling_tasks = True
+            self.root.after(50, self.poll_tasks)
+        return True
+
+    def run_data_task(self, work, on_done=None, on_error=None):
+        """Task runner given to Preprocess and Model: runs ``work()`` on the dataset in the background.
+
+        Args:
+            work (callable): The work to run, called without arguments on a worker thread.
+            on_done (callable, optional): Called on the Tk thread with the result of ``work``.
+            on_error (callable, optional): Called on the Tk thread with the exception raised by ``work``.
+        """
+
+        self.start_task("data", lambda progress_callback, cancel_event: work(), on_done=on_done, on_error=on_error)
+
+    def poll_tasks(self):
+        """Dispatches task progress and results on the Tk thread while tasks are running."""
+
+        if self.tasks.poll():
+            self.root.after(50, self.poll_tasks)
+        else:
+            self.polling_tasks = False
+
+    def preload_modules(self):
+        """Imports the modelling and plotting libraries in the background, once the window is shown.
+
+        A failed import is ignored here; it is reported when the feature is used.
+        """
+
+        self.tasks.submit("preload", lambda progress_callback, cancel_event: preload_modules(),
+                          on_error=lambda error: None)
+
+    def close(self):
+        """Cancels the running tasks, writes the latency report if monitoring, and closes the window."""
+
+        if self.monitor is not None:
+            self.monitor.write_report(self.profile_report)
+        self.tasks.shutdown()
+        self.plot_view.close()
+        self.root.destroy()
 
     #---------------------------- DISPLAY DATA -----------------------------
 
     def display_data(self, data):
         """Populates the table view with the provided data.
 
+        Only the rows that fit on screen are rendered, so this is fast for any number of rows.
+
         Args:
             data (DataFrame): The data to be displayed in the table.
         """
 
-        self.data_table.delete(*self.data_table.get_children())
-        self.data_table["columns"] = list(data.columns)
+        self.table_query = TableQuery(data)
+        self.filter_entry.delete(0, "end")
+        self.table_view.set_data(data)
+        self.show_table_query()
+
+    def display_changes(self, data, changes):
+        """Patches the table view with the cells and rows changed by a preprocessing step.
+
+        A sorted or filtered view is computed again, since the changed values may move rows.
+
+        Args:
+            data (DataFrame): The data after the step.
+            changes (ChangeSet): The cells filled and the rows dropped by the step.
+        """
+
+        if self.table_query is not None and self.table_query.rows() is not None:
+            self.table_query = self.requery(data)
+            self.show_table_query()
+        else:
+            self.table_query = TableQuery(data)
+            self.table_view.apply_changes(data, changes)
 
-        for col in data.columns:
-            self.data_table.heading(col, text=col, anchor="center")
-            self.data_table.column(col, anchor="center")
-        for index, row in data.iterrows():
-            self.data_table.insert("", "end", values=list(row))
+    #------------------------------ SORT / FILTER ----------------------------------
+
+    def requery(self, data):
+        """Returns a query on new data with the sort and filter of the current one.
+
+        Args:
+            data (DataFrame): The new data, with the columns used by the current query.
+        """
+
+        query = TableQuery(data)
+        if self.table_query is not None:
+            if self.table_query.sort_column is not None:
+                query.sort(self.table_query.sort_column, self.table_query.ascending)
+            query.set_filter(self.table_query.filters)
+        return query
+
+    def show_table_query(self):
+        """Shows the rows of the current sort and filter, marks the sorted column and counts the rows."""
+
+        query = self.table_query
+        self.table_view.set_data(query.data, rows=query.rows())
+        for col in query.data.columns:
+            arrow = ""
+            if col == query.sort_column:
+                arrow = " ▲" if query.ascending else " ▼"
+            self.data_table.heading(col, text=f"{col}{arrow}")
+        if query.filters:
+            self.query_label.configure(text=f"{query.row_count():,} of {len(query.data):,} rows")
+        else:
+            self.query_label.configure(text="")
+
+    def sort_table(self, column):
+        """Sorts the table by a column; clicking the same heading again reverses the order.
+
+        Args:
+            column (str): The column whose heading was clicked.
+        """
+
+        if self.table_query is None:
+            return
+        self.table_query.sort(column)
+        self.show_table_query()
+
+    def apply_table_filter(self):
+        """Shows only the rows that meet the filter typed above the table."""
+
+        if self.table_query is None:
+            return
+        try:
+            self.table_query.set_filter(parse_filters(self.filter_entry.get()))
+        except QueryError as e:
+            messagebox.showerror("Invalid Filter", str(e))
+            return
+        self.show_table_query()
+
+    def clear_table_query(self):
+        """Removes the sort and the filter of the table."""
+
+        if self.table_query is None:
+            return
+        self.filter_entry.delete(0, "end")
+        self.table_query.clear_sort()
+        self.table_query.set_filter(None)
+        self.show_table_query()
+
+    def model_data(self):
+        """Returns the data the model is fitted on: the filtered rows if the user asked for them."""
+
+        if self.use_filtered_rows.get() and self.table_query is not None and self.table_query.filters:
+            return self.table_query.filtered_data()
+        return self.data_table_df
 
     #------------------------- AUXILIAR FUNCTIONS ---------------------------------
 
     def make_new_model_preset(self):
         """Resets the application to the initial state, preparing it for creating a new model."""
-        self.data_table.delete(*self.data_table.get_children())
+        self.full_load = None
+        self.table_query = None
+        self.preprocess = None
+        self.table_view.clear()
+        self.query_label.configure(text="")
+        self.filter_entry.delete(0, "end")
         self.data_table["show"] = "tree"
 
         self.mse_label.configure(text="MSE: None")
@@ -687,6 +1428,8 @@ class GUI:
         self.load_button.configure(state="normal")
         self.preprocess_button.configure(state="disabled")
         self.null_option_menu.configure(state="disabled")
+        self.undo_button.configure(state="disabled")
+        self.redo_button.configure(state="disabled")
         self.constant_entry.configure(state="disabled")
         self.select_columns_button.configure(state="disabled")
         self.select_output_button.configure(state="disabled")
@@ -702,17 +1445,47 @@ class GUI:
             option (str): The selected option for handling null values.
         """
 
-        self.show_loading_screen()
         self.preprocess.handle_null_option(option)
-        self.root.after(500, self.hide_loading_screen)
 
     def preprocess_data(self):
         """Prepares the loaded dataset for further processing, including handling null values."""
 
         self.preprocess = Preprocess(self.data_table_df, self.null_option_menu, self.display_data,
-                                     self.constant_entry, self.select_columns_button, self.select_output_button, self.preprocess_button, self.root)
+                                     self.constant_entry, self.select_columns_button, self.select_output_button, self.preprocess_button, self.root,
+                                     run_task=self.run_data_task, display_changes=self.display_changes,
+                                     replace_data=self.replace_data, undo_button=self.undo_button, redo_button=self.redo_button)
         self.preprocess.preprocess_data()
 
+    def undo_step(self, event=None):
+        """Undoes the last null handling step.
+
+        Args:
+            event (Event, optional): Trigger event (default is None).
+        """
+
+        if self.preprocess is not None:
+            self.preprocess.undo()
+
+    def redo_step(self, event=None):
+        """Redoes the last undone null handling step.
+
+        Args:
+            event (Event, optional): Trigger event (default is None).
+        """
+
+        if self.preprocess is not None:
+            self.preprocess.redo()
+
+    def replace_data(self, data):
+        """Shows the dataset rebuilt by undoing or redoing a row deletion.
+
+        Args:
+            data (DataFrame): The new dataset.
+        """
+
+        self.data_table_df = data
+        self.display_data(data)
+
     def hide_constant_entry(self):
         """Hides the constant entry field for filling missing values."""
 
@@ -728,7 +1501,8 @@ class GUI:
 
         if not self.columns_select:
             self.columns_select = Columns(
-                self.root, self.data_table, self.input_columns_label, self.output_column_label, self.create_model_button,self.predict_button)
+                self.root, self.data_table, self.input_columns_label, self.output_column_label, self.create_model_button,self.predict_button,
+                VirtualTable, get_data=lambda: self.data_table_df)
         self.columns_select.select_columns()
 
     def select_output_column(self):
@@ -740,16 +1514,143 @@ class GUI:
     def get_selected_columns(self):
         """Retrieves the user-selected input and output columns."""
 
+        self.columns_select.sync_columns()
         self.columns_selected = self.columns_select.columns_selected
         self.output_column = self.columns_select.output_column
 
     def create_model(self):
-        """Creates a predictive model using the selected columns and displays the resulting formula."""
+        """Creates a predictive model using the selected columns and displays the resulting formula.
+
+        When the table shows a preview sample, the user chooses between a quick fit
+        on the sample and loading the full dataset to fit the model on it.
+        """
 
         self.get_selected_columns()
+        if not self.choose_encoding():
+            return
+        if self.full_load is not None and self.columns_selected and self.output_column:
+            fit_full_dataset = messagebox.askyesnocancel(
+                "Preview Data",
+                f"The table shows a random sample of {len(self.data_table_df):,} rows.\n\n"
+                "Yes: load the full dataset and fit the model on it.\n"
+                "No: fit a quick preview model on the sample.")
+            if fit_full_dataset is None:
+                return
+            if fit_full_dataset:
+                self.load_in_background(self.full_load_with_preprocessing(), on_done=self.fit_full_dataset)
+                return
+        self.fit_model(self.model_data())
+
+    def choose_encoding(self):
+        """Asks how the selected text input columns are encoded, if there are any.
+
+        Returns:
+            bool: False if the user cancelled the model creation.
+        """
+
+        data = self.data_table_df
+        if data is None or not self.columns_selected:
+            return True
+        text_columns = [col for col in self.columns_selected if col in data.columns and not is_numeric_column(data[col])]
+        if not text_columns:
+            return True
+        one_hot = messagebox.askyesnocancel(
+            "Text Columns",
+            f"These input columns hold text: {', '.join(text_columns)}.\n\n"
+            "Yes: one-hot encode them, with a column per distinct value.\n"
+            "No: ordinal encode them, with the position of each value in sorted order.")
+        if one_hot is None:
+            return False
+        self.encoding = ONE_HOT if one_hot else ORDINAL
+        return True
+
+    def full_load_with_preprocessing(self):
+        """Returns a loader for the full dataset that also replays the preprocessing done on the preview.
+
+        The null handling steps run on the loading thread, right after the data is read.
+        The values they fill the full dataset with are kept in ``full_fill_values``, and the
+        rows still holding nulls in the selected columns in ``full_null_rows``.
+        """
+
+        full_load = self.full_load
+        steps = list(self.preprocess.applied_steps) if self.preprocess is not None else []
+        used_columns = self.columns_selected + [self.output_column]
+        self.full_fill_values = fill_values = {}
+        self.full_null_rows = null_rows = {}
+
+        def load(progress_callback, cancel_event):
+            data, memory_report = full_load(progress_callback, cancel_event)
+            fill_values.update(apply_null_steps(data, steps))
+            null_rows["count"] = int(data[used_columns].isnull().any(axis=1).sum())
+            return data, memory_report
+
+        return load
+
+    def fit_model(self, data, fill_values=None):
+        """Fits the model on the given data with the selected columns.
+
+        The fit runs in the background; the formula is read from the model when predicting.
+        The null handling applied to the data is fitted into an imputer saved with the model.
+
+        Args:
+            data (DataFrame): The data to fit the model on.
+            fill_values (dict, optional): Values the null handling filled ``data`` with.
+                Defaults to the ones recorded by the preprocessing.
+        """
+
+        steps = list(self.preprocess.applied_steps) if self.preprocess is not None else []
+        if fill_values is None:
+            fill_values = self.preprocess.fill_values if self.preprocess is not None else {}
+        fill_values = dict(fill_values)
+        columns = list(self.columns_selected or [])
+        # The statistics of the inputs without nulls are computed over the whole data, so not on the Tk thread
+        fit_imputer = (lambda: Imputer.fit(data, steps, columns, fill_values)) if columns else None
         self.model.create_model(self.columns_selected, self.output_column,
-                                self.data_table_df, self.formula_label, self.mse_label, self.r2_label)
-        self.formula = self.model.model_formula
+                                data, self.formula_label, self.mse_label, self.r2_label, fit_imputer=fit_imputer,
+                                encoding=self.encoding)
+
+    def fit_full_dataset(self, data, memory_report):
+        """Fits the model on the full dataset, once the preprocessing of the preview has been replayed on it.
+
+        The full data then replaces the sample in the table and as the working dataset.
+
+        Args:
+            data (DataFrame): The full dataset.
+            memory_report (DataFrame): Report returned by ``optimize_dtypes``, or None.
+        """
+
+        null_rows = self.full_null_rows.get("count", 0) if self.full_null_rows else 0
+        if null_rows:
+            delete_rows = messagebox.askyesno(
+                "Null Values Detected",
+                f"The full dataset has {null_rows:,} rows with null values in the selected columns "
+                "that were not in the preview.\n\nDelete these rows and fit the model?")
+            if not delete_rows:
+                return
+            used_columns = self.columns_selected + [self.output_column]
+            self.run_data_task(lambda: data.dropna(subset=used_columns, inplace=True),
+                               lambda result: self.use_full_dataset(data))
+            return
+        self.use_full_dataset(data)
+
+    def use_full_dataset(self, data):
+        """Makes the full dataset the working dataset and fits the model on it.
+
+        Args:
+            data (DataFrame): The full dataset, without nulls in the selected columns.
+        """
+
+        self.full_load = None
+        self.data_table_df = data
+        if self.preprocess is not None:
+            # Undoing a step recorded on the preview would bring the sample back
+            self.preprocess.replace_dataset(data, self.full_fill_values)
+        # The sort and filter of the preview carry over to the full data
+        self.table_query = self.requery(data)
+        self.show_table_query()
+        model_data = self.model_data()
+        self.file_path_label.configure(text=f"File loaded: {self._file} (model fitted on {len(model_data):,} of {len(data):,} rows)")
+        self.fit_model(model_data, self.full_fill_values)
 
     def show_model(self):
         """Plots and visualizes the collected information about the created model."""
@@ -764,8 +1665,10 @@ class GUI:
     def make_predictions(self):
         """Performs predictions using the trained model and displays the results."""
 
+        self.formula = self.model.model_formula
         self.predictions = Predictions(
-            self.formula, self.root, self.result_prediction_label)
+            self.formula, self.root, self.result_prediction_label, imputer=self.model.imputer,
+            encoder=self.model.encoder)
         self.predictions.predictions()
 
     def load_model(self):
@@ -773,6 +1676,8 @@ class GUI:
 
         self.model.load_model(self.input_columns_label, self.output_column_label, self.formula_label, self.load_description_label,
                               self.mse_label, self.r2_label, self.result_prediction_label, self.file_path_label, self.data_table)
+        if not self.data_table.get_children():
+            self.table_view.clear()
         self.formula = self.model.model_formula
 
     def save_description(self):
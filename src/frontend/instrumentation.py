@@ -0,0 +1,177 @@
+import functools
+import logging
+import os
+import platform
+import sys
+import time
+import customtkinter as ctk
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+# Set to a file path (or to 1 for the default path) to monitor the event loop and write a report at exit
+PROFILE_ENV_VAR = "TRENDIFY_PROFILE_UI"
+DEFAULT_REPORT_PATH = "trendify_ui_profile.txt"
+SLOW_CALLBACK_MS = 100
+
+
+def report_path_from_env():
+    """Returns the report path requested through ``TRENDIFY_PROFILE_UI``, or None if monitoring is off."""
+
+    value = os.environ.get(PROFILE_ENV_VAR, "").strip()
+    if value in ("", "0"):
+        return None
+    return DEFAULT_REPORT_PATH if value == "1" else value
+
+
+#================================= LATENCYMONITOR ================================
+
+class LatencyMonitor():
+    """Measures how long the Tk event loop is blocked, and by which callbacks.
+
+    A heartbeat is scheduled with ``after`` every ``interval_ms``; the delay
+    between when it was due and when it ran is the event loop lag. Commands
+    wrapped with ``wrap`` are timed, and any beat or callback slower than
+    ``slow_ms`` is logged with its name and duration.
+    """
+
+    def __init__(self, root, interval_ms=50, slow_ms=SLOW_CALLBACK_MS, clock=time.perf_counter):
+        """Initializes the monitor. Call ``start`` to begin the heartbeat.
+
+        Args:
+            root (Tk): The root window whose event loop is measured.
+            interval_ms (int, optional): Time between heartbeats in milliseconds. Defaults to 50.
+            slow_ms (float, optional): Lag or callback duration logged as slow, in milliseconds. Defaults to 100.
+            clock (callable, optional): Returns the current time in seconds. Defaults to ``time.perf_counter``.
+        """
+
+        self.root = root
+        self.interval_ms = interval_ms
+        self.slow_ms = slow_ms
+        self.clock = clock
+        self.started = None
+        self.lags = []
+        self.callbacks = {}
+        self.slow_events = []
+        self._due = None
+        self._after_id = None
+
+    def start(self):
+        """Starts the heartbeat."""
+
+        self.started = self.clock()
+        self._schedule()
+
+    def stop(self):
+        """Stops the heartbeat."""
+
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self):
+        """Schedules the next heartbeat and the time it is due."""
+
+        self._due = self.clock() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _beat(self):
+        """Records how late the heartbeat ran and schedules the next one."""
+
+        lag_ms = max(0.0, (self.clock() - self._due) * 1000)
+        self.lags.append(lag_ms)
+        if lag_ms > self.slow_ms:
+            self._record_slow("event loop blocked", lag_ms)
+        self._schedule()
+
+    def _record_slow(self, name, duration_ms):
+        """Records and logs a callback or heartbeat that took longer than ``slow_ms``."""
+
+        self.slow_events.append((self.clock() - (self.started or 0), name, duration_ms))
+        logger.warning("Slow UI callback: %s took %.0f ms", name, duration_ms)
+
+    #------------------------------- CALLBACKS --------------------------------
+
+    def wrap(self, name, function):
+        """Returns ``function`` timed under ``name``.
+
+        Args:
+            name (str): Name reported for the callback.
+            function (callable): The callback to time.
+        """
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = self.clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                duration_ms = (self.clock() - start) * 1000
+                self.callbacks.setdefault(name, []).append(duration_ms)
+                if duration_ms > self.slow_ms:
+                    self._record_slow(name, duration_ms)
+
+        return timed
+
+    def instrument_commands(self, widget):
+        """Times the command of every button and option menu inside ``widget``.
+
+        Args:
+            widget (Widget): The container whose buttons are timed, searched recursively.
+
+        Returns:
+            int: The number of commands wrapped.
+        """
+
+        wrapped = 0
+        for child in widget.winfo_children():
+            if isinstance(child, (ctk.CTkButton, ctk.CTkOptionMenu)):
+                command = child.cget("command")
+                if command is not None:
+                    name = getattr(command, "__name__", None) or child.cget("text")
+                    child.configure(command=self.wrap(name, command))
+                    wrapped += 1
+            wrapped += self.instrument_commands(child)
+        return wrapped
+
+    #-------------------------------- REPORT ----------------------------------
+
+    def report(self):
+        """Returns a plain-text summary of the event loop lag and the timed callbacks."""
+
+        elapsed = self.clock() - self.started if self.started is not None else 0
+        lines = [
+            "Trendify UI latency report",
+            f"Python {sys.version.split()[0]} on {platform.platform()}, customtkinter {ctk.__version__}",
+            f"Session length: {elapsed:.1f} s",
+            "",
+            f"Event loop lag (heartbeat every {self.interval_ms} ms, {len(self.lags):,} beats)",
+        ]
+        if self.lags:
+            lags = np.array(self.lags)
+            median, p95, p99 = np.percentile(lags, [50, 95, 99])
+            lines.append(f"  median {median:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms, max {lags.max():.1f} ms")
+            lines.append(f"  blocked over {self.slow_ms:g} ms: {int((lags > self.slow_ms).sum())} times")
+
+        lines += ["", "Callbacks, slowest total first", f"  {'name':<28} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+        for name, durations in sorted(self.callbacks.items(), key=lambda item: -sum(item[1])):
+            lines.append(f"  {name:<28} {len(durations):>6} {sum(durations):>10.1f} "
+                         f"{sum(durations) / len(durations):>9.1f} {max(durations):>9.1f}")
+
+        lines += ["", f"Events over {self.slow_ms:g} ms"]
+        for at, name, duration_ms in self.slow_events:
+            lines.append(f"  {at:>8.1f} s  {name:<28} {duration_ms:>9.1f} ms")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, file_path):
+        """Stops the heartbeat and writes the summary to a file.
+
+        Args:
+            file_path (str): Path of the report.
+        """
+
+        self.stop()
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(self.report())
+        logger.info("UI latency report written to %s", file_path)
@@ -0,0 +1,79 @@
+import customtkinter as ctk
+from backend.plotting import ModelFigure
+
+
+#==================================== PLOTVIEW ====================================
+
+class PlotView():
+    """A plot window of the application that is created once and reused by every plot.
+
+    The figure is drawn on a Tk canvas embedded in a CTkToplevel, without pyplot,
+    so no figure is left registered after a plot. Closing the window only hides
+    it; re-plotting updates the artists of the same figure and redraws the canvas.
+    """
+
+    def __init__(self, root, title="Model Plot", figsize=(10, 6)):
+        """Initializes the view. The window is created by the first plot.
+
+        Args:
+            root (Tk): The root window of the application.
+            title (str, optional): Title of the plot window. Defaults to "Model Plot".
+            figsize (tuple, optional): Size of the figure in inches. Defaults to (10, 6).
+        """
+
+        self.root = root
+        self.title = title
+        self.figsize = figsize
+        self.window = None
+        self.canvas = None
+        self.model_figure = None
+
+    def _create_window(self):
+        """Creates the window, the figure and its canvas."""
+
+        # Imported here so matplotlib is only loaded when something is plotted
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+        self.window = ctk.CTkToplevel(self.root)
+        self.window.title(self.title)
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        figure = Figure(figsize=self.figsize)
+        self.canvas = FigureCanvasTkAgg(figure, master=self.window)
+        NavigationToolbar2Tk(self.canvas, self.window)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.model_figure = ModelFigure(figure)
+
+    def plot(self, plot_data, labels, title, suptitle):
+        """Draws a model plot, updating the previous one, and shows the window.
+
+        Args:
+            plot_data (dict): Data returned by ``prepare_plot_data``.
+            labels (tuple): Axis labels, see ``ModelFigure.draw``.
+            title (str): Title of the axes.
+            suptitle (str): Title of the figure.
+        """
+
+        if self.window is None or not self.window.winfo_exists():
+            self._create_window()
+        self.model_figure.draw(plot_data, labels, title, suptitle)
+        self.canvas.draw_idle()
+        self.window.deiconify()
+        self.window.lift()
+
+    def hide(self):
+        """Hides the window; its figure is kept for the next plot."""
+
+        if self.window is not None:
+            self.window.withdraw()
+
+    def close(self):
+        """Destroys the window and frees the figure."""
+
+        if self.window is not None:
+            self.model_figure.figure.clear()
+            self.window.destroy()
+        self.window = None
+        self.canvas = None
+        self.model_figure = None
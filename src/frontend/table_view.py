@@ -0,0 +1,215 @@
+import numpy as np
+from frontend.formatting import CellFormatter
+
+
+#================================== VIRTUALTABLE ==================================
+
+class VirtualTable():
+    """Shows a DataFrame in a ttk.Treeview by rendering only the rows that fit on screen.
+
+    The tree holds one item per visible row. Scrolling never inserts or deletes
+    items: it changes which slice of the DataFrame the existing items show, so
+    opening a dataset costs the same whatever its number of rows. The vertical
+    scrollbar is driven by the position in the DataFrame, not by the tree.
+    Cells are shown as strings from a ``CellFormatter``, so each block of a
+    column is converted once and reused on every redraw.
+    """
+
+    def __init__(self, treeview, scrollbar, rowheight=25, scroll_units=3, formatter=None, on_heading=None):
+        """Initializes the table and takes over vertical scrolling of the tree.
+
+        Args:
+            treeview (ttk.Treeview): The tree used to display the rows.
+            scrollbar (ttk.Scrollbar): The vertical scrollbar of the tree.
+            rowheight (int, optional): Height of a tree row in pixels. Defaults to 25.
+            scroll_units (int, optional): Rows scrolled per mouse wheel step. Defaults to 3.
+            formatter (CellFormatter, optional): Turns cells into display strings. Defaults to a new one.
+            on_heading (callable, optional): Called with the column name when a heading is clicked.
+        """
+
+        self.treeview = treeview
+        self.scrollbar = scrollbar
+        self.rowheight = rowheight
+        self.scroll_units = scroll_units
+        self.formatter = formatter or CellFormatter()
+        self.on_heading = on_heading
+        self.data = None
+        self.rows = None
+        self.first_row = 0
+        self.visible_rows = 30
+        self._arrays = []
+        self._items = []
+
+        self.scrollbar.config(command=self.yview)
+        self.treeview.configure(yscrollcommand="")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.treeview.bind(sequence, self.on_mousewheel)
+        self.treeview.bind("<Prior>", lambda event: self.yview("scroll", -1, "pages"))
+        self.treeview.bind("<Next>", lambda event: self.yview("scroll", 1, "pages"))
+        self.treeview.bind("<Configure>", self.on_resize)
+
+    #--------------------------------- DATA ------------------------------------
+
+    def set_data(self, data, rows=None):
+        """Shows a DataFrame from its first row.
+
+        Only references to the column arrays are kept; no row is copied or
+        converted until it scrolls into view.
+
+        Args:
+            data (DataFrame): The data to display.
+            rows (ndarray, optional): Positions of the rows to show, in order, for a sorted or
+                filtered view (see ``TableQuery``). Defaults to every row as it is.
+        """
+
+        same_columns = self.data is not None and data.columns.equals(self.data.columns)
+        self.data = data
+        self.rows = rows
+        self._arrays = [data.iloc[:, position].array for position in range(data.shape[1])]
+        self.first_row = 0
+        self.formatter.clear()
+
+        if not same_columns:
+            self.treeview["columns"] = list(data.columns)
+            for col in data.columns:
+                command = (lambda col=col: self.on_heading(col)) if self.on_heading is not None else ""
+                self.treeview.heading(col, text=col, anchor="center", command=command)
+                self.treeview.column(col, anchor="center")
+        self.render()
+
+    def apply_changes(self, data, changes):
+        """Patches the displayed rows after an operation changed the data in place.
+
+        Filled cells are rewritten only where they are on screen. Dropped rows
+        shift the window so it keeps showing the same rows where possible, and
+        only the visible items are refilled. The cost follows the number of
+        changed cells and visible rows, not the size of the data.
+
+        Args:
+            data (DataFrame): The data after the change; the same columns as the displayed data.
+            changes (ChangeSet): The cells filled and the rows dropped, by position before the change.
+        """
+
+        if self.data is None or self.rows is not None or not data.columns.equals(self.data.columns):
+            self.set_data(data)
+            return
+
+        self.data = data
+        if len(changes.dropped_rows):
+            # Dropping rows replaces every column, and the rows above the window shift it up
+            self._arrays = [data.iloc[:, position].array for position in range(data.shape[1])]
+            self.first_row -= int(np.searchsorted(changes.dropped_rows, self.first_row))
+            self.render()
+            return
+
+        start, stop = self.first_row, self.first_row + len(self._items)
+        for col, rows in changes.filled_cells.items():
+            position = data.columns.get_loc(col)
+            array = self._arrays[position] = data.iloc[:, position].array
+            # A nullable column can be filled in place, keeping the array the strings were cached for
+            self.formatter.invalidate(col)
+            first, last = np.searchsorted(rows, [start, stop])
+            for row in rows[first:last]:
+                self.treeview.set(self._items[row - start], col, self.formatter.format(col, array, row, row + 1)[0])
+
+    def clear(self):
+        """Removes the data and every row from the tree."""
+
+        self.data = None
+        self.rows = None
+        self._arrays = []
+        self._items = []
+        self.first_row = 0
+        self.formatter.clear()
+        self.treeview.delete(*self.treeview.get_children())
+        self.scrollbar.set(0, 1)
+
+    def row_at(self, y):
+        """Returns the position in the data of the row shown at a height of the tree, or None.
+
+        Args:
+            y (int): Vertical position in the tree, in pixels.
+        """
+
+        item = self.treeview.identify_row(y)
+        if item not in self._items:
+            return None
+        return self.first_row + self._items.index(item)
+
+    def row_count(self):
+        """Returns the number of rows in the displayed DataFrame."""
+
+        if self.data is None:
+            return 0
+        return len(self.data) if self.rows is None else len(self.rows)
+
+    #-------------------------------- RENDERING --------------------------------
+
+    def _resize_items(self, count):
+        """Adds or removes tree items so there is one per visible row."""
+
+        while len(self._items) < count:
+            self._items.append(self.treeview.insert("", "end", values=()))
+        while len(self._items) > count:
+            self.treeview.delete(self._items.pop())
+
+    def render(self):
+        """Fills the tree items with the rows starting at ``first_row`` and updates the scrollbar."""
+
+        total = self.row_count()
+        count = min(self.visible_rows, total)
+        self.first_row = max(0, min(self.first_row, total - count))
+        self._resize_items(count)
+
+        stop = self.first_row + count
+        columns = [self.formatter.format(col, array, self.first_row, stop, self.rows)
+                   for col, array in zip(self.data.columns, self._arrays)] if total else []
+        for item, values in zip(self._items, zip(*columns)):
+            self.treeview.item(item, values=values)
+
+        if total:
+            self.scrollbar.set(self.first_row / total, stop / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    #-------------------------------- SCROLLING --------------------------------
+
+    def yview(self, *args):
+        """Scrolls the table; used as the scrollbar command.
+
+        Args:
+            *args: ``("moveto", fraction)`` or ``("scroll", count, "units" | "pages")``.
+        """
+
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.first_row = int(float(args[1]) * self.row_count())
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.first_row += int(args[1]) * step
+        self.render()
+
+    def on_mousewheel(self, event):
+        """Scrolls by ``scroll_units`` rows per mouse wheel step.
+
+        Args:
+            event (Event): The mouse wheel event (``<Button-4>``/``<Button-5>`` on X11).
+        """
+
+        direction = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        self.yview("scroll", direction * self.scroll_units, "units")
+        return "break"
+
+    def on_resize(self, event):
+        """Renders as many rows as fit in the new height of the tree.
+
+        Args:
+            event (Event): The configure event of the tree.
+        """
+
+        # One row's worth of height is taken by the headings
+        visible_rows = max(1, event.height // self.rowheight - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
@@ -1,8 +1,14 @@
+import logging
 import customtkinter as ctk
 from frontend.gui import GUI
+from frontend.instrumentation import report_path_from_env
 
 if __name__ == "__main__":
+    profile_report = report_path_from_env()
+    if profile_report:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     root = ctk.CTk()
-    app = GUI(root)
+    app = GUI(root, profile_report=profile_report)
     root.after(100, app.show_welcome_message)
+    root.after(100, app.preload_modules)
     root.mainloop()
\ No newline at end of file
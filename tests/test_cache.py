@@ -0,0 +1,71 @@
+import os
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+from backend.cache import DatasetCache
+from backend.read_file import DataImport
+
+pytest.importorskip("pyarrow")
+
+@pytest.fixture
+def csv_file(tmpdir):
+    """Writes a small CSV file."""
+    file_path = str(tmpdir.join("data.csv"))
+    pd.DataFrame({"x": [1, 2, 3], "y": [4.0, 5.5, 6.0], "name": ["a", "b", "c"]}).to_csv(file_path, index=False)
+    return file_path
+
+@pytest.fixture
+def cache(tmpdir):
+    return DatasetCache(cache_dir=str(tmpdir.join("cache")))
+
+def test_cache_hit_skips_parsing(csv_file, cache):
+    """Test that the second load of an unchanged file is served from the cache."""
+    first = DataImport(csv_file, cache=cache)
+    first_data = first.load_with_cache(first.load_csv)
+
+    loader = Mock()
+    cached_data = DataImport(csv_file, cache=cache).load_with_cache(loader)
+
+    loader.assert_not_called()
+    pd.testing.assert_frame_equal(cached_data, first_data)
+
+def test_cache_invalidated_when_source_changes(csv_file, cache):
+    """Test that a modified file is parsed again and its old entry is removed."""
+    cache.store(csv_file, pd.read_csv(csv_file))
+    old_entry = cache.entry_path(csv_file)
+
+    pd.DataFrame({"x": [10, 20]}).to_csv(csv_file, index=False)
+    stat = os.stat(csv_file)
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.load(csv_file) is None
+    assert not os.path.exists(old_entry), "The stale entry should have been deleted."
+
+def test_cache_options_are_part_of_the_key(csv_file, cache):
+    """Test that different reader options do not share an entry."""
+    cache.store(csv_file, pd.read_csv(csv_file), {"columns": ["x"]})
+
+    assert cache.load(csv_file, {"columns": ["y"]}) is None
+    assert cache.load(csv_file, {"columns": ["x"]}) is not None
+
+def test_cache_lru_eviction(tmpdir, cache):
+    """Test that the least recently used entry is evicted when the cache is full."""
+    paths = []
+    for name in ("a", "b", "c"):
+        file_path = str(tmpdir.join(f"{name}.csv"))
+        pd.DataFrame({"x": range(100)}).to_csv(file_path, index=False)
+        paths.append(file_path)
+
+    cache.store(paths[0], pd.read_csv(paths[0]))
+    cache.store(paths[1], pd.read_csv(paths[1]))
+    entry_size = os.path.getsize(cache.entry_path(paths[0]))
+    cache.max_bytes = 2 * entry_size
+
+    os.utime(cache.entry_path(paths[0]), (1, 1))
+    os.utime(cache.entry_path(paths[1]), (2, 2))
+    cache.load(paths[0])
+    cache.store(paths[2], pd.read_csv(paths[2]))
+
+    assert cache.load(paths[1]) is None, "The least recently used entry should have been evicted."
+    assert cache.load(paths[0]) is not None
+    assert cache.load(paths[2]) is not None
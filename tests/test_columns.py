@@ -0,0 +1,72 @@
+import re
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+from backend.columns import ColumnList, Columns
+from backend.dtypes import column_kind
+
+@pytest.fixture
+def sensor_columns():
+    """Returns a ColumnList over 3,000 sensor columns and two others."""
+    names = [f"sensor_{i:04d}" for i in range(3000)] + ["Site", "timestamp"]
+    kinds = ["Numeric"] * 3000 + ["Text", "Other"]
+    return ColumnList(names, kinds)
+
+def test_substring_search_ignores_case(sensor_columns):
+    """Test that a plain search keeps the names containing the text."""
+    sensor_columns.set_filter("SENSOR_000")
+    assert sensor_columns.matching() == [f"sensor_{i:04d}" for i in range(10)]
+
+    sensor_columns.set_filter("site")
+    assert sensor_columns.matching() == ["Site"]
+
+def test_regex_and_kind_filters(sensor_columns):
+    """Test that regular expressions and kinds narrow the list together."""
+    sensor_columns.set_filter(r"_(1|2)\d99$", regex=True)
+    assert sensor_columns.matching() == [f"sensor_{i}99" for i in range(10, 30)]
+
+    sensor_columns.set_filter("", kind="Text")
+    assert sensor_columns.matching() == ["Site"]
+
+    with pytest.raises(re.error):
+        sensor_columns.set_filter("sensor_(", regex=True)
+
+def test_select_all_matching(sensor_columns):
+    """Test that selecting the matching columns keeps the earlier selection and dataset order."""
+    sensor_columns.toggle("timestamp")
+    sensor_columns.set_filter("sensor_29")
+    sensor_columns.select_matching()
+
+    assert len(sensor_columns.selected()) == 101
+    assert sensor_columns.selected()[-1] == "timestamp"
+    assert sensor_columns.view()["✓"].eq("✓").all()
+
+    sensor_columns.select_matching(False)
+    assert sensor_columns.selected() == ["timestamp"]
+
+def test_single_selection():
+    """Test that an output column list keeps at most one selected column."""
+    columns = ColumnList(["x", "y", "z"], multiple=False, selected=["x"])
+    columns.toggle("z")
+    assert columns.selected() == ["z"]
+    columns.toggle("z")
+    assert columns.selected() == []
+
+def test_column_kind():
+    """Test the kinds used by the picker's type filter."""
+    data = pd.DataFrame({"n": [1.0], "t": ["a"], "c": pd.Categorical(["a"]), "b": [True], "d": pd.to_datetime(["2024-01-01"])})
+    assert [column_kind(data[col]) for col in data] == ["Numeric", "Text", "Text", "Other", "Other"]
+
+def test_selection_is_cleared_when_another_dataset_is_loaded():
+    """Test that columns picked in a previous file are not preselected in the next one."""
+    data_table = {"columns": ("x", "y", "z")}
+    columns = Columns(Mock(), data_table, Mock(), Mock(), Mock(), Mock(), Mock())
+    columns.columns_selected = ["x", "y"]
+    columns.output_column = "z"
+
+    columns.sync_columns()
+    assert columns.columns_selected == ["x", "y"] and columns.output_column == "z"
+
+    data_table["columns"] = ("a", "b")
+    columns.sync_columns()
+    assert columns.columns_selected == [] and columns.output_column is None
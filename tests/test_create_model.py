@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 import pytest
 from unittest.mock import Mock, patch
 from backend.model import Model
@@ -47,3 +50,25 @@ def test_create_model(setup_model):
     setup_model.create_model(["x1", "x2"], "y", data_table, Mock(), Mock(), Mock())
 
     assert setup_model.model is not None, "Model was not created."
+
+def test_startup_does_not_import_modelling_libraries():
+    """Test that opening the GUI module leaves scikit-learn, matplotlib and joblib for later."""
+    code = ("import sys, frontend.gui; "
+            "assert not {'sklearn', 'matplotlib', 'joblib'} & set(sys.modules), sorted(sys.modules)")
+    src = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": src})
+
+@patch("backend.model.messagebox", Mock())
+def test_imputer_is_fitted_by_the_fit_task(setup_model):
+    """Test that an imputer computing statistics over the data is built in the task, not by the caller."""
+    tasks = []
+    setup_model.run_task = lambda work, on_done, on_error: tasks.append((work, on_done))
+    data_table = pd.DataFrame({"x1": [1.0, 2.0, 3.0], "y": [2.0, 4.0, 6.0]})
+    fit_imputer = Mock(return_value="imputer")
+
+    setup_model.create_model(["x1"], "y", data_table, Mock(), Mock(), Mock(), fit_imputer=fit_imputer)
+    fit_imputer.assert_not_called()
+
+    work, on_done = tasks[0]
+    on_done(work())
+    assert setup_model.imputer == "imputer"
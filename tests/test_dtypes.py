@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock, patch
+from backend.dtypes import optimize_dtypes, format_memory_report, is_numeric_column
+from backend.model import Model
+
+@pytest.fixture
+def wide_data():
+    return pd.DataFrame({
+        "small_int": np.arange(1000, dtype=np.int64) % 100,
+        "negative_int": np.arange(1000, dtype=np.int64) - 500,
+        "exact_float": np.arange(1000, dtype=np.float64) / 4,
+        "precise_float": np.arange(1000, dtype=np.float64) / 3,
+        "city": ["Madrid", "Paris", "Rome", "Oslo"] * 250,
+        "identifier": [f"id-{i}" for i in range(1000)],
+        "flag": [True, False] * 500
+    })
+
+def test_optimize_dtypes_downcasts_safely(wide_data):
+    """Test that each column gets the smallest dtype that keeps its values."""
+    optimized, report = optimize_dtypes(wide_data)
+
+    assert optimized["small_int"].dtype == np.uint8
+    assert optimized["negative_int"].dtype == np.int16
+    assert optimized["exact_float"].dtype == np.float32
+    assert optimized["precise_float"].dtype == np.float64, "Floats that lose precision must not be downcast."
+    assert isinstance(optimized["city"].dtype, pd.CategoricalDtype)
+    assert optimized["identifier"].dtype == object, "High-cardinality text should stay as text."
+    assert optimized["flag"].dtype == bool
+    pd.testing.assert_frame_equal(optimized.astype(wide_data.dtypes.to_dict()), wide_data)
+
+    assert list(report["column"]) == list(wide_data.columns)
+    assert report["bytes_after"].sum() < report["bytes_before"].sum()
+    assert "saved" in format_memory_report(report)
+
+def test_text_with_nulls_is_not_categorical():
+    """Test that text columns with missing values stay fillable with any constant."""
+    optimized, _ = optimize_dtypes(pd.DataFrame({"city": ["a", None, "a", "b"] * 10}))
+
+    assert optimized["city"].dtype == object
+
+def test_all_null_nullable_integer_column_is_left_unchanged():
+    """Test that an Int64 column with only missing values does not stop the optimization."""
+    optimized, report = optimize_dtypes(pd.DataFrame({"empty": pd.array([None, None], dtype="Int64"), "x": [1, 2]}))
+
+    assert optimized["empty"].dtype == "Int64"
+    assert optimized["empty"].isna().all()
+    assert report["dtype_after"].tolist() == ["Int64", "uint8"]
+
+def test_is_numeric_column():
+    assert is_numeric_column(pd.Series([1, 2], dtype=np.int8))
+    assert is_numeric_column(pd.Series([1, None], dtype="Int64"))
+    assert not is_numeric_column(pd.Series([True, False]))
+    assert not is_numeric_column(pd.Series(["a", "b"]))
+
+@patch("tkinter.messagebox.showinfo", Mock())
+def test_create_model_on_downcast_columns():
+    """Test that downcast columns are fitted as float64."""
+    model = Model(*[Mock() for _ in range(13)])
+    data, _ = optimize_dtypes(pd.DataFrame({"x": [1, 2, 3, 4], "y": [2.5, 4.5, 6.5, 8.5]}))
+
+    model.create_model(["x"], "y", data, Mock(), Mock(), Mock())
+
+    assert model.model.coef_.dtype == np.float64
+    assert model.model.coef_[0] == pytest.approx(2.0)
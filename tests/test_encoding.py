@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import Mock, patch
+from backend.encoding import ORDINAL, Encoder
+from backend.model import Model
+from backend.predictions import Predictions, score
+from backend.preprocess import Imputer
+
+@pytest.fixture
+def data_with_text():
+    """Returns a DataFrame whose output depends on a numeric and a text column."""
+    return pd.DataFrame({
+        "x": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        "city": ["b", "a", "c", "a", "b", "c"],
+        "y": [12.0, 4.0, 26.0, 8.0, 20.0, 32.0]
+    })
+
+def test_one_hot_encoding_is_sparse_and_keeps_the_vocabulary(data_with_text):
+    """Test that text columns become one sparse column per level, in sorted order."""
+    encoder = Encoder.fit(data_with_text, ["x", "city"])
+
+    X, complete = encoder.transform(data_with_text)
+
+    assert encoder.categories == {"city": ["a", "b", "c"]}
+    assert encoder.feature_names() == ["x", "city=a", "city=b", "city=c"]
+    assert X.format == "csr" and complete.all()
+    assert X.toarray()[:2].tolist() == [[1.0, 0.0, 1.0, 0.0], [2.0, 1.0, 0.0, 0.0]]
+
+def test_unknown_levels_and_nulls(data_with_text):
+    """Test that unseen levels are all-zero rows in one-hot and leave ordinal rows without a value."""
+    new_data = pd.DataFrame({"x": [1.0, np.nan, 3.0], "city": ["z", "a", None]})
+
+    X, complete = Encoder.fit(data_with_text, ["x", "city"]).transform(new_data, Imputer(["x"], {"x": 9.0}))
+    assert complete.all()
+    assert X.toarray().tolist() == [[1.0, 0.0, 0.0, 0.0], [9.0, 1.0, 0.0, 0.0], [3.0, 0.0, 0.0, 0.0]]
+
+    X, complete = Encoder.fit(data_with_text, ["x", "city"], ORDINAL).transform(new_data)
+    assert complete.tolist() == [False, False, False]
+    assert X.shape == (0, 2)
+
+    with pytest.raises(ValueError):
+        Encoder(["x"], encoding="target")
+
+@patch("backend.model.messagebox", Mock())
+def test_model_fits_text_columns_and_saves_the_encoder(data_with_text):
+    """Test that a model with a text input is fitted on the encoded data and scores new rows."""
+    model = Model(*[Mock() for _ in range(13)])
+
+    model.create_model(["x", "city"], "y", data_with_text, Mock(), Mock(), Mock())
+
+    assert model.encoder.categories == {"city": ["a", "b", "c"]}
+    assert model.model_metrics["r2"] > 0.99
+    assert len(model.model_formula["coefficients"]) == 4
+    model_data = {"model": model.model, "input_columns": ["x", "city"], "encoder": model.encoder}
+    new_data = pd.DataFrame({"x": [2.0, 2.0], "city": ["b", "c"]}, index=[5, 7])
+    np.testing.assert_allclose(score(model_data, new_data), model.model.predict(model.encoder.transform(new_data)[0]))
+
+    predictions = Predictions(model.model_formula, Mock(), Mock(), encoder=model.encoder)
+    predictions.coefficients = model.model_formula["coefficients"]
+    predictions.formula_intercept = model.model_formula["intercept"]
+    predictions.columns = ["x", "city"]
+    predictions.column_vars = {"x": Mock(get=lambda: "2"), "city": Mock(get=lambda: "b")}
+    predictions.result_var = Mock()
+    predictions.calculate_prediction()
+    predictions.result_var.set.assert_called_with(f"{score(model_data, new_data)[0]:.4f}")
+
+def test_high_cardinality_columns_stay_sparse():
+    """Test that a column with 10,000 levels gives a design matrix with one stored value per row."""
+    levels = np.arange(20_000) % 10_000
+    data = pd.DataFrame({"id": [f"id{level}" for level in levels]})
+
+    X, _ = Encoder.fit(data, ["id"]).transform(data)
+
+    assert X.shape == (20_000, 10_000)
+    assert X.nnz == 20_000
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from frontend import formatting
+from frontend.formatting import CellFormatter, format_values
+
+def test_format_values_by_dtype():
+    """Test that floats get a fixed precision and missing values become empty cells."""
+    assert format_values(pd.array([1.5, np.nan, 3.0], dtype="float32")).tolist() == ["1.5000", "", "3.0000"]
+    assert format_values(pd.array([1, None, 3], dtype="Int64"), precision=2).tolist() == ["1", "", "3"]
+    assert format_values(pd.Categorical(["a", None])).tolist() == ["a", ""]
+    assert format_values(np.array([0.123456]), precision=2).tolist() == ["0.12"]
+
+def test_formatter_caches_blocks_until_the_column_changes():
+    """Test that each block is formatted once and formatted again only for a new array."""
+    formatter = CellFormatter(precisions={"x": 1}, block_size=10)
+    array = pd.array(np.arange(100, dtype=float))
+
+    with patch.object(formatting, "format_values", wraps=format_values) as spy:
+        assert formatter.format("x", array, 5, 15) == [f"{row}.0" for row in range(5, 15)]
+        assert formatter.format("x", array, 8, 12) == ["8.0", "9.0", "10.0", "11.0"]
+        assert spy.call_count == 2
+
+        formatter.format("x", pd.array(np.arange(100, dtype=float)), 5, 6)
+        assert spy.call_count == 3
+
+        formatter.set_precision("x", 3)
+        assert formatter.format("x", array, 0, 1) == ["0.000"]
+        assert spy.call_count == 4
+
+def test_formatter_follows_the_row_order():
+    """Test that a sorted or filtered view formats the rows at the given positions."""
+    formatter = CellFormatter(block_size=2)
+    array = pd.array(np.arange(10, dtype=float))
+    rows = np.array([9, 3, 5])
+
+    assert formatter.format("x", array, 0, 3, rows) == ["9.0000", "3.0000", "5.0000"]
+    assert formatter.format("x", array, 0, 2) == ["0.0000", "1.0000"], "A new order drops the cached strings."
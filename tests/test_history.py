@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+from backend.history import History
+from backend.preprocess import Preprocess, fill_nulls
+
+@pytest.fixture
+def data_with_nulls():
+    """Returns a DataFrame with nulls in float, nullable integer and text columns."""
+    return pd.DataFrame({
+        "x": [1.0, np.nan, 3.0, 10.0, np.nan],
+        "count": pd.array([1, None, 2, 2, 5], dtype="Int64"),
+        "label": ["a", None, "b", "c", "d"]
+    }, index=[10, 11, 12, 13, 14])
+
+@pytest.mark.parametrize("option", ["Fill with mean", "Fill with median", "Fill with constant", "Delete rows with nulls"])
+def test_undo_and_redo_round_trip(data_with_nulls, option):
+    """Test that undo restores the data exactly and redo gives the result of the step again."""
+    original = data_with_nulls.copy()
+    expected = data_with_nulls.copy()
+    fill_nulls(expected, option, 2.0)
+    history = History(fill_nulls)
+
+    history.apply(data_with_nulls, option, 2.0)
+    data, _ = history.undo(data_with_nulls)
+    pd.testing.assert_frame_equal(data, original)
+
+    data, delta = history.redo(data)
+    pd.testing.assert_frame_equal(data, expected)
+    assert delta.step == (option, 2.0)
+    assert history.can_undo() and not history.can_redo()
+
+def test_a_fill_delta_stores_positions_not_a_copy_of_the_data():
+    """Test that a fill delta grows with the filled cells, not with the size of the data."""
+    data = pd.DataFrame(np.random.default_rng(0).normal(size=(100_000, 10)))
+    data.iloc[::1000, 3] = np.nan
+    history = History(fill_nulls)
+
+    history.apply(data, "Fill with mean")
+
+    assert history.nbytes() < 1000 < data.memory_usage().sum()
+
+def test_oldest_steps_are_forgotten_over_the_memory_budget(data_with_nulls):
+    """Test that the history drops its oldest steps to stay under its memory budget."""
+    history = History(fill_nulls, max_bytes=0)
+    history.apply(data_with_nulls, "Fill with median")
+    assert not history.can_undo()
+
+    history = History(fill_nulls)
+    history.apply(data_with_nulls, "Fill with constant", 1.0)
+    history.undo(data_with_nulls)
+    history.apply(data_with_nulls, "Fill with mean")
+    assert not history.can_redo(), "A new step forgets the undone ones."
+    with pytest.raises(IndexError):
+        history.redo(data_with_nulls)
+
+def test_preprocess_undo_updates_the_steps_and_the_displayed_data(data_with_nulls):
+    """Test that undoing and redoing in Preprocess keeps the replayed steps and the shown data in sync."""
+    replace_data = Mock()
+    display_changes = Mock()
+    undo_button, redo_button = Mock(), Mock()
+    preprocess = Preprocess(data_with_nulls, Mock(), Mock(), Mock(), Mock(), Mock(), Mock(), Mock(),
+                            display_changes=display_changes, replace_data=replace_data,
+                            undo_button=undo_button, redo_button=redo_button)
+
+    preprocess.apply_step("Fill with mean")
+    preprocess.apply_step("Delete rows with nulls")
+    assert len(preprocess.data_table_df) == 4
+
+    preprocess.undo()
+    assert preprocess.applied_steps == [("Fill with mean", None)]
+    assert len(preprocess.data_table_df) == 5
+    replace_data.assert_called_once_with(preprocess.data_table_df)
+
+    preprocess.undo()
+    assert preprocess.applied_steps == [] and preprocess.fill_values == {}
+    assert preprocess.data_table_df["x"].isnull().sum() == 2
+    display_changes.assert_called_once()
+    undo_button.configure.assert_called_with(state="disabled")
+
+    preprocess.redo()
+    assert preprocess.applied_steps == [("Fill with mean", None)]
+    assert preprocess.fill_values == {"x": 4.6667, "count": 2.5}
+    redo_button.configure.assert_called_with(state="normal")
+
+def test_replacing_the_dataset_clears_the_history(data_with_nulls):
+    """Test that the history of a preview is not undone on the full dataset that replaced it."""
+    undo_button = Mock()
+    preprocess = Preprocess(data_with_nulls.iloc[:3].copy(), Mock(), Mock(), Mock(), Mock(), Mock(), Mock(), Mock(),
+                            undo_button=undo_button)
+    preprocess.apply_step("Delete rows with nulls")
+
+    full_data = data_with_nulls.dropna()
+    preprocess.replace_dataset(full_data, {"x": 1.0})
+    preprocess.undo()
+
+    assert preprocess.data_table_df is full_data
+    assert preprocess.applied_steps == [("Delete rows with nulls", None)]
+    assert preprocess.fill_values == {"x": 1.0}
+    undo_button.configure.assert_called_with(state="disabled")
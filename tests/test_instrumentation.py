@@ -0,0 +1,82 @@
+import logging
+import customtkinter as ctk
+import pytest
+from unittest.mock import Mock
+from frontend.instrumentation import LatencyMonitor, report_path_from_env
+
+class FakeClock():
+    """A clock the test moves forward by hand."""
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def monitor():
+    """Returns a monitor on a mocked root that keeps the scheduled heartbeat."""
+    root = Mock()
+    root.after.side_effect = lambda delay, callback: setattr(root, "pending", callback) or "after#1"
+    return LatencyMonitor(root, interval_ms=50, slow_ms=100, clock=FakeClock())
+
+def test_heartbeat_measures_event_loop_lag(monitor, caplog):
+    """Test that a late heartbeat is recorded as lag and logged when over the threshold."""
+    monitor.start()
+    monitor.clock.now += 0.052
+    monitor.root.pending()
+    monitor.clock.now += 0.350
+    with caplog.at_level(logging.WARNING):
+        monitor.root.pending()
+
+    assert monitor.lags == pytest.approx([2.0, 300.0])
+    assert "event loop blocked took 300 ms" in caplog.text
+    monitor.stop()
+    monitor.root.after_cancel.assert_called_once_with("after#1")
+
+def test_wrapped_callbacks_are_timed(monitor, caplog):
+    """Test that wrapped commands keep their result and report slow calls by name."""
+    def load_file():
+        monitor.clock.now += 0.25
+        return "loaded"
+
+    timed = monitor.wrap("load_file", load_file)
+    with caplog.at_level(logging.WARNING):
+        assert timed() == "loaded"
+    monitor.wrap("show_model", lambda: None)()
+
+    assert monitor.callbacks["load_file"] == pytest.approx([250.0])
+    assert [event[1] for event in monitor.slow_events] == ["load_file"]
+    assert "load_file took 250 ms" in caplog.text
+
+def test_report_lists_slowest_callbacks_first(monitor, tmpdir):
+    """Test the summary written at exit."""
+    monitor.start()
+    monitor.callbacks = {"show_model": [5.0], "load_file": [250.0, 150.0]}
+    report_file = tmpdir.join("report.txt")
+
+    monitor.write_report(str(report_file))
+
+    report = report_file.read()
+    assert report.index("load_file") < report.index("show_model")
+    assert "400.0" in report and "Event loop lag" in report
+
+def test_instrument_commands_wraps_sidebar_buttons(monitor):
+    """Test that buttons found in nested frames get timed commands."""
+    def load_file():
+        pass
+    button = Mock(spec=ctk.CTkButton)
+    button.cget.return_value = load_file
+    button.winfo_children.return_value = []
+    frame = Mock()
+    frame.winfo_children.return_value = [button]
+    sidebar = Mock()
+    sidebar.winfo_children.return_value = [frame]
+
+    assert monitor.instrument_commands(sidebar) == 1
+    button.configure.call_args.kwargs["command"]()
+    assert list(monitor.callbacks) == ["load_file"]
+
+@pytest.mark.parametrize("value, path", [("", None), ("0", None), ("1", "trendify_ui_profile.txt"), ("ui.txt", "ui.txt")])
+def test_opt_in_through_environment(monkeypatch, value, path):
+    """Test that monitoring is off unless the environment variable is set."""
+    monkeypatch.setenv("TRENDIFY_PROFILE_UI", value)
+    assert report_path_from_env() == path
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from sklearn.linear_model import LinearRegression
+from backend.model import prepare_plot_data
+from backend.plotting import ModelFigure
+
+def plot_data(columns, rows, point_limit=1000, seed=0):
+    """Returns the plot data of a model fitted on random data."""
+    rng = np.random.default_rng(seed)
+    X = rng.random((rows, columns))
+    y = X.sum(axis=1) + rng.normal(scale=0.1, size=rows)
+    return prepare_plot_data(LinearRegression().fit(X, y), X, y, point_limit=point_limit)
+
+@pytest.fixture
+def model_figure():
+    """Returns a ModelFigure on a figure that is not registered with pyplot."""
+    return ModelFigure(Figure())
+
+def test_replotting_updates_the_same_artists(model_figure):
+    """Test that a new 2D plot of the same kind reuses the axes, points and line."""
+    model_figure.draw(plot_data(1, 100), ("x", "y"), "2D", "first")
+    axes, points, line = model_figure.axes, model_figure.artists["data"], model_figure.artists["fit"]
+
+    model_figure.draw(plot_data(1, 200, seed=1), ("x", "y"), "2D", "second")
+
+    assert model_figure.axes is axes and model_figure.artists["data"] is points and model_figure.artists["fit"] is line
+    assert len(points.get_offsets()) == 200
+    assert model_figure.figure._suptitle.get_text() == "second"
+    assert len(model_figure.figure.axes) == 1
+
+@pytest.mark.parametrize("columns, rows", [(1, 5000), (2, 5000)])
+def test_replotting_does_not_accumulate_artists(model_figure, columns, rows):
+    """Test that replaced artists are removed, so repeated plots keep the figure the same size."""
+    labels = ("x", "y") if columns == 1 else ("x1", "x2", "y")
+    for seed in range(5):
+        model_figure.draw(plot_data(columns, rows, seed=seed), labels, "plot", "formula")
+
+    assert len(model_figure.axes.collections) == columns, "The density grid, or the 3D points and plane."
+    assert len(model_figure.figure.axes) == 3 - columns, "The axes and, for a density grid, its colorbar."
+
+def test_changing_kind_clears_the_figure(model_figure):
+    """Test that switching from a 3D to a 2D plot starts from a clean figure."""
+    model_figure.draw(plot_data(2, 100), ("x1", "x2", "y"), "3D", "formula")
+    model_figure.draw(plot_data(1, 100), ("x", "y"), "2D", "formula")
+
+    assert model_figure.kind == "points"
+    assert len(model_figure.figure.axes) == 1 and model_figure.axes.name == "rectilinear"
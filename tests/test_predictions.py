@@ -1,6 +1,9 @@
+import numpy as np
+import pandas as pd
 import pytest
 from unittest.mock import Mock,patch
-from backend.predictions import Predictions
+from backend.predictions import Predictions, score
+from backend.preprocess import Imputer
 
 @pytest.fixture
 def setup_predictions_logic():
@@ -34,4 +37,29 @@ def test_calculate_prediction_valid_input_logic(setup_predictions_logic):
     predictions.column_vars = {'x1': Mock(get=lambda: "3")} 
     predictions.result_var = Mock() 
     predictions.calculate_prediction()
-    predictions.result_var.set.assert_called_with("11.0000")
\ No newline at end of file
+    predictions.result_var.set.assert_called_with("11.0000")
+
+def test_empty_input_is_filled_by_the_imputer(setup_predictions_logic):
+    """Test that a value left empty is filled like the model's preprocessing did."""
+    predictions = setup_predictions_logic
+    predictions.imputer = Imputer(['x1'], {'x1': 1.5})
+    predictions.coefficients = [2.0]
+    predictions.columns = ['x1']
+    predictions.formula_intercept = 5.0
+    predictions.column_vars = {'x1': Mock(get=lambda: " ")}
+    predictions.result_var = Mock()
+    predictions.calculate_prediction()
+    predictions.result_var.set.assert_called_with("8.0000")
+
+def test_score_fills_nulls_and_skips_rows_it_cannot_fill():
+    """Test that batch scoring imputes the inputs and leaves unfillable rows without a prediction."""
+    model = Mock()
+    model.predict.side_effect = lambda X: X @ np.array([2.0, 1.0]) + 5.0
+    model_data = {"model": model, "input_columns": ["x1", "x2"], "imputer": Imputer(["x1", "x2"], {"x1": 1.5})}
+    data = pd.DataFrame({"x2": [1.0, np.nan, 2.0], "x1": [np.nan, 1.0, 3.0]})
+
+    result = score(model_data, data)
+
+    assert result[[0, 2]].tolist() == [9.0, 13.0]
+    assert np.isnan(result[1])
+    assert model.predict.call_count == 1
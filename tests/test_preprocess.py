@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.preprocess import Imputer, apply_null_steps, fill_nulls
+
+@pytest.fixture
+def data_with_nulls():
+    """Returns a DataFrame with nulls in a numeric and a text column."""
+    return pd.DataFrame({
+        "x": [1.0, np.nan, 3.0, 10.0],
+        "empty": [np.nan] * 4,
+        "label": ["a", None, "b", "c"]
+    })
+
+def test_fill_with_median(data_with_nulls):
+    """Test that numeric nulls are filled with the median and all-null columns with 0."""
+    fill_nulls(data_with_nulls, "Fill with median")
+
+    assert data_with_nulls["x"].tolist() == [1.0, 3.0, 3.0, 10.0]
+    assert data_with_nulls["empty"].tolist() == [0.0] * 4
+    assert data_with_nulls["label"].isnull().sum() == 1, "Text columns are not filled."
+
+def test_replayed_steps_use_the_statistics_of_the_new_data(data_with_nulls):
+    """Test that steps recorded on a preview sample are recomputed on the full dataset."""
+    sample = data_with_nulls.iloc[:2].copy()
+    fill_nulls(sample, "Fill with mean")
+    assert sample["x"].tolist() == [1.0, 1.0]
+
+    apply_null_steps(data_with_nulls, [("Fill with mean", None), ("Fill with constant", -1.0)])
+
+    assert data_with_nulls["x"].tolist() == [1.0, 4.6667, 3.0, 10.0]
+    assert data_with_nulls["label"].tolist() == ["a", -1.0, "b", "c"]
+
+def test_unknown_option(data_with_nulls):
+    """Test that an unknown option is rejected."""
+    with pytest.raises(ValueError):
+        fill_nulls(data_with_nulls, "Fill with mode")
+
+def test_fill_nulls_reports_changed_cells_and_dropped_rows(data_with_nulls):
+    """Test that the change set lists the filled cells and dropped rows by position."""
+    filled = fill_nulls(data_with_nulls.copy(), "Fill with mean")
+    assert {col: rows.tolist() for col, rows in filled.filled_cells.items()} == {"x": [1], "empty": [0, 1, 2, 3]}
+    assert not len(filled.dropped_rows)
+
+    dropped = fill_nulls(data_with_nulls, "Delete rows with nulls")
+    assert dropped.dropped_rows.tolist() == [0, 1, 2, 3]
+    assert dropped.cell_count() == 0 and not dropped.is_empty()
+
+def test_every_numeric_dtype_is_imputed():
+    """Test that float32 and nullable integer columns are filled like float64 ones."""
+    data = pd.DataFrame({
+        "f32": pd.array([1.0, np.nan, 2.0], dtype="float32"),
+        "i64": pd.array([1, None, 4], dtype="Int64"),
+        "whole": pd.array([1, None, 3], dtype="Int16"),
+        "label": ["a", None, "b"],
+    })
+
+    changes = fill_nulls(data, "Fill with mean")
+
+    assert data["f32"].dtype == np.float32 and data["f32"].tolist() == [1.0, 1.5, 2.0]
+    assert str(data["i64"].dtype) == "Float64" and data["i64"].tolist() == [1.0, 2.5, 4.0]
+    assert str(data["whole"].dtype) == "Int16" and data["whole"].tolist() == [1, 2, 3]
+    assert sorted(changes.filled_cells) == ["f32", "i64", "whole"]
+
+def test_imputer_repeats_the_fill_values_on_new_data(data_with_nulls):
+    """Test that the fitted imputer reuses the recorded means and fills new nulls in one step."""
+    data_with_nulls["full"] = [2.0, 4.0, 6.0, 8.0]
+    fill_values = apply_null_steps(data_with_nulls, [("Fill with mean", None)])
+    assert fill_values == {"x": 4.6667, "empty": 0.0}
+
+    imputer = Imputer.fit(data_with_nulls, [("Fill with mean", None)], ["full", "x"], fill_values)
+    assert imputer.fill_values == {"x": 4.6667, "full": 5.0}
+
+    new_data = pd.DataFrame({"x": [np.nan, 1.0], "full": [np.nan, np.nan], "other": ["a", "b"]})
+    assert imputer.transform(new_data).tolist() == [[5.0, 4.6667], [5.0, 1.0]]
+
+def test_imputer_after_deleting_rows_fills_nothing(data_with_nulls):
+    """Test that rows with nulls stay incomplete when the preprocessing deleted them."""
+    imputer = Imputer.fit(data_with_nulls, [("Delete rows with nulls", None), ("Fill with constant", 0.0)], ["x"])
+
+    assert imputer.fill_values == {}
+    assert np.isnan(imputer.transform(pd.DataFrame({"x": [np.nan]}))[0, 0])
+
+def test_fill_writes_the_columns_back_under_copy_on_write():
+    """Test that filling does not rely on the frame sharing its arrays, which Copy-on-Write forbids."""
+    with pd.option_context("mode.copy_on_write", True):
+        data = pd.DataFrame({
+            "count": pd.array([1, None, 4], dtype="Int64"),
+            "x": [1.0, np.nan, 2.0],
+        })
+        view = data[["count"]]
+
+        fill_nulls(data, "Fill with mean")
+
+        assert data["count"].tolist() == [1.0, 2.5, 4.0]
+        assert data["x"].tolist() == [1.0, 1.5, 2.0]
+        assert view["count"].isna().sum() == 1
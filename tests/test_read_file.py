@@ -0,0 +1,347 @@
+import importlib.util
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import closing
+import pytest
+import numpy as np
+import pandas as pd
+from backend.errors import (CorruptFileError, DataImportError, MissingFileError, QueryError, SchemaError,
+                            UnsupportedFormatError)
+from backend.read_file import DataImport, ReadCancelled, parse_filters, read_files, run_in_processes, split_extension
+
+@pytest.fixture
+def csv_file(tmpdir):
+    """Writes a small CSV file with a null value and a text column."""
+    data = pd.DataFrame({
+        "x": np.arange(2500, dtype=float),
+        "y": np.linspace(0, 1, 2500),
+        "label": ["a", "b", "c", "d", "e"] * 500
+    })
+    data.loc[1200, "x"] = np.nan
+    file_path = tmpdir.join("data.csv")
+    data.to_csv(file_path, index=False)
+    return str(file_path)
+
+def test_chunked_csv_matches_full_read(csv_file):
+    """Test that reading in chunks gives the same DataFrame as a single read."""
+    data = DataImport(csv_file, chunksize=1000).load_csv()
+
+    pd.testing.assert_frame_equal(data, pd.read_csv(csv_file))
+
+def test_chunked_csv_reports_progress(csv_file):
+    """Test that rows and bytes read are reported after every chunk."""
+    progress = []
+    DataImport(csv_file, chunksize=1000, progress_callback=lambda *args: progress.append(args)).load_csv()
+
+    assert [rows for rows, _, _ in progress] == [1000, 2000, 2500]
+    assert progress[-1][1] == progress[-1][2], "The whole file should have been consumed."
+
+def test_chunked_csv_cancel(csv_file):
+    """Test that a set cancel event stops the read."""
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    with pytest.raises(ReadCancelled):
+        DataImport(csv_file, cancel_event=cancel_event).load_csv()
+
+@pytest.mark.parametrize("extension", ["parquet", "feather"])
+def test_columnar_projection_and_filter(tmpdir, extension):
+    """Test that columnar readers load only the requested columns and matching rows."""
+    pytest.importorskip("pyarrow")
+    data = pd.DataFrame({"x": range(10), "y": [v * 1.5 for v in range(10)], "city": list("abcdeabcde")})
+    file_path = str(tmpdir.join(f"data.{extension}"))
+    getattr(data, f"to_{extension}")(file_path)
+
+    importer = DataImport(file_path, columns=["x", "y"], filters=parse_filters("x >= 4 and city != 'e'"))
+
+    assert importer.list_columns() == ["x", "y", "city"]
+    loaded = importer.read_file()
+    assert list(loaded.columns) == ["x", "y"]
+    assert loaded["x"].tolist() == [5, 6, 7, 8]
+
+def test_parse_filters():
+    """Test that typed filters are parsed into (column, operator, value) tuples."""
+    assert parse_filters("price > 100 AND city = 'Madrid'") == [("price", ">", 100), ("city", "==", "Madrid")]
+    assert parse_filters("  ") is None
+    with pytest.raises(ValueError):
+        parse_filters("price")
+
+@pytest.fixture
+def sqlite_file(tmpdir):
+    """Creates an SQLite database with a table and a view."""
+    file_path = str(tmpdir.join("data.db"))
+    connection = sqlite3.connect(file_path)
+    connection.execute("CREATE TABLE sales (id INTEGER, price REAL, city TEXT, quantity INTEGER)")
+    connection.executemany(
+        "INSERT INTO sales VALUES (?, ?, ?, ?)",
+        [(i, i * 1.5, "abc"[i % 3], None if i == 4 else i) for i in range(25)]
+    )
+    connection.execute("CREATE VIEW expensive AS SELECT id, price * 2 AS double_price FROM sales WHERE price > 10")
+    connection.commit()
+    connection.close()
+    return file_path
+
+def test_sql_lists_tables_and_views(sqlite_file):
+    """Test that both tables and views can be chosen."""
+    assert DataImport(sqlite_file).list_tables() == ["sales", "expensive"]
+    assert DataImport(sqlite_file, table="expensive").list_columns() == ["id", "double_price"]
+
+def test_sql_database_is_opened_read_only(sqlite_file):
+    """Test that a typed condition cannot modify the database it reads."""
+    data_import = DataImport(sqlite_file, table="sales")
+    with closing(data_import._connect()) as connection:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            connection.execute("DELETE FROM sales")
+    assert len(data_import.load()) > 0
+
+def test_sql_typed_chunked_fetch(sqlite_file):
+    """Test that batches are converted into typed arrays whatever the fetch size."""
+    data = DataImport(sqlite_file, arraysize=7).load_sql()
+
+    assert data.shape == (25, 4)
+    assert data["id"].dtype == np.int64
+    assert data["price"].dtype == np.float64
+    assert data["quantity"].dtype == np.float64 and data["quantity"].isnull().sum() == 1
+    assert data["city"].dtype == object
+    assert DataImport(sqlite_file, table="expensive").load_sql()["double_price"].iloc[0] == 21.0
+
+def test_sql_projection_filter_and_limit(sqlite_file):
+    """Test that columns, filters, WHERE and LIMIT are applied by SQLite."""
+    data = DataImport(
+        sqlite_file, table="sales", columns=["id", "city"],
+        filters=parse_filters("city == 'a'"), where="id > 3", limit=3, arraysize=2
+    ).load_sql()
+
+    assert list(data.columns) == ["id", "city"]
+    assert data["id"].tolist() == [6, 9, 12]
+
+def test_sql_missing_file(tmpdir):
+    """Test that a missing database is reported instead of being created."""
+    file_path = str(tmpdir.join("missing.db"))
+    with pytest.raises(FileNotFoundError):
+        DataImport(file_path).load_sql()
+    assert not os.path.exists(file_path)
+
+def _memmap_base(array):
+    """Returns the memory map an array is a view of, or None."""
+    while array is not None and not isinstance(array, np.memmap):
+        array = getattr(array, "base", None)
+    return array
+
+def test_npy_matrix_is_memory_mapped(tmpdir):
+    """Test that a .npy matrix is wrapped without copying and named from its sidecar."""
+    matrix = np.random.default_rng(0).random((100, 3))
+    file_path = str(tmpdir.join("features.npy"))
+    np.save(file_path, matrix)
+    with open(f"{file_path}.columns.json", "w") as sidecar:
+        json.dump(["x1", "x2", "y"], sidecar)
+
+    data = DataImport(file_path).load_numpy()
+
+    assert list(data.columns) == ["x1", "x2", "y"]
+    assert _memmap_base(data["x2"].to_numpy()) is not None, "The column should be a view of the memory map."
+    np.testing.assert_array_equal(data.to_numpy(), matrix)
+
+def test_npz_columns_are_memory_mapped_copy_on_write(tmpdir):
+    """Test that .npz members are mapped and that edits never reach the file."""
+    file_path = str(tmpdir.join("columns.npz"))
+    np.savez(file_path, x=np.array([1.0, np.nan, 3.0]), y=np.array([2, 4, 6]))
+
+    data = DataImport(file_path).load_numpy()
+    assert _memmap_base(data["x"].to_numpy()) is not None
+    data.fillna(0.0, inplace=True)
+
+    assert data["x"].tolist() == [1.0, 0.0, 3.0]
+    assert np.isnan(np.load(file_path)["x"][1]), "The file must not be modified."
+
+def test_npy_sidecar_mismatch(tmpdir):
+    """Test that a sidecar with the wrong number of names is rejected."""
+    file_path = str(tmpdir.join("features.npy"))
+    np.save(file_path, np.zeros((2, 2)))
+    with open(f"{file_path}.columns.json", "w") as sidecar:
+        json.dump(["only_one"], sidecar)
+
+    with pytest.raises(ValueError):
+        DataImport(file_path).load_numpy()
+
+def test_split_extension():
+    """Test that extra dots and compression suffixes do not confuse the file type."""
+    assert split_extension("exports/data.v2.csv.gz") == ("csv", "gzip")
+    assert split_extension("part-001.CSV.ZST") == ("csv", "zstd")
+    assert split_extension("report.2024.xlsx") == ("xlsx", None)
+    assert split_extension("no_extension") == ("", None)
+
+@pytest.mark.parametrize("extension", ["gz", "bz2", "xz"])
+def test_compressed_csv(tmpdir, extension):
+    """Test that compressed CSV files are decoded while reporting compressed bytes read."""
+    data = pd.DataFrame({"x": range(50), "y": [v / 2 for v in range(50)]})
+    file_path = str(tmpdir.join(f"data.v2.csv.{extension}"))
+    data.to_csv(file_path, index=False)
+    progress = []
+
+    loaded = DataImport(file_path, chunksize=20, progress_callback=lambda *args: progress.append(args)).load()
+
+    pd.testing.assert_frame_equal(loaded, data)
+    assert progress[-1][1] == progress[-1][2] == os.path.getsize(file_path)
+
+def test_read_files_concatenates_shards_in_order(tmpdir):
+    """Test that a glob of shards is read in parallel and concatenated in name order."""
+    for shard in (2, 0, 1):
+        pd.DataFrame({"id": [shard * 10, shard * 10 + 1], "value": [1.5, 2.5]}).to_csv(
+            str(tmpdir.join(f"part-{shard}.csv.gz")), index=False)
+    progress = []
+
+    data = read_files(str(tmpdir.join("part-*.csv.gz")), max_workers=2, progress_callback=lambda *args: progress.append(args))
+
+    assert data["id"].tolist() == [0, 1, 10, 11, 20, 21]
+    assert progress[-1][0] == 6
+
+    optimized = read_files(str(tmpdir.join("part-*.csv.gz")), max_workers=1, optimize_memory=True)
+    assert optimized["id"].dtype == np.uint8 and optimized["id"].tolist() == data["id"].tolist()
+
+def test_cancelling_does_not_wait_for_running_jobs():
+    """Test that a cancelled pool returns without waiting for the jobs already running."""
+    cancel_event = threading.Event()
+    threading.Timer(0.1, cancel_event.set).start()
+    start = time.perf_counter()
+
+    with pytest.raises(ReadCancelled):
+        run_in_processes(time.sleep, [(1,), (1,)], max_workers=2, cancel_event=cancel_event)
+
+    assert time.perf_counter() - start < 0.8
+
+def test_read_files_schema_mismatch(tmpdir):
+    """Test that shards with different columns or incompatible dtypes are rejected."""
+    pd.DataFrame({"id": [1, 2], "value": [1.5, 2.5]}).to_csv(str(tmpdir.join("a.csv")), index=False)
+    pd.DataFrame({"id": [3, 4], "other": [1.5, 2.5]}).to_csv(str(tmpdir.join("b.csv")), index=False)
+    pd.DataFrame({"id": ["x", "y"], "value": [1.5, 2.5]}).to_csv(str(tmpdir.join("c.csv")), index=False)
+
+    with pytest.raises(ValueError, match="columns"):
+        read_files([str(tmpdir.join("a.csv")), str(tmpdir.join("b.csv"))], max_workers=1)
+    with pytest.raises(ValueError, match="Column 'id'"):
+        read_files([str(tmpdir.join("a.csv")), str(tmpdir.join("c.csv"))], max_workers=1)
+
+def test_csv_sample_is_bounded_and_keeps_file_order(tmpdir):
+    """Test that a sample reads the whole file but keeps only sample_rows distinct rows, in file order."""
+    file_path = str(tmpdir.join("big.csv"))
+    pd.DataFrame({"id": range(5000), "value": np.arange(5000) * 0.5}).to_csv(file_path, index=False)
+
+    sample = DataImport(file_path, chunksize=700, sample_rows=300, seed=1).load()
+
+    assert len(sample) == 300
+    assert sample["id"].is_unique and sample["id"].is_monotonic_increasing
+    assert (sample["value"] == sample["id"] * 0.5).all()
+    assert sample["id"].max() > 4000, "Rows from the end of the file should be sampled too."
+    assert len(DataImport(file_path, sample_rows=10_000).load()) == 5000
+
+def test_sql_sample(sqlite_file):
+    """Test that SQLite returns a random sample of the filtered rows."""
+    data = DataImport(sqlite_file, table="sales", filters=parse_filters("city == 'a'"), sample_rows=4).load_sql()
+
+    assert len(data) == 4
+    assert set(data["city"]) == {"a"}
+    assert data["id"].is_unique
+
+def test_columnar_sample(tmpdir):
+    """Test that a columnar sample only takes rows that match the filter."""
+    pytest.importorskip("pyarrow")
+    file_path = str(tmpdir.join("data.parquet"))
+    pd.DataFrame({"x": range(1000), "y": range(1000)}).to_parquet(file_path)
+
+    data = DataImport(file_path, columns=["x"], filters=parse_filters("x >= 500"), sample_rows=50, seed=0).load()
+
+    assert list(data.columns) == ["x"]
+    assert len(data) == 50 and data["x"].min() >= 500 and data["x"].is_monotonic_increasing
+
+def test_reader_does_not_import_tkinter():
+    """Test that the reader can be imported without a display or tkinter."""
+    code = "import sys, backend.read_file; assert 'tkinter' not in sys.modules"
+    src = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": src})
+
+@pytest.mark.parametrize("name, content, error", [
+    ("missing.csv", None, MissingFileError),
+    ("data.txt", "a,b\n1,2\n", UnsupportedFormatError),
+    ("data.json.gz", "{}", UnsupportedFormatError),
+    ("broken.csv", 'a,b\n"1,2\n', CorruptFileError),
+    ("broken.db", "not a database", CorruptFileError),
+    ("broken.npz", "not an archive", CorruptFileError),
+])
+def test_typed_errors(tmpdir, name, content, error):
+    """Test that failures are raised as typed errors with a message for the user."""
+    file_path = str(tmpdir.join(name))
+    if content is not None:
+        with open(file_path, "w") as handle:
+            handle.write(content)
+
+    with pytest.raises(error) as info:
+        DataImport(file_path).load()
+    assert isinstance(info.value, DataImportError) and str(info.value)
+
+def test_typed_errors_for_selections(sqlite_file):
+    """Test that unknown tables, columns and bad SQL are reported as selection or query errors."""
+    with pytest.raises(SchemaError):
+        DataImport(sqlite_file, table="missing").load()
+    with pytest.raises(SchemaError):
+        DataImport(sqlite_file, columns=["missing"]).load()
+    with pytest.raises(QueryError):
+        DataImport(sqlite_file, where="no_such_column > 1").load()
+
+def test_typed_errors_cross_process_boundaries(tmpdir):
+    """Test that an error raised in a worker process keeps its type."""
+    pd.DataFrame({"id": [1]}).to_csv(str(tmpdir.join("a.csv")), index=False)
+    with open(str(tmpdir.join("b.csv")), "w") as handle:
+        handle.write('id\n"1\n')
+
+    with pytest.raises(CorruptFileError):
+        read_files(str(tmpdir.join("*.csv")), max_workers=2)
+    with pytest.raises(MissingFileError):
+        read_files(str(tmpdir.join("*.parquet")), max_workers=1)
+
+@pytest.fixture
+def workbook(tmpdir):
+    """Writes a workbook with two sheets sharing their columns and one with other columns."""
+    file_path = str(tmpdir.join("sales.xlsx"))
+    with pd.ExcelWriter(file_path) as writer:
+        pd.DataFrame({"id": range(0, 5), "price": [1.5] * 5, "city": list("abcab")}).to_excel(writer, sheet_name="2023", index=False)
+        pd.DataFrame({"id": range(5, 8), "price": [2.5] * 3, "city": list("cab")}).to_excel(writer, sheet_name="2024", index=False)
+        pd.DataFrame({"note": ["x"]}).to_excel(writer, sheet_name="notes", index=False)
+    return file_path
+
+ENGINES = ["openpyxl", pytest.param("calamine", marks=pytest.mark.skipif(
+    importlib.util.find_spec("python_calamine") is None, reason="python-calamine is not installed"))]
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_excel_sheet_selection_and_projection(workbook, engine):
+    """Test that sheets are listed, and a chosen sheet is read with only the selected columns and rows."""
+    importer = DataImport(workbook, sheets="2024", columns=["id", "city"], limit=2, excel_engine=engine)
+
+    assert importer.list_sheets() == ["2023", "2024", "notes"]
+    assert importer.list_columns() == ["id", "price", "city"]
+    data = importer.load()
+    assert list(data.columns) == ["id", "city"]
+    assert data["id"].tolist() == [5, 6]
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_excel_sheets_are_concatenated_in_order(workbook, engine):
+    """Test that several sheets are parsed in parallel and concatenated in the order given."""
+    progress = []
+    data = DataImport(workbook, sheets=["2024", "2023"], excel_engine=engine,
+                      progress_callback=lambda *args: progress.append(args)).load()
+
+    assert data["id"].tolist() == [5, 6, 7, 0, 1, 2, 3, 4]
+    assert progress[-1][0] == 8
+
+def test_excel_sheet_errors(workbook):
+    """Test that missing sheets, missing columns and sheets with other columns are reported as schema errors."""
+    with pytest.raises(SchemaError, match="missing"):
+        DataImport(workbook, sheets="missing").load()
+    with pytest.raises(SchemaError, match="columns"):
+        DataImport(workbook, sheets=["2023", "notes"]).load()
+    with pytest.raises(SchemaError, match="not in the file"):
+        DataImport(workbook, columns=["id", "missing"]).load()
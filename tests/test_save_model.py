@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch
 from backend.model import Model
+from backend.preprocess import Imputer
 import pickle
 import os
 
@@ -63,4 +64,17 @@ def test_save_model(setup_model, tmpdir):
         assert saved_data["metrics"] == setup_model.model_metrics, "The saved metrics do not match."
         assert saved_data["input_columns"] == setup_model.columns_selected, "The saved input columns do not match."
         assert saved_data["output_column"] == setup_model.output_column, "The saved output column does not match."
-        assert saved_data["description"] == setup_model.description_saved, "The saved description does not match."
\ No newline at end of file
+        assert saved_data["description"] == setup_model.description_saved, "The saved description does not match."
+
+def test_save_model_stores_the_imputer(setup_model, tmpdir):
+    """Test that the fitted imputer is saved with the model."""
+    setup_model.imputer = Imputer(["x1"], {"x1": 2.5})
+
+    model_file = tmpdir.join("saved_model.pkl")
+    with patch("tkinter.filedialog.asksaveasfilename", return_value=str(model_file)):
+        with patch("tkinter.messagebox.showinfo"):
+            setup_model.save_model()
+
+    with open(model_file, "rb") as f:
+        saved_imputer = pickle.load(f)["imputer"]
+    assert saved_imputer.columns == ["x1"] and saved_imputer.fill_values == {"x1": 2.5}
@@ -0,0 +1,68 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import Mock, patch
+from sklearn.linear_model import LinearRegression
+from backend.model import Model, prepare_plot_data
+
+matplotlib.use("Agg")
+
+def fitted(columns, rows, seed=0):
+    """Returns a model fitted on random data with the given number of input columns."""
+    rng = np.random.default_rng(seed)
+    X = rng.random((rows, columns))
+    y = X @ np.arange(1, columns + 1) + 5 + rng.normal(scale=0.01, size=rows)
+    return LinearRegression().fit(X, y), X, y
+
+def test_small_data_is_drawn_as_points():
+    """Test that below the limit every row is scattered and the line spans the inputs."""
+    model, X, y = fitted(1, 100)
+    plot_data = prepare_plot_data(model, X, y)
+
+    assert plot_data["points"][0] is X and plot_data["density"] is None
+    x, line = plot_data["fit"]
+    assert x.tolist() == [X.min(), X.max()]
+    assert line == pytest.approx(model.predict(x.reshape(-1, 1)))
+
+def test_large_2d_data_is_drawn_as_density():
+    """Test that above the limit a 2D plot gets a density grid that counts every row."""
+    model, X, y = fitted(1, 5000)
+    plot_data = prepare_plot_data(model, X, y, point_limit=1000)
+
+    counts, x_edges, y_edges = plot_data["density"]
+    assert plot_data["points"] is None
+    assert counts.sum() == 5000
+
+def test_large_3d_data_is_sampled_and_plane_is_a_fixed_grid():
+    """Test that a 3D plot gets a sample of the rows and a plane that does not grow with them."""
+    model, X, y = fitted(2, 5000)
+    plot_data = prepare_plot_data(model, X, y, point_limit=1000)
+
+    X_sample, y_sample = plot_data["points"]
+    assert len(y_sample) == 1000
+    assert np.isin(y_sample, y).all()
+    x1, x2, plane = plot_data["fit"]
+    assert plane.shape == x1.shape == (20, 20)
+    assert plane[0, 0] == pytest.approx(5 + x1[0, 0] + 2 * x2[0, 0], abs=0.01)
+
+@pytest.mark.parametrize("columns, rows", [(1, 100), (1, 60_000), (2, 60_000)])
+@patch("matplotlib.pyplot.show", Mock())
+def test_show_model_draws_without_predicting_every_row(columns, rows):
+    """Test that show_model draws the plot from the prepared data."""
+    model, X, y = fitted(columns, rows)
+    data = {f"x{i}": X[:, i] for i in range(columns)}
+    data["y"] = y
+
+    app = Model(*[Mock() for _ in range(13)])
+    app.model = Mock(wraps=model)
+    app.model_formula = {"formula": "y = ..."}
+    app.model_metrics = {"r2": 1.0, "mse": 0.0}
+    app.columns_selected = list(data)[:-1]
+    app.output_column = "y"
+    app.data_table_df = pd.DataFrame(data)
+
+    app.show_model()
+
+    assert all(len(call.args[0]) <= 400 for call in app.model.predict.call_args_list)
+    assert not matplotlib.pyplot.get_fignums(), "The pyplot figure should be closed after it is shown."
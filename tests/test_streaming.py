@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.errors import SchemaError, UnsupportedFormatError
+from backend.preprocess import fill_nulls
+from backend.streaming import StreamingStatistics, clean_csv, compute_statistics
+
+@pytest.fixture
+def data_with_nulls():
+    """Returns a DataFrame with scattered nulls, an all-null column and a text column."""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "x": rng.normal(10, 2, size=1000),
+        "y": rng.exponential(size=1000),
+        "empty": np.nan,
+        "label": rng.choice(["a", "b"], size=1000),
+    })
+    data.loc[rng.random(1000) < 0.1, "x"] = np.nan
+    data.loc[rng.random(1000) < 0.1, "label"] = None
+    return data
+
+def chunks(data, size):
+    return (data.iloc[start:start + size] for start in range(0, len(data), size))
+
+def test_streaming_statistics_match_the_whole_data(data_with_nulls):
+    """Test that statistics merged chunk by chunk match the ones computed on the whole data."""
+    statistics = compute_statistics(chunks(data_with_nulls, 97))
+    numeric = data_with_nulls[["x", "y", "empty"]]
+
+    assert statistics.rows == 1000
+    assert statistics.null_counts().equals(data_with_nulls.isnull().sum())
+    assert statistics.numeric_columns() == ["x", "y", "empty"]
+    pd.testing.assert_series_equal(statistics.mean(), numeric.mean())
+    pd.testing.assert_series_equal(statistics.var(), numeric.var())
+
+    # The median is approximate: check its rank rather than its value
+    median = statistics.quantile(0.5)
+    for col in ("x", "y"):
+        values = numeric[col].dropna()
+        assert abs((values < median[col]).mean() - 0.5) < 0.01
+    assert np.isnan(median["empty"])
+
+def test_a_column_with_text_in_a_later_chunk_is_not_numeric():
+    """Test that a column is only treated as numeric if it is numeric in every chunk."""
+    statistics = StreamingStatistics()
+    statistics.update(pd.DataFrame({"x": [1.0, 2.0], "y": [1.0, np.nan]}))
+    statistics.update(pd.DataFrame({"x": ["n/a", "3"], "y": [3.0, 4.0]}, index=[2, 3]))
+
+    assert statistics.numeric_columns() == ["y"]
+    assert statistics.fill_values("Fill with mean") == {"y": 2.6667}
+    with pytest.raises(SchemaError):
+        statistics.update(pd.DataFrame({"z": [1.0]}))
+
+@pytest.mark.parametrize("option", ["Fill with mean", "Delete rows with nulls", "Fill with constant"])
+def test_clean_csv_writes_what_fill_nulls_computes_in_memory(data_with_nulls, tmpdir, option):
+    """Test that the two-pass streamed cleaning gives the same file as cleaning the data in memory."""
+    source = str(tmpdir.join("data.csv"))
+    destination = str(tmpdir.join("clean.csv"))
+    data_with_nulls.to_csv(source, index=False)
+
+    rows_written, fill_values = clean_csv(source, destination, option, constant=-1.0, chunksize=128)
+
+    in_memory = pd.read_csv(source)
+    fill_nulls(in_memory, option, -1.0)
+    in_memory.to_csv(str(tmpdir.join("expected.csv")), index=False)
+    expected = pd.read_csv(str(tmpdir.join("expected.csv")))
+    assert rows_written == len(expected)
+    pd.testing.assert_frame_equal(pd.read_csv(destination), expected, check_dtype=False, atol=1e-4)
+    if option == "Fill with mean":
+        assert sorted(fill_values) == ["empty", "x"]
+    assert not tmpdir.join("clean.csv.part").exists()
+
+def test_clean_csv_can_overwrite_its_source_but_not_read_other_formats(data_with_nulls, tmpdir):
+    """Test that the source can be cleaned in place and that only CSV files are streamed."""
+    source = str(tmpdir.join("data.csv"))
+    data_with_nulls.to_csv(source, index=False)
+
+    clean_csv(source, source, "Fill with median", chunksize=100)
+    assert pd.read_csv(source)[["x", "y", "empty"]].notna().all().all()
+
+    with pytest.raises(UnsupportedFormatError):
+        clean_csv(str(tmpdir.join("data.xlsx")), source, "Fill with mean")
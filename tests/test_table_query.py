@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from backend.errors import QueryError
+from backend.read_file import parse_filters
+from backend.table_query import TableQuery, filter_mask
+
+@pytest.fixture
+def prices():
+    """Returns a small table with a null price."""
+    return pd.DataFrame({
+        "price": [120.0, 80.0, np.nan, 300.0, 80.0],
+        "city": ["Madrid", "Paris", "Rome", "Madrid", "Oslo"],
+    })
+
+def test_sort_puts_nulls_last_in_both_directions(prices):
+    """Test ascending and descending orders, with ties kept stable when ascending."""
+    query = TableQuery(prices)
+
+    query.sort("price")
+    assert query.rows().tolist() == [1, 4, 0, 3, 2]
+    query.sort("price")
+    assert not query.ascending
+    assert query.rows().tolist() == [3, 0, 4, 1, 2]
+
+def test_mixed_text_and_numbers_are_sorted_as_text():
+    """Test that an object column mixing strings and floats is sorted by its text, with nulls last."""
+    query = TableQuery(pd.DataFrame({"code": ["b", 10.0, None, "a", 2.0]}))
+
+    assert query.order("code").tolist() == [1, 4, 3, 0, 2]
+    assert query.order("code", ascending=False).tolist() == [0, 3, 4, 1, 2]
+
+def test_sort_permutation_is_computed_once_per_column(prices):
+    """Test that toggling the direction and changing the filter reuse the cached argsort."""
+    query = TableQuery(prices)
+    with patch.object(pd.Series, "sort_values", autospec=True, side_effect=pd.Series.sort_values) as sort_values:
+        query.sort("price")
+        query.rows()
+        query.sort("price")
+        query.rows()
+        query.set_filter(parse_filters("city == 'Madrid'"))
+        assert query.rows().tolist() == [3, 0]
+    assert sort_values.call_count == 1
+
+def test_filter_keeps_original_order_without_sort(prices):
+    """Test filters as boolean masks, and the filtered data used for the model."""
+    query = TableQuery(prices)
+    assert query.rows() is None
+
+    query.set_filter(parse_filters("price >= 100"))
+    assert query.rows().tolist() == [0, 3]
+    assert query.row_count() == 2
+    assert query.filtered_data()["city"].tolist() == ["Madrid", "Madrid"]
+
+    query.set_filter(None)
+    assert query.rows() is None and query.filtered_data() is prices
+
+def test_invalid_filters(prices):
+    """Test that unknown columns and impossible comparisons are reported as query errors."""
+    with pytest.raises(QueryError, match="Unknown column"):
+        filter_mask(prices, [("size", ">", 1)])
+    with pytest.raises(QueryError, match="Cannot compare"):
+        filter_mask(prices, [("city", ">", 1)])
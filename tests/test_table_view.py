@@ -0,0 +1,122 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, Mock, call
+from backend.history import History
+from backend.preprocess import fill_nulls
+from frontend.table_view import VirtualTable
+
+@pytest.fixture
+def table():
+    """Returns a VirtualTable on a mocked tree that hands out numbered items."""
+    treeview = MagicMock()
+    counter = itertools.count()
+    treeview.insert.side_effect = lambda *args, **kwargs: f"I{next(counter)}"
+    table = VirtualTable(treeview, Mock(), rowheight=25)
+    table.visible_rows = 10
+    return table
+
+def shown_values(table):
+    """Returns the values last written to each tree item, in item order."""
+    values = {}
+    for call in table.treeview.item.call_args_list:
+        values[call.args[0]] = call.kwargs["values"]
+    return [values[item] for item in table._items]
+
+def test_only_visible_rows_are_inserted(table):
+    """Test that showing a large DataFrame creates one item per visible row."""
+    data = pd.DataFrame({"x": np.arange(1_000_000), "label": pd.Categorical(["a", "b"] * 500_000)})
+
+    table.set_data(data)
+
+    assert table.treeview.insert.call_count == 10
+    assert shown_values(table)[0] == ("0", "a")
+    table.scrollbar.set.assert_called_with(0.0, 10 / 1_000_000)
+
+def test_scrolling_reuses_items(table):
+    """Test that scrolling rewrites the existing items with another slice of rows."""
+    table.set_data(pd.DataFrame({"x": np.arange(100)}))
+
+    table.yview("moveto", 0.5)
+    assert [values[0] for values in shown_values(table)] == [str(row) for row in range(50, 60)]
+    table.yview("scroll", 1, "pages")
+    assert shown_values(table)[0] == ("60",)
+    table.yview("moveto", 1.0)
+    assert shown_values(table)[-1] == ("99",), "The last page should end on the last row."
+    table.on_mousewheel(Mock(num=4, delta=0))
+    assert table.first_row == 87
+
+    assert table.treeview.insert.call_count == 10
+    table.treeview.delete.assert_not_called()
+
+def test_resize_and_small_data(table):
+    """Test that the number of items follows the height of the tree and the number of rows."""
+    table.set_data(pd.DataFrame({"x": [1.5, np.nan, 3.0]}))
+    assert len(table._items) == 3
+
+    table.on_resize(Mock(height=250))
+    table.set_data(pd.DataFrame({"x": np.arange(50)}))
+    assert len(table._items) == 9
+
+def test_filled_cells_patch_only_visible_items(table):
+    """Test that filling nulls rewrites only the changed cells that are on screen."""
+    data = pd.DataFrame({"x": np.arange(100, dtype=float), "y": np.zeros(100)})
+    data.loc[[2, 5, 80], "x"] = np.nan
+    table.set_data(data)
+    table.treeview.item.reset_mock()
+
+    changes = fill_nulls(data, "Fill with constant", -1.0)
+    table.apply_changes(data, changes)
+
+    assert changes.cell_count() == 3
+    table.treeview.item.assert_not_called()
+    assert table.treeview.set.call_args_list == [call("I2", "x", "-1.0000"), call("I5", "x", "-1.0000")]
+
+def test_nullable_columns_changed_in_place_are_shown_again(table):
+    """Test that Int64 cells filled and then unfilled in place are not shown from stale cached strings."""
+    data = pd.DataFrame({"count": pd.array([1, None, 3, None], dtype="Int64")})
+    table.set_data(data)
+    history = History(fill_nulls)
+
+    table.apply_changes(data, history.apply(data, "Fill with constant", 7.0))
+    table.render()
+    assert [values[0] for values in shown_values(table)] == ["1", "7", "3", "7"]
+
+    data, delta = history.undo(data)
+    table.apply_changes(data, delta.changes)
+    table.render()
+    assert [values[0] for values in shown_values(table)] == ["1", "", "3", ""]
+
+def test_dropped_rows_keep_the_window_on_the_same_rows(table):
+    """Test that dropping rows above the window shifts it so the same rows stay on screen."""
+    data = pd.DataFrame({"x": np.arange(100, dtype=float)})
+    data.loc[[3, 7, 95], "x"] = np.nan
+    table.set_data(data)
+    table.yview("moveto", 0.5)
+
+    table.apply_changes(data, fill_nulls(data, "Delete rows with nulls"))
+
+    assert table.first_row == 48
+    assert [values[0] for values in shown_values(table)] == [f"{row}.0000" for row in range(50, 60)]
+    assert table.treeview.insert.call_count == 10
+
+def test_row_at_maps_items_to_data_rows(table):
+    """Test that a click position is translated to the row of the data shown there."""
+    table.set_data(pd.DataFrame({"x": np.arange(100)}))
+    table.yview("moveto", 0.5)
+
+    table.treeview.identify_row.return_value = "I3"
+    assert table.row_at(80) == 53
+    table.treeview.identify_row.return_value = ""
+    assert table.row_at(900) is None
+
+def test_sorted_rows_are_shown_in_order(table):
+    """Test that a view with row positions shows those rows and scrolls over them only."""
+    data = pd.DataFrame({"x": np.arange(100)})
+    table.set_data(data, rows=np.arange(99, -1, -2))
+
+    assert table.row_count() == 50
+    assert shown_values(table)[0] == ("99",)
+    table.yview("moveto", 1.0)
+    assert shown_values(table)[-1] == ("1",)
@@ -0,0 +1,96 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from backend.errors import ReadCancelled
+from backend.tasks import ResourceBusy, TaskExecutor, run_inline
+
+@pytest.fixture
+def executor():
+    """Returns a task executor that is shut down after the test."""
+    executor = TaskExecutor()
+    yield executor
+    executor.shutdown()
+
+def poll_until_idle(executor, timeout=5):
+    """Polls the executor, as the Tk event loop would, until no task is running."""
+    deadline = time.monotonic() + timeout
+    while executor.poll():
+        assert time.monotonic() < deadline, "The task did not finish in time."
+        time.sleep(0.01)
+
+def test_result_and_progress_are_dispatched_on_the_polling_thread(executor):
+    """Test that callbacks run on the thread that polls, not on the worker."""
+    threads = []
+    on_done = Mock(side_effect=lambda result: threads.append(threading.get_ident()))
+    on_progress = Mock()
+
+    def work(progress_callback, cancel_event):
+        progress_callback(10, 100, 1000)
+        return "result"
+
+    executor.submit("data", work, on_done=on_done, on_progress=on_progress)
+    poll_until_idle(executor)
+
+    on_progress.assert_called_once_with(10, 100, 1000)
+    on_done.assert_called_once_with("result")
+    assert threads == [threading.get_ident()]
+    assert not executor.is_busy("data")
+
+def test_errors_are_passed_to_on_error(executor):
+    """Test that an exception raised by the work reaches the error callback."""
+    on_done, on_error = Mock(), Mock()
+    error = ValueError("bad data")
+
+    def work(progress_callback, cancel_event):
+        raise error
+
+    executor.submit("data", work, on_done=on_done, on_error=on_error)
+    poll_until_idle(executor)
+
+    on_error.assert_called_once_with(error)
+    on_done.assert_not_called()
+
+def test_cancelled_task_reports_cancellation(executor):
+    """Test that a task stopped through its cancel event calls on_cancelled instead of on_done."""
+    started = threading.Event()
+    on_done, on_cancelled = Mock(), Mock()
+
+    def work(progress_callback, cancel_event):
+        started.set()
+        while not cancel_event.wait(0.01):
+            pass
+        raise ReadCancelled()
+
+    executor.submit("data", work, on_done=on_done, on_cancelled=on_cancelled)
+    assert started.wait(5)
+    executor.cancel("data")
+    poll_until_idle(executor)
+
+    on_cancelled.assert_called_once_with()
+    on_done.assert_not_called()
+
+def test_one_task_per_resource(executor):
+    """Test that a second task on a busy resource is refused while other resources stay free."""
+    release = threading.Event()
+
+    executor.submit("data", lambda progress_callback, cancel_event: release.wait(5))
+    with pytest.raises(ResourceBusy):
+        executor.submit("data", lambda progress_callback, cancel_event: None)
+    executor.submit("plot", lambda progress_callback, cancel_event: None)
+
+    release.set()
+    poll_until_idle(executor)
+    assert not executor.is_busy("data")
+
+def test_run_inline_calls_back_straight_away():
+    """Test the default task runner used without an executor."""
+    on_done, on_error = Mock(), Mock()
+    run_inline(lambda: 42, on_done, on_error)
+    on_done.assert_called_once_with(42)
+
+    run_inline(lambda: 1 / 0, on_done, on_error)
+    assert isinstance(on_error.call_args.args[0], ZeroDivisionError)
+
+    with pytest.raises(ZeroDivisionError):
+        run_inline(lambda: 1 / 0)